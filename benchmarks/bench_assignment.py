@@ -0,0 +1,77 @@
+"""
+Benchmark: assign_poles_to_path (rejilla + retiro por Handle) vs. el barrido
+original de _ejecutar_insercion_dfs (todos los postes por vértice + list.remove).
+
+Uso:
+    python benchmarks/bench_assignment.py [postes]
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_split import synthetic_network
+from utilities.geometry import calculate_distance, split_segments_with_poles
+from utilities.graph import NetworkGraph
+from utilities.numbering import assign_poles_to_path
+
+
+def legacy_assign(ruta, postes, radio=1.5):
+    postes = list(postes)
+    en_ruta = []
+    for pt in ruta:
+        cercanos = []
+        for poste in postes:
+            d = calculate_distance(pt, (poste["X"], poste["Y"]))
+            if d <= radio:
+                cercanos.append((d, poste))
+        cercanos.sort(key=lambda item: item[0])
+        for _, poste in cercanos:
+            en_ruta.append(poste)
+            postes.remove(poste)
+    ref = ruta[-1]
+    rezagados = sorted(postes, key=lambda p: calculate_distance((p["X"], p["Y"]), ref))
+    return en_ruta, rezagados
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def build_route(n_poles: int):
+    segmentos, postes = synthetic_network(n_poles * 2, n_poles)
+    segmentos = split_segments_with_poles(segmentos, postes, tolerancia=1.5)
+    grafo = NetworkGraph(tolerance=0.1)
+    for p1, p2 in segmentos:
+        grafo.add_line(p1, p2)
+    return grafo.dfs_traversal(segmentos[0][0]), postes
+
+
+def main():
+    n_poles = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    ruta, postes = build_route(2000)
+    trabajo_muestra = len(ruta) * len(postes)
+    viejo, t_old = timed(legacy_assign, ruta, postes)
+    nuevo, t_new = timed(assign_poles_to_path, ruta, postes)
+    assert nuevo == viejo, "La asignación indexada difiere del barrido original"
+    print(f"Muestra 2000 postes ({len(ruta)} vértices):")
+    print(f"  Barrido original: {t_old:8.3f}s")
+    print(f"  Rejilla:          {t_new:8.3f}s ({t_old / t_new:.0f}x)")
+
+    ruta, postes = build_route(n_poles)
+    (en_ruta, rezagados), t_full = timed(assign_poles_to_path, ruta, postes)
+    escala = (len(ruta) * len(postes)) / trabajo_muestra
+    print(f"Completo {n_poles} postes ({len(ruta)} vértices):")
+    print(
+        f"  Rejilla:          {t_full:8.3f}s ({len(en_ruta)} en ruta, {len(rezagados)} rezagados)"
+    )
+    print(f"  Barrido original: ~{t_old * escala:7.1f}s (extrapolado)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: associate_data indexado (modo secuencial y global) vs. versión O(N·M).
+
+Uso:
+    python benchmarks/bench_association.py [postes] [etiquetas]
+"""
+
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utilities.geometry import associate_data, calculate_distance
+
+
+def legacy_associate(base_blocks, data_entities, radius):
+    """Implementación previa: cada poste recorre todo el pool y usa list.remove."""
+    pool = data_entities.copy()
+    for base in base_blocks:
+        closest, min_dist = None, radius
+        for entity in pool:
+            dist = calculate_distance(
+                (base["X"], base["Y"]), (entity["X"], entity["Y"])
+            )
+            if dist <= min_dist:
+                min_dist, closest = dist, entity
+        if closest:
+            for key, val in closest.items():
+                if key.startswith("Attr_") or key == "Texto":
+                    base[f"Data_{key}"] = val
+            pool.remove(closest)
+    return base_blocks
+
+
+def synthetic_labels(n_poles: int, n_labels: int, seed: int = 3):
+    """Postes sobre un área proporcional y etiquetas a distancias aleatorias."""
+    rng = random.Random(seed)
+    lado = (n_poles**0.5) * 40.0
+    postes = [
+        {"Handle": f"P{i}", "X": rng.uniform(0, lado), "Y": rng.uniform(0, lado)}
+        for i in range(n_poles)
+    ]
+    etiquetas = []
+    for i in range(n_labels):
+        ref = postes[rng.randrange(n_poles)]
+        etiquetas.append(
+            {
+                "Texto": f"COD-{i}",
+                "X": ref["X"] + rng.uniform(-20, 20),
+                "Y": ref["Y"] + rng.uniform(-20, 20),
+            }
+        )
+    return postes, etiquetas
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    n_poles = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    n_labels = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    radio = 15.0
+
+    postes, etiquetas = synthetic_labels(2000, 4000)
+    copia = [dict(p) for p in postes]
+    viejo, t_old = timed(legacy_associate, copia, etiquetas, radio)
+    copia = [dict(p) for p in postes]
+    nuevo, t_new = timed(associate_data, copia, etiquetas, radio)
+    assert nuevo == viejo, "El modo secuencial indexado difiere del original"
+    print("Muestra 2000 postes x 4000 etiquetas:")
+    print(f"  O(N·M):            {t_old:8.3f}s")
+    print(f"  Rejilla:           {t_new:8.3f}s ({t_old / t_new:.0f}x)")
+
+    postes, etiquetas = synthetic_labels(n_poles, n_labels)
+    print(f"Completo {n_poles} postes x {n_labels} etiquetas:")
+    for global_match in (False, True):
+        copia = [dict(p) for p in postes]
+        result, t = timed(associate_data, copia, etiquetas, radio, global_match)
+        asociados = sum(1 for p in result if "Data_Texto" in p)
+        modo = "global" if global_match else "secuencial"
+        print(f"  Rejilla {modo:<10} {t:8.3f}s ({asociados} asociados)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: llamadas COM por entidad con el lector por planes vs. la lectura previa.
+
+Cada lectura de propiedad sobre un objeto COM es un viaje de ida y vuelta a
+AutoCAD; aquí se cuentan con un proxy sobre el backend offline.
+
+Uso:
+    python benchmarks/bench_reader.py [bloques]
+"""
+
+import sys
+import os
+import random
+from collections import Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utilities import snapshot
+from utilities.cad_manager import cad
+from utilities.offline_cad import OfflineBackend, OfflineDocument
+
+
+class CountingProxy:
+    def __init__(self, target, counter):
+        self._target = target
+        self._counter = counter
+
+    def __getattr__(self, name):
+        self._counter[name] += 1
+        return getattr(self._target, name)
+
+
+def legacy_read_blocks(msp):
+    """Lectura de bloques previa: InsertionPoint se pedía una vez por coordenada."""
+    blocks = []
+    for i in range(msp.Count):
+        obj = msp.Item(i)
+        if obj.EntityName != "AcDbBlockReference":
+            continue
+        data = {
+            "Handle": obj.Handle,
+            "Nombre": obj.Name,
+            "Capa": obj.Layer,
+            "X": round(obj.InsertionPoint[0], 4),
+            "Y": round(obj.InsertionPoint[1], 4),
+            "Z": round(obj.InsertionPoint[2], 4),
+            "Rotacion": round(obj.Rotation, 4),
+        }
+        try:
+            data["Nombre"] = obj.EffectiveName
+        except AttributeError:
+            pass
+        if obj.HasAttributes:
+            for attrib in obj.GetAttributes():
+                data[f"Attr_{attrib.TagString}"] = attrib.TextString
+        blocks.append(data)
+    return blocks
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(5)
+    doc = OfflineDocument("bench_reader.dwg")
+    for i in range(n):
+        doc.ModelSpace.InsertBlock(
+            (rng.uniform(0, 1000), rng.uniform(0, 1000), 0), "POSTE_C_9", layer="POSTES"
+        )
+
+    counter = Counter()
+    proxies = [CountingProxy(obj, counter) for obj in doc.ModelSpace]
+    doc.ModelSpace.Item = lambda i: proxies[i]
+
+    cad.set_backend(OfflineBackend(doc))
+    cad.connect()
+
+    legacy = legacy_read_blocks(doc.ModelSpace)
+    legacy_calls = sum(counter.values())
+
+    counter.clear()
+    snap = snapshot.take_snapshot(kinds=(snapshot.KIND_BLOCKS,))
+    new_calls = sum(counter.values())
+
+    assert list(snap.blocks.values()) == legacy, "Los datos leídos difieren"
+    print(f"{n} bloques sin atributos:")
+    print(f"  Lectura previa:   {legacy_calls / n:5.1f} llamadas por entidad")
+    print(f"  Plan por tipo:    {new_calls / n:5.1f} llamadas por entidad")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: lectura filtrada por SelectionSet vs. recorrido completo del ModelSpace.
+
+Con el backend offline no hay costo de IDispatch, así que además del tiempo se
+reporta cuántos objetos se entregan a Python (cada uno son varias llamadas COM
+en AutoCAD real).
+
+Uso:
+    python benchmarks/bench_selection.py [entidades] [porcentaje_postes]
+"""
+
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utilities import snapshot
+from utilities.cad_manager import cad
+from utilities.offline_cad import OfflineBackend, OfflineDocument
+from utilities.selection import EntityFilter, SelectionQuery
+
+
+def synthetic_drawing(n_entities: int, pole_ratio: float, seed: int = 11):
+    """Plano con mayoría de líneas/textos de otras capas y unos pocos postes."""
+    rng = random.Random(seed)
+    doc = OfflineDocument("bench_selection.dwg")
+    msp = doc.ModelSpace
+    for i in range(n_entities):
+        x, y = rng.uniform(0, 5000), rng.uniform(0, 5000)
+        r = rng.random()
+        if r < pole_ratio:
+            msp.InsertBlock((x, y, 0), "POSTE_C_9", layer="POSTES")
+        elif r < 0.5:
+            msp.AddLine((x, y), (x + 5, y), layer=f"CATASTRO_{i % 20}")
+        else:
+            msp.AddText(f"T{i}", (x, y), layer=f"TEXTOS_{i % 10}")
+    return doc
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    ratio = float(sys.argv[2]) / 100 if len(sys.argv) > 2 else 0.02
+
+    cad.set_backend(OfflineBackend(synthetic_drawing(n, ratio)))
+    cad.connect()
+
+    query = SelectionQuery(
+        [EntityFilter(snapshot.BLOCK_TYPES, block_names=["POSTE_C_9"])]
+    )
+
+    t0 = time.perf_counter()
+    completa = snapshot.take_snapshot(kinds=(snapshot.KIND_BLOCKS,))
+    t_full = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    filtrada = snapshot.take_filtered_snapshot(query, kinds=(snapshot.KIND_BLOCKS,))
+    t_sel = time.perf_counter() - t0
+
+    assert filtrada.blocks == completa.blocks, "La lectura filtrada difiere"
+    print(f"{n} entidades, {len(completa.blocks)} postes:")
+    print(
+        f"  Recorrido completo: {t_full:8.3f}s ({completa.total_entities} objetos leídos)"
+    )
+    print(
+        f"  SelectionSet:       {t_sel:8.3f}s ({filtrada.total_entities} objetos leídos)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: snap de puntos al nodo más cercano de un NetworkGraph.
+
+Compara la búsqueda lineal original contra el índice de rejilla sobre una red
+cuadriculada sintética (por defecto ~100k nodos).
+
+Uso:
+    python benchmarks/bench_snap.py [lado_de_la_malla] [cantidad_de_consultas]
+"""
+
+import sys
+import os
+import math
+import random
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utilities.graph import NetworkGraph
+
+
+def build_mesh(side: int, spacing: float = 30.0) -> NetworkGraph:
+    grafo = NetworkGraph(tolerance=0.1)
+    for i in range(side):
+        for j in range(side):
+            p = (i * spacing, j * spacing)
+            if i + 1 < side:
+                grafo.add_line(p, ((i + 1) * spacing, j * spacing))
+            if j + 1 < side:
+                grafo.add_line(p, (i * spacing, (j + 1) * spacing))
+    return grafo
+
+
+def linear_nearest(grafo: NetworkGraph, point, max_radius: float):
+    """Implementación previa: recorrido lineal con caja delimitadora."""
+    best_node, min_dist = None, float("inf")
+    for key, coords in grafo.nodes.items():
+        if abs(point[0] - coords[0]) > max_radius:
+            continue
+        if abs(point[1] - coords[1]) > max_radius:
+            continue
+        d = math.hypot(point[0] - coords[0], point[1] - coords[1])
+        if d < min_dist:
+            min_dist, best_node = d, key
+    if min_dist <= max_radius:
+        return best_node, min_dist
+    return None, None
+
+
+def main():
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else 317
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    spacing = 30.0
+    rng = random.Random(42)
+
+    t0 = time.perf_counter()
+    grafo = build_mesh(side, spacing)
+    print(f"Grafo: {len(grafo.nodes)} nodos ({time.perf_counter() - t0:.2f}s)")
+
+    extent = (side - 1) * spacing
+    points = [(rng.uniform(0, extent), rng.uniform(0, extent)) for _ in range(queries)]
+
+    t0 = time.perf_counter()
+    indexed = [grafo.find_nearest_node(p, max_radius=5.0) for p in points]
+    t_index = (time.perf_counter() - t0) / queries
+
+    sample = points[: max(1, min(queries, 50))]
+    t0 = time.perf_counter()
+    linear = [linear_nearest(grafo, p, 5.0) for p in sample]
+    t_linear = (time.perf_counter() - t0) / len(sample)
+
+    assert linear == indexed[: len(sample)], "El índice difiere de la búsqueda lineal"
+
+    t0 = time.perf_counter()
+    for p in points:
+        grafo.find_k_nearest_nodes(p, 8)
+    t_knn = (time.perf_counter() - t0) / queries
+
+    print(f"Lineal:          {t_linear * 1000:8.3f} ms/snap")
+    print(f"Rejilla:         {t_index * 1000:8.3f} ms/snap ({t_linear / t_index:.0f}x)")
+    print(f"Rejilla (k=8):   {t_knn * 1000:8.3f} ms/consulta")
+
+
+if __name__ == "__main__":
+    main()
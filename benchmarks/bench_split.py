@@ -0,0 +1,121 @@
+"""
+Benchmark: split_segments_with_poles con índice de rejilla vs. versión cuadrática.
+
+Genera una red radial sintética con postes sobre los cables (y algunos fuera),
+verifica que ambas versiones producen exactamente los mismos segmentos y reporta
+el factor de mejora.
+
+Uso:
+    python benchmarks/bench_split.py [segmentos] [postes]
+"""
+
+import sys
+import os
+import math
+import random
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utilities.geometry import (
+    split_segments_with_poles,
+    point_to_segment_projection,
+    calculate_distance,
+)
+
+
+def legacy_split(segmentos, postes, tolerancia=1.0):
+    """Implementación previa: cada segmento contra todos los postes."""
+    nuevos = []
+    for p1, p2 in segmentos:
+        en_segmento = []
+        for poste in postes:
+            proj, dist = point_to_segment_projection((poste["X"], poste["Y"]), p1, p2)
+            if dist <= tolerancia:
+                en_segmento.append((calculate_distance(p1, proj), proj))
+        if not en_segmento:
+            nuevos.append((p1, p2))
+            continue
+        en_segmento.sort(key=lambda item: item[0])
+        actual = p1
+        for _, proj in en_segmento:
+            if calculate_distance(actual, proj) > 0.1:
+                nuevos.append((actual, proj))
+            actual = proj
+        if calculate_distance(actual, p2) > 0.1:
+            nuevos.append((actual, p2))
+    return nuevos
+
+
+def synthetic_network(n_segments: int, n_poles: int, seed: int = 1):
+    """
+    Alimentador sintético: tramos de ~30 m que avanzan con giros suaves y se
+    ramifican desde nodos existentes, con postes cerca de los tramos.
+    """
+    rng = random.Random(seed)
+    nodes = [((0.0, 0.0), 0.0)]  # (punto, rumbo)
+    segmentos = []
+    for _ in range(n_segments):
+        if rng.random() < 0.85:
+            (x, y), rumbo = nodes[-1]  # Continúa el ramal actual
+        else:
+            (x, y), rumbo = nodes[rng.randrange(len(nodes))]
+            rumbo += rng.choice((-1, 1)) * math.pi / 2  # Nueva derivación
+        rumbo += rng.uniform(-0.3, 0.3)
+        largo = rng.uniform(20.0, 40.0)
+        p2 = (
+            round(x + largo * math.cos(rumbo), 4),
+            round(y + largo * math.sin(rumbo), 4),
+        )
+        segmentos.append(((x, y), p2))
+        nodes.append((p2, rumbo))
+
+    postes = []
+    for i in range(n_poles):
+        (ax, ay), (bx, by) = segmentos[rng.randrange(len(segmentos))]
+        t = rng.random()
+        desvio = rng.uniform(-2.0, 2.0)  # Parte de los postes queda fuera de tolerancia
+        postes.append(
+            {
+                "Handle": f"P{i}",
+                "X": round(ax + t * (bx - ax) + desvio, 4),
+                "Y": round(ay + t * (by - ay) + desvio, 4),
+            }
+        )
+    return segmentos, postes
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    n_segments = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    n_poles = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+
+    # La versión cuadrática se mide sobre una muestra reducida y se extrapola
+    ratio = min(1.0, 2000 / n_segments)
+    sample_segments = max(1, int(n_segments * ratio))
+    sample_poles = max(1, int(n_poles * ratio))
+    segmentos, postes = synthetic_network(sample_segments, sample_poles)
+
+    nuevo, t_new = timed(split_segments_with_poles, segmentos, postes, tolerancia=1.5)
+    viejo, t_old = timed(legacy_split, segmentos, postes, tolerancia=1.5)
+    assert nuevo == viejo, "La versión indexada produjo segmentos distintos"
+
+    print(f"Muestra {sample_segments} segmentos x {sample_poles} postes:")
+    print(f"  Cuadrática: {t_old:8.3f}s")
+    print(f"  Rejilla:    {t_new:8.3f}s ({t_old / t_new:.0f}x)")
+
+    segmentos, postes = synthetic_network(n_segments, n_poles)
+    nuevo, t_full = timed(split_segments_with_poles, segmentos, postes, tolerancia=1.5)
+    escala = (n_segments * n_poles) / (sample_segments * sample_poles)
+    print(f"Completo {n_segments} segmentos x {n_poles} postes -> {len(nuevo)} tramos:")
+    print(f"  Rejilla:    {t_full:8.3f}s")
+    print(f"  Cuadrática: ~{t_old * escala:7.1f}s (extrapolado)")
+
+
+if __name__ == "__main__":
+    main()
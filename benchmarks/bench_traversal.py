@@ -0,0 +1,60 @@
+"""
+Benchmark: DFS iterativo sobre redes grandes (por defecto 500k nodos).
+
+Mide tiempo y memoria pico (tracemalloc) del recorrido para cada política de
+orden de ramas, sobre un alimentador largo con derivaciones cortas.
+
+Uso:
+    python benchmarks/bench_traversal.py [nodos]
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utilities.graph import NetworkGraph, NEIGHBOR_ORDERS, ORDER_LONGEST_SUBTREE_LAST
+
+
+def long_feeder(n_nodes: int) -> NetworkGraph:
+    """Troncal recta con una derivación de 3 tramos cada 50 m."""
+    grafo = NetworkGraph(tolerance=0.1)
+    x = 0.0
+    creados = 1
+    while creados < n_nodes:
+        grafo.add_line((x, 0.0), (x + 10.0, 0.0))
+        creados += 1
+        if int(x) % 50 == 0 and creados + 3 <= n_nodes:
+            y = 0.0
+            for _ in range(3):
+                grafo.add_line((x, y), (x, y + 8.0))
+                y += 8.0
+                creados += 1
+        x += 10.0
+    return grafo
+
+
+def main():
+    n_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+
+    t0 = time.perf_counter()
+    grafo = long_feeder(n_nodes)
+    print(f"Grafo: {len(grafo.nodes)} nodos ({time.perf_counter() - t0:.1f}s)")
+
+    for order in list(NEIGHBOR_ORDERS) + [ORDER_LONGEST_SUBTREE_LAST]:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        ruta = grafo.dfs_traversal((0.0, 0.0), order=order)
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{order:<22} {elapsed:7.2f}s  {len(ruta)} nodos  "
+            f"pico {peak / 1e6:6.1f} MB ({peak / len(ruta):.0f} B/nodo)"
+        )
+
+
+if __name__ == "__main__":
+    main()
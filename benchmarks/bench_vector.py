@@ -0,0 +1,67 @@
+"""
+Benchmark: núcleo NumPy (vector_geometry) vs. rutas escalares de geometry.
+
+Uso:
+    python benchmarks/bench_vector.py [postes] [etiquetas]
+"""
+
+import sys
+import os
+import logging
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_association import synthetic_labels
+from utilities import vector_geometry
+from utilities.geometry import associate_data, sort_blocks_by_path
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def compare(label, fn, make_args, **kwargs):
+    vector_geometry.VECTORIZE_MIN_PAIRS = 10**18
+    escalar, t_esc = timed(fn, *make_args(), **kwargs)
+    vector_geometry.VECTORIZE_MIN_PAIRS = 1
+    vectorizado, t_vec = timed(fn, *make_args(), **kwargs)
+    assert escalar == vectorizado, f"{label}: resultados distintos"
+    print(f"{label}:")
+    print(f"  Escalar:           {t_esc:8.3f}s")
+    print(f"  NumPy:             {t_vec:8.3f}s ({t_esc / t_vec:.1f}x)")
+
+
+def main():
+    if not vector_geometry.available():
+        print("NumPy no está instalado; no hay nada que comparar.")
+        return
+
+    # sort_blocks_by_path registra un aviso por cada bloque fuera de alcance
+    logging.disable(logging.WARNING)
+
+    n_poles = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    n_labels = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    postes, etiquetas = synthetic_labels(n_poles, n_labels)
+
+    for global_match in (False, True):
+        compare(
+            f"associate_data {n_poles} x {n_labels} (global={global_match})",
+            associate_data,
+            lambda: ([dict(p) for p in postes], etiquetas, 15.0),
+            global_match=global_match,
+        )
+
+    # Ruta = los propios postes en orden; bloques = etiquetas
+    ruta = [(p["X"], p["Y"]) for p in postes[:5000]]
+    compare(
+        f"sort_blocks_by_path {len(ruta)} vértices x 20000 bloques",
+        sort_blocks_by_path,
+        lambda: ([dict(e) for e in etiquetas[:20000]], ruta, 15.0),
+    )
+
+
+if __name__ == "__main__":
+    main()
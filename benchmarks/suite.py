@@ -0,0 +1,283 @@
+"""
+Suite de benchmarks reproducible con línea base.
+
+Genera redes sintéticas (alimentador radial y malla) a la escala elegida y
+mide por separado cada etapa de la numeración: división de vanos, armado del
+grafo, recorrido, asignación de postes, asociación de etiquetas y la
+numeración completa sobre un dibujo offline. Con NumPy se miden además la
+conversión del grafo a CSR y el recorrido sobre esa copia. Cada etapa se mide
+'repeat' veces y se toma el mejor tiempo.
+
+Los tiempos se comparan con benchmarks/baseline.json: la corrida falla
+(código de salida 1) si alguna etapa tarda más de 'threshold' veces su línea
+base y la diferencia supera el piso de ruido. Los tiempos absolutos solo valen
+en la máquina que los midió, así que la línea base no se versiona: cada quien
+la genera en la suya con --update-baseline antes de comparar.
+
+Uso:
+    python benchmarks/suite.py [--scale small|medium|large] [--repeat N]
+                               [--threshold 1.5] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks import synthetic
+from utilities import drawing, entities, graph_csr, layers, snapshot
+from utilities.cad_manager import ComBackend, cad
+from utilities.entity_reader import BlockFilter
+from utilities.geometry import associate_data, split_segments_with_poles
+from utilities.graph import NetworkGraph
+from utilities.instrumentation import finish_run, start_run
+from utilities.numbering import assign_poles_to_path
+from utilities.offline_cad import OfflineBackend, document_from_dict
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+BASELINE_FORMAT = 1
+
+# Una etapa regresiona si tarda más de THRESHOLD veces su línea base...
+DEFAULT_THRESHOLD = 1.5
+# ...y la diferencia supera este piso (segundos), por debajo es ruido
+NOISE_FLOOR = 0.005
+
+# Escala: (vanos del alimentador radial, lado de la malla, postes)
+SCALES = {
+    "tiny": (300, 12, 200),
+    "small": (3000, 40, 2000),
+    "medium": (30000, 120, 20000),
+    "large": (150000, 260, 100000),
+}
+
+SPLIT_TOLERANCE = 1.5
+GRAPH_TOLERANCE = 0.1
+ASSOCIATION_RADIUS = 15.0
+ORIGIN = (0.0, 0.0)
+
+
+def build_scenarios(scale: str) -> Dict[str, dict]:
+    """{topología: {"segmentos", "postes", "etiquetas"}} para la escala."""
+    n_spans, grid_side, n_poles = SCALES[scale]
+    scenarios = {}
+    for name, segments in (
+        ("radial", synthetic.radial_feeder(n_spans)),
+        ("malla", synthetic.meshed_grid(grid_side, grid_side)),
+    ):
+        poles = synthetic.poles_along(segments, n_poles)
+        scenarios[name] = {
+            "segmentos": segments,
+            "postes": poles,
+            "etiquetas": synthetic.labels_near(poles),
+        }
+    return scenarios
+
+
+def _build_graph(segments) -> NetworkGraph:
+    graph = NetworkGraph(tolerance=GRAPH_TOLERANCE)
+    for p1, p2 in segments:
+        graph.add_line(p1, p2)
+    return graph
+
+
+def _traverse(graph) -> list:
+    root, _ = graph.find_nearest_node(ORIGIN, max_radius=50.0)
+    return graph.dfs_traversal(root)
+
+
+def number_offline(document: dict) -> int:
+    """
+    Numeración completa sobre un dibujo offline, con los mismos pasos que
+    NumeracionWorker (estrategia DFS con asociación). Devuelve los insertados.
+    """
+    cad.set_backend(OfflineBackend(document_from_dict(document)))
+    try:
+        cad.connect()
+        layers.ensure_layer("NUMERACION")
+        snap = snapshot.take_snapshot(
+            kinds=(
+                snapshot.KIND_BLOCKS,
+                snapshot.KIND_TEXTS,
+                snapshot.KIND_LINES,
+                snapshot.KIND_POLYLINES,
+            )
+        )
+        segments = entities.extract_network_lines(
+            {"red": synthetic.NETWORK_LAYER}, snapshot=snap
+        )
+        poles = entities.extract_blocks(
+            snapshot=snap, block_filter=BlockFilter(names=[synthetic.POLE_BLOCK])
+        )
+        labels = entities.extract_texts(layer_name=synthetic.LABEL_LAYER, snapshot=snap)
+        segments = split_segments_with_poles(segments, poles, SPLIT_TOLERANCE)
+        route = _traverse(_build_graph(segments))
+        poles = associate_data(poles, labels, radius=ASSOCIATION_RADIUS)
+        on_route, stragglers = assign_poles_to_path(route, poles, radius=1.5)
+        results = drawing.insert_blocks_bulk(
+            [{"x": p["X"], "y": p["Y"]} for p in on_route + stragglers],
+            block_name=synthetic.NUMBER_BLOCK,
+            layer="NUMERACION",
+            number_tag=synthetic.NUMBER_TAG,
+        )
+        return sum(results)
+    finally:
+        cad.set_backend(ComBackend())
+
+
+def _best_of(repeat: int, setup: Callable, fn: Callable) -> float:
+    """Mejor tiempo de 'repeat' corridas; setup() prepara datos sin medirse."""
+    best = float("inf")
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(scale: str, repeat: int = 3, verbose: bool = False) -> Dict[str, float]:
+    """Tiempos {"topología/etapa": segundos} de todas las etapas."""
+    results = {}
+    for name, data in build_scenarios(scale).items():
+        segments, poles, labels = data["segmentos"], data["postes"], data["etiquetas"]
+        split = split_segments_with_poles(segments, poles, SPLIT_TOLERANCE)
+        graph = _build_graph(split)
+        route = _traverse(graph)
+        document = synthetic.feeder_document(segments, poles, labels)
+
+        stages = {
+            "split": (
+                lambda: (segments, poles, SPLIT_TOLERANCE),
+                split_segments_with_poles,
+            ),
+            "graph_build": (lambda: (split,), _build_graph),
+            "traversal": (lambda: (graph,), _traverse),
+            "assignment": (lambda: (route, poles), assign_poles_to_path),
+            "association": (
+                # associate_data modifica los postes: cada corrida usa copias
+                lambda: ([dict(p) for p in poles], labels, ASSOCIATION_RADIUS),
+                associate_data,
+            ),
+            "numbering_e2e": (lambda: (document,), number_offline),
+        }
+        if graph_csr.available():
+            frozen = graph.freeze()
+            stages["graph_freeze"] = (lambda: (graph,), NetworkGraph.freeze)
+            stages["traversal_csr"] = (lambda: (frozen,), _traverse)
+        for stage, (setup, fn) in stages.items():
+            results[f"{name}/{stage}"] = _best_of(repeat, setup, fn)
+
+        if verbose:
+            start_run(f"numeración {name}")
+            number_offline(document)
+            for line in finish_run().format_lines():
+                print(line)
+    return results
+
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {"formato": BASELINE_FORMAT, "escalas": {}}
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("formato") != BASELINE_FORMAT:
+        raise ValueError(f"Formato de línea base no soportado en {path}.")
+    return baseline
+
+
+def save_baseline(
+    scale: str, results: Dict[str, float], path: str = BASELINE_PATH
+) -> None:
+    baseline = load_baseline(path)
+    baseline["escalas"][scale] = {
+        "tiempos": {stage: round(t, 5) for stage, t in sorted(results.items())},
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "fecha": time.strftime("%Y-%m-%d"),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def compare(
+    results: Dict[str, float],
+    reference: Optional[Dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+    noise_floor: float = NOISE_FLOOR,
+) -> List[dict]:
+    """
+    Una fila por etapa: {"etapa", "actual", "base", "razon", "regresion"}.
+    Sin referencia para una etapa, "base" y "razon" quedan en None.
+    """
+    rows = []
+    for stage, current in results.items():
+        base = (reference or {}).get(stage)
+        ratio = current / base if base else None
+        regression = (
+            base is not None
+            and current > base * threshold
+            and current - base > noise_floor
+        )
+        rows.append(
+            {
+                "etapa": stage,
+                "actual": current,
+                "base": base,
+                "razon": ratio,
+                "regresion": regression,
+            }
+        )
+    return rows
+
+
+def _print_report(rows: List[dict], threshold: float) -> None:
+    print(f"{'Etapa':<28}{'Actual (s)':>12}{'Base (s)':>12}{'Razón':>9}")
+    for row in rows:
+        base = f"{row['base']:.4f}" if row["base"] is not None else "-"
+        ratio = f"{row['razon']:.2f}x" if row["razon"] is not None else "-"
+        mark = f"  REGRESIÓN (> {threshold}x)" if row["regresion"] else ""
+        print(f"{row['etapa']:<28}{row['actual']:>12.4f}{base:>12}{ratio:>9}{mark}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Guarda los tiempos de esta corrida como nueva línea base.",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Desglose por etapa de la numeración."
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.scale, args.repeat, args.verbose)
+    if args.update_baseline:
+        save_baseline(args.scale, results, args.baseline)
+        print(f"Línea base '{args.scale}' actualizada en {args.baseline}.")
+
+    reference = load_baseline(args.baseline)["escalas"].get(args.scale)
+    rows = compare(results, reference["tiempos"] if reference else None, args.threshold)
+    _print_report(rows, args.threshold)
+
+    regressions = [row for row in rows if row["regresion"]]
+    if regressions:
+        print(f"{len(regressions)} etapa(s) con regresión respecto a la línea base.")
+        return 1
+    if reference is None:
+        print(f"Sin línea base para '{args.scale}' (usar --update-baseline).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Generador de redes eléctricas sintéticas para los benchmarks.
+
+Todo es determinista dada la semilla, así los tiempos de dos corridas (o de
+dos versiones del código) se comparan sobre exactamente los mismos datos.
+
+    segmentos = radial_feeder(5000)             # alimentador en árbol
+    segmentos = meshed_grid(40, 40)             # malla con anillos
+    postes = poles_along(segmentos, 4000)       # postes con desvío aleatorio
+    etiquetas = labels_near(postes, 0.8)        # códigos a distancia aleatoria
+    documento = feeder_document(segmentos, postes, etiquetas)
+"""
+
+import math
+import random
+from typing import List, Tuple
+
+Point2D = Tuple[float, float]
+Segment = Tuple[Point2D, Point2D]
+
+NETWORK_LAYER = "CAT_LINEA DE RED EXISTENTE"
+POLE_LAYER = "POSTES"
+LABEL_LAYER = "CAT_COD_POSTE"
+POLE_BLOCK = "POSTE_C_9"
+NUMBER_BLOCK = "UBICACION POSTES UTM"
+NUMBER_TAG = "000"
+
+
+def radial_feeder(
+    n_spans: int,
+    span: Tuple[float, float] = (20.0, 40.0),
+    branch_probability: float = 0.15,
+    seed: int = 1,
+) -> List[Segment]:
+    """
+    Alimentador radial (árbol): vanos que avanzan con giros suaves y, con
+    probabilidad 'branch_probability', derivan en ángulo recto desde un nodo
+    ya existente.
+    """
+    rng = random.Random(seed)
+    nodes = [((0.0, 0.0), 0.0)]  # (punto, rumbo)
+    segments = []
+    for _ in range(n_spans):
+        if rng.random() >= branch_probability:
+            (x, y), heading = nodes[-1]
+        else:
+            (x, y), heading = nodes[rng.randrange(len(nodes))]
+            heading += rng.choice((-1, 1)) * math.pi / 2
+        heading += rng.uniform(-0.3, 0.3)
+        length = rng.uniform(*span)
+        p2 = (
+            round(x + length * math.cos(heading), 4),
+            round(y + length * math.sin(heading), 4),
+        )
+        segments.append(((x, y), p2))
+        nodes.append((p2, heading))
+    return segments
+
+
+def meshed_grid(
+    rows: int,
+    cols: int,
+    spacing: float = 30.0,
+    missing_ratio: float = 0.1,
+    seed: int = 1,
+) -> List[Segment]:
+    """
+    Malla urbana: vanos horizontales y verticales entre nodos de una grilla
+    (con anillos), omitiendo al azar 'missing_ratio' de ellos. Los vanos que
+    unen el primer nodo se conservan siempre para que el origen esté en la red.
+    """
+    rng = random.Random(seed)
+
+    def node(r, c):
+        return (round(c * spacing, 4), round(r * spacing, 4))
+
+    segments = []
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in ((0, 1), (1, 0)):
+                if r + dr >= rows or c + dc >= cols:
+                    continue
+                if (r, c) != (0, 0) and rng.random() < missing_ratio:
+                    continue
+                segments.append((node(r, c), node(r + dr, c + dc)))
+    return segments
+
+
+def poles_along(
+    segments: List[Segment],
+    n_poles: int,
+    jitter: float = 1.0,
+    off_network_ratio: float = 0.05,
+    seed: int = 2,
+) -> List[dict]:
+    """
+    Postes en puntos al azar de los vanos, desplazados hasta 'jitter' en cada
+    eje. Una fracción 'off_network_ratio' queda lejos de los cables (hasta
+    10 m), como los postes rezagados de un plano real.
+    """
+    rng = random.Random(seed)
+    poles = []
+    for i in range(n_poles):
+        (ax, ay), (bx, by) = segments[rng.randrange(len(segments))]
+        t = rng.random()
+        spread = 10.0 if rng.random() < off_network_ratio else jitter
+        poles.append(
+            {
+                "Handle": f"P{i:X}",
+                "Nombre": POLE_BLOCK,
+                "Capa": POLE_LAYER,
+                "X": round(ax + t * (bx - ax) + rng.uniform(-spread, spread), 4),
+                "Y": round(ay + t * (by - ay) + rng.uniform(-spread, spread), 4),
+            }
+        )
+    return poles
+
+
+def labels_near(
+    poles: List[dict],
+    ratio: float = 0.8,
+    max_distance: float = 12.0,
+    seed: int = 3,
+) -> List[dict]:
+    """
+    Una etiqueta de código para una fracción 'ratio' de los postes, a una
+    distancia y un ángulo aleatorios (hasta 'max_distance').
+    """
+    rng = random.Random(seed)
+    labels = []
+    for i, pole in enumerate(poles):
+        if rng.random() >= ratio:
+            continue
+        distance = rng.uniform(0.0, max_distance)
+        angle = rng.uniform(0.0, 2 * math.pi)
+        labels.append(
+            {
+                "Handle": f"T{i:X}",
+                "Texto": f"COD-{i}",
+                "Capa": LABEL_LAYER,
+                "X": round(pole["X"] + distance * math.cos(angle), 4),
+                "Y": round(pole["Y"] + distance * math.sin(angle), 4),
+            }
+        )
+    return labels
+
+
+def feeder_document(
+    segments: List[Segment], poles: List[dict], labels: List[dict]
+) -> dict:
+    """Dibujo para utilities.offline_cad.document_from_dict."""
+    entities = [
+        {"type": "AcDbLine", "layer": NETWORK_LAYER, "start": p1, "end": p2}
+        for p1, p2 in segments
+    ]
+    entities += [
+        {
+            "type": "AcDbBlockReference",
+            "layer": POLE_LAYER,
+            "name": POLE_BLOCK,
+            "insertion": [pole["X"], pole["Y"]],
+        }
+        for pole in poles
+    ]
+    entities += [
+        {
+            "type": "AcDbText",
+            "layer": LABEL_LAYER,
+            "text": label["Texto"],
+            "insertion": [label["X"], label["Y"]],
+        }
+        for label in labels
+    ]
+    return {
+        "name": "sintetico.dwg",
+        "layers": [
+            {"name": NETWORK_LAYER, "color": 1},
+            {"name": POLE_LAYER, "color": 3},
+            {"name": LABEL_LAYER, "color": 2},
+        ],
+        "blocks": {NUMBER_BLOCK: [NUMBER_TAG]},
+        "entities": entities,
+    }
@@ -1,5 +1,6 @@
 from PySide6.QtWidgets import QMessageBox
-from utilities.cad_manager import cad
+from utilities.cad_session import cad_session
+from interface.workers.cad_job import SessionCall
 from interface.workers.capas_worker import CapasWorker
 
 
@@ -12,23 +13,41 @@ class CapasController:
     def set_view(self, view):
         self.view = view
 
-    def _check_connection(self) -> bool:
-        cad.connect()
-        if not cad.is_connected:
-            self.main.log("ERROR: AutoCAD no está conectado.")
-            return False
-        return True
-
-    def cargar_capas(self):
-        if not self._check_connection():
+    def _run(self, action: str, datos: dict = None):
+        """
+        Lanza el worker una vez conectado. Si hace falta conectar, la conexión
+        se encola en la sesión CAD y la interfaz no espera su resultado.
+        """
+        self.view.set_ui_state(False)
+        if cad_session.manager.is_connected:
+            self._lanzar_worker(action, datos)
             return
+        SessionCall(
+            "conectar",
+            cad_session.connect_if_needed,
+            lambda conectado: (
+                self._lanzar_worker(action, datos)
+                if conectado
+                else self._on_sin_conexion()
+            ),
+            self._on_sin_conexion,
+        ).start()
+
+    def _on_sin_conexion(self, error: str = None):
+        detalle = f" ({error})" if error else ""
+        self.main.log(f"ERROR: AutoCAD no está conectado.{detalle}")
+        self.view.set_ui_state(True)
 
-        self.view.set_ui_state(False)
-        self.worker = CapasWorker("listar")
-        self.worker.log_signal.connect(self.main.log)
-        self.worker.finished_signal.connect(self.on_worker_finished)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.worker.start()
+    def _lanzar_worker(self, action: str, datos: dict = None):
+        worker = CapasWorker(action, datos)
+        self.main.connect_worker(worker)
+        worker.finished_signal.connect(self.on_worker_finished)
+        # Si se fusionó con uno pendiente, ese entrega el resultado
+        if worker.start():
+            self.worker = worker
+
+    def cargar_capas(self):
+        self._run("listar")
 
     def crear_capa(self):
         datos = self.view.get_datos_creacion()
@@ -38,15 +57,7 @@ class CapasController:
             self.main.log("Aviso: Debes ingresar un nombre para la capa.")
             return
 
-        if not self._check_connection():
-            return
-
-        self.view.set_ui_state(False)
-        self.worker = CapasWorker("crear", datos)
-        self.worker.log_signal.connect(self.main.log)
-        self.worker.finished_signal.connect(self.on_worker_finished)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.worker.start()
+        self._run("crear", datos)
 
     def eliminar_capa(self):
         nombre = self.view.get_capa_seleccionada()
@@ -64,15 +75,7 @@ class CapasController:
         if reply == QMessageBox.No:
             return
 
-        if not self._check_connection():
-            return
-
-        self.view.set_ui_state(False)
-        self.worker = CapasWorker("eliminar", {"nombre": nombre})
-        self.worker.log_signal.connect(self.main.log)
-        self.worker.finished_signal.connect(self.on_worker_finished)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.worker.start()
+        self._run("eliminar", {"nombre": nombre})
 
     def on_worker_finished(self, result: dict):
         self.view.set_ui_state(True)
@@ -1,6 +1,8 @@
-import csv
 from typing import TYPE_CHECKING
 from utilities.cad_manager import cad
+from utilities.exporters import available_formats, format_for_path
+from utilities.table_data import ColumnarTable
+from interface.workers.export_worker import ExportWorker
 from interface.workers.extractor_worker import ExtractorWorker
 
 if TYPE_CHECKING:
@@ -11,8 +13,9 @@ class ExtractorController:
     def __init__(self, main_controller: "MainController"):
         self.main = main_controller
         self.view = None
-        self.current_data = []
-        self.worker = None
+        self.current_data = None  # ColumnarTable de la última extracción
+        self.worker = None  # Extracción en curso
+        self.export_worker = None  # Exportación en curso (puede solaparse)
 
     def set_view(self, view):
         self.view = view
@@ -29,67 +32,56 @@ class ExtractorController:
         self.main.log(f"Iniciando extracción de {entity_type} en {msg_capa}...")
         self.view.set_extraction_state(True)
 
-        self.worker = ExtractorWorker(entity_type, layer_arg)
-        self.worker.progress_signal.connect(self.view.update_progress)
-        self.worker.log_signal.connect(self.main.log)
-        self.worker.finished_signal.connect(self.on_extraction_finished)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.worker.start()
-
-    def on_extraction_finished(self, data):
-        self.current_data = data
+        worker = ExtractorWorker(entity_type, layer_arg)
+        self.main.connect_worker(worker, self.view.update_progress)
+        worker.finished_signal.connect(self.on_extraction_finished)
+        # Si se fusionó con uno pendiente, ese entrega el resultado
+        if worker.start():
+            self.worker = worker
+
+    def cancel_extraction(self):
+        # El botón Cancelar de la pestaña detiene lo que esté en curso
+        for worker in (self.worker, self.export_worker):
+            if worker is not None:
+                self.main.log("Cancelando...")
+                worker.cancel()
+
+    def on_extraction_finished(self, table: ColumnarTable):
+        # El progreso pendiente se aplica antes de ocultar la barra
+        self.main.flush_feed()
+        self.worker = None
+        # El worker ya entrega la tabla por columnas
+        self.current_data = table
         self.main.log(
             f"Extracción completada: {len(self.current_data)} elementos encontrados."
         )
         self.view.populate_table(self.current_data)
         self.view.set_extraction_state(False)
 
-    def export_to_csv(self):
+    def export_results(self):
         if not self.current_data:
             self.main.log("No hay datos para exportar.")
             return
 
-        file_path = self.view.show_save_dialog()
+        file_path = self.view.show_save_dialog(available_formats())
         if not file_path:
             return
 
-        try:
-            self.main.log(f"Exportando {len(self.current_data)} filas a CSV...")
-
-            primer_elemento = self.current_data[0]
-
-            if isinstance(primer_elemento, dict):
-                headers = []
-                for row in self.current_data:
-                    if isinstance(row, dict):
-                        for key in row.keys():
-                            if key not in headers:
-                                headers.append(key)
-
-                with open(file_path, mode="w", newline="", encoding="utf-8") as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=headers)
-                    writer.writeheader()
-                    for row in self.current_data:
-                        if isinstance(row, dict):
-                            writer.writerow(row)
-            else:
-                # Flujo para listas o tuplas simples
-                with open(file_path, mode="w", newline="", encoding="utf-8") as f:
-                    writer = csv.writer(f)
-                    for row in self.current_data:
-                        # Tupla anidada ej: ((x1,y1), (x2,y2)), la aplanamos
-                        if isinstance(row, (list, tuple)):
-                            # Aplanar un nivel si es necesario, o guardarla cruda
-                            fila_plana = []
-                            for item in row:
-                                if isinstance(item, (list, tuple)):
-                                    fila_plana.extend(item)
-                                else:
-                                    fila_plana.append(item)
-                            writer.writerow(fila_plana)
-                        else:
-                            writer.writerow([row])
-
-            self.main.log(f"CSV guardado exitosamente en: {file_path}")
-        except Exception as e:
-            self.main.log(f"Error al guardar CSV: {str(e)}")
+        self.main.log(
+            f"Exportando {len(self.current_data)} filas "
+            f"({format_for_path(file_path)}) en segundo plano..."
+        )
+        self.view.set_extraction_state(True)
+        self.export_worker = ExportWorker(self.current_data, file_path)
+        self.main.connect_worker(self.export_worker, self.view.update_progress)
+        self.export_worker.finished_signal.connect(self.on_export_finished)
+        self.export_worker.start()
+
+    def on_export_finished(self, resultado: dict):
+        self.main.flush_feed()
+        self.export_worker = None
+        self.view.set_extraction_state(False)
+        if resultado.get("success"):
+            self.main.log(
+                f"{resultado['filas']} filas guardadas exitosamente en: {resultado['path']}"
+            )
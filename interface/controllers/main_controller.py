@@ -1,5 +1,12 @@
 import logging
+import queue
+from PySide6.QtCore import QTimer, Qt
 from utilities.cad_manager import cad
+from utilities.cad_session import cad_session
+from utilities.config import SETTINGS
+from utilities.mirror import live_mirror
+from utilities.update_feed import FRAME_MS, UpdateFeed
+from interface.workers.cad_job import SessionCall
 from .extractor_ctrl import ExtractorController
 from .numeracion_ctrl import NumeracionController
 from .capas_ctrl import CapasController
@@ -10,11 +17,21 @@ class MainController:
         self.logger = logging.getLogger("MainController")
         self.view = None
 
+        # Logs y progreso de los trabajos se agregan y se pintan una vez por cuadro
+        self.feed = UpdateFeed()
+        self.feed_timer = QTimer()
+        self.feed_timer.timeout.connect(self.flush_feed)
+        self.feed_timer.start(FRAME_MS)
+
         # Instanciación de módulos desacoplados
         self.extractor = ExtractorController(self)
         self.numeracion = NumeracionController(self)
         self.capas = CapasController(self)
 
+        # Espejo en vivo del dibujo (opcional, ver SETTINGS.ESPEJO_EN_VIVO)
+        self.mirror_timer = QTimer()
+        self.mirror_timer.timeout.connect(self.refresh_mirror)
+
     def set_view(self, view):
         self.view = view
         # Inyección de las sub-vistas específicas a cada controlador
@@ -23,15 +40,78 @@ class MainController:
         self.capas.set_view(view.tab_capas)
 
     def log(self, msg: str):
+        """Registra un mensaje. Puede llamarse desde cualquier hilo."""
         self.logger.info(msg)
-        if self.view:
-            self.view.append_log(msg)
+        self.feed.publish_log(msg)
+
+    def flush_feed(self):
+        """Aplica en la interfaz lo acumulado desde el último cuadro."""
+        lines, dropped, progress = self.feed.drain()
+        if self.view and (lines or dropped):
+            if dropped:
+                lines.insert(0, f"... {dropped} mensajes omitidos por volumen ...")
+            self.view.append_logs(lines)
+        for sink, value in progress:
+            sink(value)
+
+    def connect_worker(self, worker, progress_sink=None):
+        """
+        Conecta log/progreso de un trabajo al agregador. La conexión directa se
+        ejecuta en el hilo emisor: no se encola un evento Qt por mensaje.
+        """
+        worker.log_signal.connect(self.log, Qt.DirectConnection)
+        if progress_sink is not None:
+            worker.progress_signal.connect(
+                self.feed.progress_to(progress_sink), Qt.DirectConnection
+            )
 
     def connect_to_cad(self):
         self.log("Intentando conectar a AutoCAD...")
-        if cad.connect():
-            self.view.update_connection_status(True, cad.doc.Name)
-            self.log(f"Conexión exitosa con el documento: {cad.doc.Name}")
-        else:
-            self.view.update_connection_status(False, "")
-            self.log("Error: No se detectó ninguna instancia de AutoCAD abierta.")
+        # La conexión vive en el hilo de la sesión CAD (ver cad_session); la
+        # interfaz no espera: si hay un lote en curso, conecta al terminar este
+        SessionCall(
+            "conectar", _conectar, self.on_connected, self.on_connect_failed
+        ).start()
+
+    def on_connected(self, nombre):
+        if nombre is None:
+            self.on_connect_failed(
+                "No se detectó ninguna instancia de AutoCAD abierta."
+            )
+            return
+        self.view.update_connection_status(True, nombre)
+        self.log(f"Conexión exitosa con el documento: {nombre}")
+        if SETTINGS.ESPEJO_EN_VIVO:
+            self.start_mirror()
+
+    def on_connect_failed(self, error: str):
+        self.view.update_connection_status(False, "")
+        self.log(f"Error: {error}")
+
+    def refresh_mirror(self):
+        """Encola el refresco del espejo; si la cola está llena se omite este ciclo."""
+        try:
+            cad_session.schedule("espejo", live_mirror.refresh, key="espejo:refrescar")
+        except queue.Full:
+            self.logger.debug("Cola CAD llena: se omite un refresco del espejo.")
+
+    def start_mirror(self):
+        self.mirror_timer.stop()
+        SessionCall(
+            "iniciar espejo",
+            live_mirror.start,
+            self.on_mirror_started,
+            lambda error: self.log(f"No se pudo iniciar el espejo en vivo: {error}"),
+        ).start()
+
+    def on_mirror_started(self, iniciado: bool):
+        if iniciado:
+            self.log(f"Espejo en vivo activo (modo {live_mirror.mode}).")
+            self.mirror_timer.start(SETTINGS.ESPEJO_INTERVALO_MS)
+
+
+def _conectar():
+    """Conecta en el hilo de la sesión; nombre del documento o None."""
+    if not cad.connect():
+        return None
+    return cad.doc.Name
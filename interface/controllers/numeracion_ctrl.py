@@ -1,6 +1,9 @@
-import csv
-from PySide6.QtWidgets import QFileDialog
+import shutil
+from PySide6.QtWidgets import QFileDialog, QMessageBox
 from utilities.cad_manager import cad
+from utilities.cad_session import cad_session
+from utilities.insertion_journal import InsertionJournal
+from interface.workers.cad_job import SessionCall
 from interface.workers.numeracion_worker import NumeracionWorker
 
 
@@ -14,12 +17,6 @@ class NumeracionController:
         self.view = view
 
     def ejecutar_numeracion(self):
-        cad.connect()
-
-        if not cad.is_connected:
-            self.main.log("ERROR: AutoCAD no está conectado.")
-            return
-
         cfg = self.view.get_numeracion_config()
         estrategia = cfg.get("estrategia")
 
@@ -42,66 +39,127 @@ class NumeracionController:
             )
             return
 
-        self.main.log(f"--- INICIANDO NUMERACIÓN (Perfil: {cfg.get('perfil_id')}) ---")
-        # Bloqueo temporal de UI y solicitud de interacción con AutoCAD
+        # La conexión y las consultas a AutoCAD se encolan en la sesión CAD sin
+        # bloquear la interfaz; cada paso continúa en el callback del anterior
         self.view.set_execution_state(is_running=True)
-        self.main.view.hide()
-
-        punto_clic = None
-        try:
-            try:
-                cad.app.Visible = True
-            except Exception:
-                pass
-
-            self.main.log("Esperando clic del usuario en AutoCAD...")
+        SessionCall(
+            "documento activo",
+            _documento_activo,
+            lambda documento: self._on_documento(cfg, documento),
+            self._on_paso_fallido,
+        ).start()
+
+    def _on_documento(self, cfg: dict, documento: str):
+        if documento is None:
+            self.main.log("ERROR: AutoCAD no está conectado.")
+            self.view.set_execution_state(is_running=False)
+            return
 
-            # Llamada síncrona en el hilo principal
-            punto_com = cad.doc.Utility.GetPoint(
-                Prompt="\nSeleccione el poste/punto de inicio para la numeración: "
+        if self._ofrecer_reanudacion(cfg, documento):
+            self.main.log(
+                f"--- REANUDANDO NUMERACIÓN (Perfil: {cfg.get('perfil_id')}) ---"
             )
-            punto_clic = (round(punto_com[0], 4), round(punto_com[1], 4))
-
-            self.main.log(f"Clic capturado en coordenadas: {punto_clic}")
-
-        except Exception as e:
-            self.main.log(f"Selección cancelada o fallida: {e}")
-            self.view.set_execution_state(is_running=False)
-            self.main.view.show()
+            cfg["reanudar"] = True
+            self._lanzar_worker(cfg)
             return
 
+        self.main.log(f"--- INICIANDO NUMERACIÓN (Perfil: {cfg.get('perfil_id')}) ---")
+        # Solicitud de interacción con AutoCAD con la ventana oculta
+        self.main.view.hide()
+        self.main.log("Esperando clic del usuario en AutoCAD...")
+        SessionCall(
+            "pedir punto de inicio",
+            self._pedir_punto_inicio,
+            lambda punto_com: self._on_punto_inicio(cfg, punto_com),
+            self._on_punto_fallido,
+        ).start()
+
+    def _on_punto_inicio(self, cfg: dict, punto_com):
+        punto_clic = (round(punto_com[0], 4), round(punto_com[1], 4))
+        self.main.log(f"Clic capturado en coordenadas: {punto_clic}")
+
         # Restauración de UI e inyección de datos al Worker
         self.main.view.show()
         cfg["punto_inicio"] = punto_clic
+        self._lanzar_worker(cfg)
 
-        # Lanzamiento del hilo secundario
-        self.worker = NumeracionWorker(cfg)
-        self.worker.progress_signal.connect(self.view.update_progress)
-        self.worker.log_signal.connect(self.main.log)
-        self.worker.finished_signal.connect(self.on_numeracion_finished)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.worker.start()
+    def _on_punto_fallido(self, error: str):
+        self.main.view.show()
+        self.main.log(f"Selección cancelada o fallida: {error}")
+        self.view.set_execution_state(is_running=False)
+
+    def _on_paso_fallido(self, error: str):
+        self.main.log(f"ERROR: No se pudo consultar el dibujo: {error}")
+        self.view.set_execution_state(is_running=False)
+
+    def _lanzar_worker(self, cfg: dict):
+        # La numeración se encola como trabajo en la sesión CAD
+        worker = NumeracionWorker(cfg)
+        self.main.connect_worker(worker, self.view.update_progress)
+        worker.finished_signal.connect(self.on_numeracion_finished)
+        # Si se fusionó con uno pendiente, ese entrega el resultado
+        if worker.start():
+            self.worker = worker
+
+    def cancelar_numeracion(self):
+        if self.worker is not None:
+            self.main.log(
+                "Cancelando numeración (se detiene tras el poste en curso)..."
+            )
+            self.worker.cancel()
+
+    def _ofrecer_reanudacion(self, cfg: dict, documento: str) -> bool:
+        """Si este dibujo y perfil tienen una numeración a medias, pregunta si reanudarla."""
+        estado = InsertionJournal.for_run(documento, cfg.get("perfil_id")).load()
+        if estado is None or len(estado["confirmadas"]) >= len(estado["plan"]):
+            return False
+
+        reply = QMessageBox.question(
+            self.view,
+            "Numeración interrumpida",
+            f"Hay una numeración de este perfil que quedó a medias "
+            f"({len(estado['confirmadas'])} de {len(estado['plan'])} postes).\n\n"
+            "¿Deseas reanudarla? Si eliges No, se empezará una nueva.",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        return reply == QMessageBox.Yes
+
+    @staticmethod
+    def _pedir_punto_inicio():
+        try:
+            cad.app.Visible = True
+        except Exception:
+            pass
+        return cad.doc.Utility.GetPoint(
+            Prompt="\nSeleccione el poste/punto de inicio para la numeración: "
+        )
 
     def on_numeracion_finished(self, resultado: dict):
+        # El progreso pendiente se aplica antes de ocultar la barra
+        self.main.flush_feed()
         self.view.set_execution_state(is_running=False)
 
-        # Se extraen los datos enviados por el worker
+        # El worker deja el reporte ya escrito en disco; aquí solo se guarda
         success = resultado.get("success", False)
-        reporte_datos = resultado.get("reporte", [])
+        reporte = resultado.get("reporte") if resultado.get("filas_reporte") else None
 
-        if success:
+        if resultado.get("cancelado"):
+            self.main.log("--- NUMERACIÓN CANCELADA (puede reanudarse) ---")
+            if reporte:
+                self._exportar_reporte_csv(reporte)
+        elif success:
             self.main.log("--- NUMERACIÓN COMPLETADA CON ÉXITO ---")
-            if reporte_datos:
-                self._exportar_reporte_csv(reporte_datos)
+            if reporte:
+                self._exportar_reporte_csv(reporte)
         else:
             self.main.log("--- LA NUMERACIÓN FINALIZÓ CON ERRORES ---")
-            if reporte_datos:
+            if reporte:
                 self.main.log(
                     "Se generó un reporte parcial de la numeración. Intentando exportar..."
                 )
-                self._exportar_reporte_csv(reporte_datos)
+                self._exportar_reporte_csv(reporte)
 
-    def _exportar_reporte_csv(self, datos: list):
+    def _exportar_reporte_csv(self, ruta_reporte: str):
         file_path, _ = QFileDialog.getSaveFileName(
             self.view, "Guardar Reporte de Numeración", "", "CSV Files (*.csv)"
         )
@@ -111,19 +169,15 @@ class NumeracionController:
             return
 
         try:
-            # Recopilar cabeceras dinámicas (Handle, X, Y, Numero_Asignado, Data_Attr...)
-            headers = []
-            for row in datos:
-                for key in row.keys():
-                    if key not in headers:
-                        headers.append(key)
-
-            with open(file_path, mode="w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=headers)
-                writer.writeheader()
-                for row in datos:
-                    writer.writerow(row)
-
+            # Se copia por bloques: el reporte nunca se carga entero en memoria
+            shutil.copyfile(ruta_reporte, file_path)
             self.main.log(f"Reporte CSV generado exitosamente en: {file_path}")
         except Exception as e:
             self.main.log(f"Error al generar reporte CSV: {e}")
+
+
+def _documento_activo():
+    """Conecta si hace falta (hilo de la sesión); ruta del documento o None."""
+    if not cad_session.connect_if_needed():
+        return None
+    return cad.doc.FullName or cad.doc.Name
@@ -84,6 +84,9 @@ class MainWindow(QMainWindow):
     def append_log(self, message: str):
         self.tab_logs.append_log(message)
 
+    def append_logs(self, messages: list):
+        self.tab_logs.append_logs(messages)
+
     def get_layer_input(self) -> str:
         return self.tab_extractor.get_layer_input()
 
@@ -93,11 +96,11 @@ class MainWindow(QMainWindow):
     def update_ext_progress(self, value: int):
         self.tab_extractor.update_progress(value)
 
-    def populate_table(self, data: list):
-        self.tab_extractor.populate_table(data)
+    def populate_table(self, table):
+        self.tab_extractor.populate_table(table)
 
-    def show_save_dialog(self) -> str:
-        return self.tab_extractor.show_save_dialog()
+    def show_save_dialog(self, formats) -> str:
+        return self.tab_extractor.show_save_dialog(formats)
 
     def get_numeracion_config(self):
         return self.tab_numeracion.get_numeracion_config()
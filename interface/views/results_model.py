@@ -0,0 +1,97 @@
+from typing import List, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from utilities.table_data import ColumnarTable, display_value
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """
+    Modelo de solo lectura sobre una ColumnarTable. La vista solo pide las
+    celdas visibles, así que no se crea ningún objeto por celda.
+
+    Orden y filtro se resuelven dentro del modelo como una lista de filas
+    visibles (permutación de la tabla) en lugar de con un QSortFilterProxyModel,
+    que compararía y filtraría llamando a data() fila por fila.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.table: Optional[ColumnarTable] = None
+        self._rows: List[int] = []
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._filter_text = ""
+
+    def set_table(self, table: Optional[ColumnarTable]):
+        self.beginResetModel()
+        self.table = table
+        self._sort_column = -1
+        self._rebuild()
+        self.endResetModel()
+
+    def source_row(self, row: int) -> int:
+        """Fila de la tabla que ocupa la posición 'row' de la vista."""
+        return self._rows[row]
+
+    def _rebuild(self):
+        if self.table is None:
+            self._rows = []
+            return
+        if self._sort_column >= 0:
+            order = self.table.sort_order(
+                self._sort_column, self._sort_order == Qt.DescendingOrder
+            )
+        else:
+            order = range(len(self.table))
+        if self._filter_text:
+            self._rows = self.table.filter_rows(self._filter_text, order)
+        else:
+            self._rows = list(order)
+
+    def set_filter(self, text: str):
+        text = text.strip()
+        if text == self._filter_text:
+            return
+        self.beginResetModel()
+        self._filter_text = text
+        self._rebuild()
+        self.endResetModel()
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid() or self.table is None:
+            return 0
+        return self.table.column_count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return display_value(
+                self.table.value(self._rows[index.row()], index.column())
+            )
+        if role == Qt.UserRole:
+            return self.table.value(self._rows[index.row()], index.column())
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if self.table is not None and section < self.table.column_count:
+                return self.table.columns[section]
+            return None
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if self.table is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column
+        self._sort_order = order
+        self._rebuild()
+        self.layoutChanged.emit()
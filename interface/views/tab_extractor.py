@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -6,16 +7,28 @@ from PySide6.QtWidgets import (
     QPushButton,
     QLabel,
     QLineEdit,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHeaderView,
     QFileDialog,
     QProgressBar,
 )
+from interface.views.results_model import ResultsTableModel
+from utilities.exporters import FORMAT_ARROW, FORMAT_COLZ, FORMAT_CSV, FORMAT_PARQUET
+from utilities.table_data import ColumnarTable
 
 if TYPE_CHECKING:
     from interface.controllers.extractor_ctrl import ExtractorController
 
+# Filas que Qt mide para ajustar el ancho de las columnas tras una extracción
+RESIZE_SAMPLE_ROWS = 200
+
+EXPORT_FILTERS = {
+    FORMAT_CSV: "CSV (*.csv)",
+    FORMAT_PARQUET: "Parquet (*.parquet)",
+    FORMAT_ARROW: "Arrow IPC (*.arrow)",
+    FORMAT_COLZ: "Columnar comprimido (*.colz)",
+}
+
 
 class TabExtractor(QWidget):
     def __init__(self, controller: "ExtractorController"):
@@ -43,16 +56,39 @@ class TabExtractor(QWidget):
             lambda: self.controller.extract_data("textos")
         )
 
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.setVisible(False)
+        self.btn_cancel.clicked.connect(self.controller.cancel_extraction)
+
         controls_layout.addWidget(self.btn_extract_blocks)
         controls_layout.addWidget(self.btn_extract_texts)
+        controls_layout.addWidget(self.btn_cancel)
         layout.addLayout(controls_layout)
 
-        self.table = QTableWidget()
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filtrar resultados:"))
+        self.input_filter = QLineEdit()
+        self.input_filter.setPlaceholderText("Texto en cualquier columna")
+        self.input_filter.setClearButtonEnabled(True)
+        filter_layout.addWidget(self.input_filter)
+        layout.addLayout(filter_layout)
+
+        # Vista virtual: solo se dibujan (y se piden al modelo) las filas visibles
+        self.model = ResultsTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        # Filas de alto fijo: Qt no mide cada fila para desplazarse
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.setWordWrap(False)
+        self.input_filter.textChanged.connect(self.model.set_filter)
         layout.addWidget(self.table)
 
-        self.btn_export = QPushButton("Exportar a CSV")
+        self.btn_export = QPushButton("Exportar...")
         self.btn_export.setEnabled(False)
-        self.btn_export.clicked.connect(self.controller.export_to_csv)
+        self.btn_export.clicked.connect(self.controller.export_results)
         layout.addWidget(self.btn_export)
 
         self.ext_progress = QProgressBar()
@@ -65,6 +101,7 @@ class TabExtractor(QWidget):
         self.ext_progress.setVisible(is_running)
         self.btn_extract_blocks.setEnabled(not is_running)
         self.btn_extract_texts.setEnabled(not is_running)
+        self.btn_cancel.setVisible(is_running)
         if not is_running:
             self.ext_progress.setValue(0)
 
@@ -74,34 +111,21 @@ class TabExtractor(QWidget):
     def get_layer_input(self) -> str:
         return self.input_layer.text().strip()
 
-    def populate_table(self, data: list):
-        self.table.clear()
-        if not data:
-            self.table.setRowCount(0)
-            self.table.setColumnCount(0)
+    def populate_table(self, table: ColumnarTable):
+        self.model.set_table(table if table is not None and len(table) else None)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        if self.model.table is None:
             self.btn_export.setEnabled(False)
             return
 
-        headers = []
-        for row in data:
-            for key in row.keys():
-                if key not in headers:
-                    headers.append(key)
-
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.setRowCount(len(data))
-
-        for row_idx, row_data in enumerate(data):
-            for col_idx, key in enumerate(headers):
-                val = str(row_data.get(key, ""))
-                self.table.setItem(row_idx, col_idx, QTableWidgetItem(val))
-
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        # El ancho se estima con una muestra de filas, no recorriendo toda la tabla
+        self.table.horizontalHeader().setResizeContentsPrecision(RESIZE_SAMPLE_ROWS)
+        self.table.resizeColumnsToContents()
         self.btn_export.setEnabled(True)
 
-    def show_save_dialog(self) -> str:
+    def show_save_dialog(self, formats) -> str:
+        filters = [EXPORT_FILTERS[fmt] for fmt in formats]
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "Guardar CSV", "", "CSV Files (*.csv)"
+            self, "Exportar resultados", "", ";;".join(filters)
         )
         return file_path
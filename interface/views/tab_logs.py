@@ -1,4 +1,8 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QTextEdit
+from typing import List
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QPlainTextEdit
+
+# Líneas conservadas en pantalla; las más antiguas se descartan (búfer circular)
+MAX_LOG_LINES = 5000
 
 
 class TabLogs(QWidget):
@@ -8,12 +12,17 @@ class TabLogs(QWidget):
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
-        self.log_viewer = QTextEdit()
+        self.log_viewer = QPlainTextEdit()
         self.log_viewer.setReadOnly(True)
+        self.log_viewer.setMaximumBlockCount(MAX_LOG_LINES)
         self.log_viewer.setStyleSheet(
             "background-color: #1e1e1e; color: #00ff00; font-family: Consolas;"
         )
         layout.addWidget(self.log_viewer)
 
     def append_log(self, message: str):
-        self.log_viewer.append(message)
+        self.log_viewer.appendPlainText(message)
+
+    def append_logs(self, messages: List[str]):
+        """Agrega las líneas de un cuadro en una sola operación."""
+        self.log_viewer.appendPlainText("\n".join(messages))
@@ -52,8 +52,15 @@ class TabNumeracion(QWidget):
         self.btn_ejecutar_num.clicked.connect(self.controller.ejecutar_numeracion)
         layout.addWidget(self.btn_ejecutar_num)
 
+        self.btn_cancelar_num = QPushButton("Cancelar numeración")
+        self.btn_cancelar_num.setVisible(False)
+        self.btn_cancelar_num.clicked.connect(self.controller.cancelar_numeracion)
+        layout.addWidget(self.btn_cancelar_num)
+
     def set_execution_state(self, is_running: bool):
         self.btn_ejecutar_num.setEnabled(not is_running)
+        self.btn_cancelar_num.setVisible(is_running)
+        self.btn_cancelar_num.setEnabled(is_running)
         self.progress_bar.setVisible(is_running)
         if not is_running:
             self.progress_bar.setValue(0)
@@ -78,4 +85,6 @@ class TabNumeracion(QWidget):
             "tolerancia_grafo": 0.1,
             "radio_snap": SETTINGS.DEFAULT_SEARCH_RADIUS,
             "radio_asociacion": SETTINGS.DEFAULT_ASSOCIATION_RADIUS,
+            "asociacion_global": perfil_data.get("asociacion_global", False),
+            "orden_ramas": perfil_data.get("orden_ramas", "insertion"),
         }
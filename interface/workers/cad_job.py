@@ -0,0 +1,186 @@
+import queue
+from typing import Callable, Hashable, Optional
+
+from PySide6.QtCore import QObject, Signal
+from utilities.cad_session import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_NORMAL,
+    Job,
+    cad_session,
+)
+from utilities.cancellation import CancelToken
+from utilities.instrumentation import finish_run, start_run, write_run_summary
+
+
+class CadJobWorker(QObject):
+    """
+    Base de los trabajos de la interfaz. En lugar de un QThread por clic, el
+    cuerpo (_ejecutar) se encola en la sesión CAD, que los ejecuta de a uno
+    por prioridad. Las subclases declaran sus señales (log_signal y
+    finished_signal como mínimo); Qt las entrega en el hilo de la interfaz.
+
+    _ejecutar debe pasar 'self.token' a los bucles largos: cancel() lo marca y
+    el trabajo corta con OperationCancelled en el próximo punto seguro.
+
+    Cada ejecución abre una corrida de utilities.instrumentation: al terminar,
+    el desglose por etapa va al log y el resumen a logs/runs_AAAA-MM.jsonl.
+    """
+
+    priority = PRIORITY_NORMAL
+
+    # Trabajos encolados: la sesión solo guarda el método ligado, y el objeto
+    # debe seguir vivo hasta que su finished_signal llegue a la interfaz
+    _active = set()
+
+    def __init__(self):
+        super().__init__()
+        self.job: Optional[Job] = None
+        self.token = CancelToken()
+
+    def job_name(self) -> str:
+        return type(self).__name__
+
+    def job_key(self) -> Optional[Hashable]:
+        """Trabajos con la misma clave pendientes a la vez se fusionan (None = nunca)."""
+        return None
+
+    def failure_result(self):
+        """Lo que emite finished_signal si el trabajo falla o no se pudo encolar."""
+        raise NotImplementedError
+
+    def start(self) -> bool:
+        """
+        Encola el trabajo. Devuelve True si este worker entregará el resultado.
+
+        Devuelve False si la cola de la sesión está llena (finished_signal ya se
+        emitió con failure_result) o si ya había un trabajo pendiente con la
+        misma job_key: en ese caso el resultado llega por las señales del
+        worker pendiente y el controlador debe conservar ese, no este.
+        """
+        try:
+            self.job = cad_session.schedule(
+                self.job_name(),
+                self._ejecutar_medido,
+                priority=self.priority,
+                key=self.job_key(),
+                token=self.token,
+            )
+        except queue.Full as e:
+            self.log_signal.emit(f"Aviso: {e}")
+            self.finished_signal.emit(self.failure_result())
+            return False
+
+        if self.job.fn != self._ejecutar_medido:
+            # Se reutiliza el pendiente: su finished_signal llega a los mismos slots
+            self.log_signal.emit(
+                f"Ya hay un trabajo '{self.job.name}' pendiente; se reutiliza."
+            )
+            self.job = None
+            return False
+
+        CadJobWorker._active.add(self)
+        # Conectado después de los slots del controlador: se suelta tras ellos
+        self.finished_signal.connect(self._release)
+        return True
+
+    def _release(self, _result=None) -> None:
+        CadJobWorker._active.discard(self)
+
+    def cancel(self) -> None:
+        """Descarta el trabajo si aún no empezó; si está en curso, lo detiene."""
+        if self.job is not None:
+            was_pending = self.job.future.cancel()
+            self.job.token.cancel()
+            if was_pending:
+                # _ejecutar no llegará a correr: se avisa a la interfaz desde aquí
+                self.finished_signal.emit(self.failure_result())
+        else:
+            self.token.cancel()
+
+    def _ejecutar_medido(self):
+        start_run(self.job_name())
+        try:
+            self._ejecutar()
+        finally:
+            report_run(self, finish_run(), self.job.wait_time if self.job else None)
+
+    def _ejecutar(self):
+        raise NotImplementedError
+
+
+def report_run(worker: QObject, profile, wait_time=None) -> None:
+    """Publica el desglose de una corrida con etapas y guarda su resumen."""
+    if profile is None or not profile.stages:
+        return
+    if wait_time is not None:
+        profile.extra["espera_cola"] = round(wait_time, 4)
+    for line in profile.format_lines():
+        worker.log_signal.emit(line)
+    write_run_summary(profile)
+
+
+class SessionCall(QObject):
+    """
+    Consulta corta a la sesión CAD (conectar, nombre del documento, pedir un
+    punto) sin bloquear la interfaz. fn se encola con prioridad interactiva:
+    no interrumpe un lote en curso, pero la interfaz sigue respondiendo y el
+    resultado llega a on_done en el hilo de la interfaz. Si fn falla o no se
+    pudo encolar, on_error recibe el mensaje.
+
+    Uso:
+        SessionCall("conectar", conectar, self.on_conectado).start()
+    """
+
+    # Objetos en vuelo: la interfaz no guarda referencia y Qt no debe perderlos
+    _in_flight = set()
+
+    done_signal = Signal(object)
+    error_signal = Signal(str)
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        on_done: Callable,
+        on_error: Optional[Callable] = None,
+    ):
+        super().__init__()
+        self.name = name
+        self.fn = fn
+        self._on_done = on_done
+        self._on_error = on_error
+        # Emitidas desde el hilo de la sesión: Qt las encola al hilo de este objeto
+        self.done_signal.connect(self._deliver_done)
+        self.error_signal.connect(self._deliver_error)
+
+    def start(self) -> bool:
+        try:
+            job = cad_session.schedule(
+                self.name, self.fn, priority=PRIORITY_INTERACTIVE
+            )
+        except queue.Full as e:
+            if self._on_error is not None:
+                self._on_error(str(e))
+            return False
+        self._in_flight.add(self)
+        job.future.add_done_callback(self._resolve)
+        return True
+
+    def _resolve(self, future) -> None:
+        if future.cancelled():
+            self.error_signal.emit("operación cancelada")
+            return
+        error = future.exception()
+        if error is not None:
+            self.error_signal.emit(str(error))
+        else:
+            self.done_signal.emit(future.result())
+
+    def _deliver_done(self, result) -> None:
+        self._in_flight.discard(self)
+        self._on_done(result)
+
+    def _deliver_error(self, message: str) -> None:
+        self._in_flight.discard(self)
+        if self._on_error is not None:
+            self._on_error(message)
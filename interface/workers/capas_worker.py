@@ -1,25 +1,44 @@
-import pythoncom
-from PySide6.QtCore import QThread, Signal
-from utilities.cad_manager import cad
-from utilities import layers
+from PySide6.QtCore import Signal
+from utilities import layers, snapshot
+from utilities.cad_session import PRIORITY_INTERACTIVE, cad_session
+from interface.workers.cad_job import CadJobWorker
+from utilities.snapshot_cache import cached_snapshot
 
 
-class CapasWorker(QThread):
+class CapasWorker(CadJobWorker):
     log_signal = Signal(str)
     finished_signal = Signal(dict)
 
+    priority = PRIORITY_INTERACTIVE
+
     def __init__(self, action: str, params: dict = None):
         super().__init__()
         self.action = action
         self.params = params or {}
 
-    def run(self):
-        pythoncom.CoInitialize()
-        cad.connect()
+    def job_name(self) -> str:
+        return f"capas: {self.action}"
+
+    def job_key(self):
+        # Listar no depende de parámetros: varios clics pendientes son uno solo
+        return "capas:listar" if self.action == "listar" else None
+
+    def failure_result(self):
+        return {"action": "error"}
+
+    def _ejecutar(self):
         try:
+            cad_session.ensure_connected()
             if self.action == "listar":
                 self.log_signal.emit("Escaneando el estado de uso de las capas...")
-                data = layers.get_layers_status()
+                snap, desde_cache = cached_snapshot(
+                    kinds=(snapshot.KIND_LAYERS,), cancel_token=self.token
+                )
+                if desde_cache:
+                    self.log_signal.emit(
+                        "Caché de extracción: HIT (dibujo sin cambios)."
+                    )
+                data = layers.get_layers_status(snapshot=snap)
                 self.finished_signal.emit({"action": "listar", "data": data})
 
             elif self.action == "crear":
@@ -42,7 +61,4 @@ class CapasWorker(QThread):
 
         except Exception as e:
             self.log_signal.emit(f"Error crítico en CapasWorker ({self.action}): {e}")
-            self.finished_signal.emit({"action": "error"})
-
-        finally:
-            pythoncom.CoUninitialize()
+            self.finished_signal.emit(self.failure_result())
@@ -0,0 +1,63 @@
+import threading
+
+from PySide6.QtCore import QObject, Signal
+from utilities.cancellation import CancelToken, OperationCancelled
+from utilities.exporters import export_table
+from utilities.instrumentation import finish_run, span, start_run
+from utilities.table_data import ColumnarTable
+from interface.workers.cad_job import report_run
+
+
+class ExportWorker(QObject):
+    """
+    Exporta una tabla en un hilo propio. No usa la sesión CAD: escribir un
+    archivo no toca AutoCAD y no debe retrasar los trabajos encolados allí.
+    Misma interfaz que CadJobWorker (start/cancel y señales).
+    """
+
+    progress_signal = Signal(int)
+    log_signal = Signal(str)
+    finished_signal = Signal(dict)
+
+    def __init__(self, table: ColumnarTable, path: str):
+        super().__init__()
+        self.table = table
+        self.path = path
+        self.token = CancelToken()
+        self._thread = None
+
+    def start(self) -> bool:
+        self._thread = threading.Thread(
+            target=self._ejecutar, name="exportar", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def _ejecutar(self):
+        start_run("exportar")
+        try:
+            self._exportar()
+        finally:
+            report_run(self, finish_run())
+
+    def _exportar(self):
+        try:
+            with span("export_table", items=len(self.table)):
+                filas = export_table(
+                    self.table,
+                    self.path,
+                    progress_callback=self.progress_signal.emit,
+                    cancel_token=self.token,
+                )
+            self.finished_signal.emit(
+                {"success": True, "path": self.path, "filas": filas}
+            )
+        except OperationCancelled:
+            self.log_signal.emit("Exportación cancelada; se descartó el archivo.")
+            self.finished_signal.emit({"success": False, "path": self.path})
+        except Exception as e:
+            self.log_signal.emit(f"Error al exportar: {e}")
+            self.finished_signal.emit({"success": False, "path": self.path})
@@ -1,43 +1,88 @@
-import pythoncom
-from PySide6.QtCore import QThread, Signal
-from utilities.cad_manager import cad
-from utilities import entities
+from PySide6.QtCore import Signal
+from utilities import entities, snapshot
+from utilities.cad_session import cad_session
+from utilities.snapshot_cache import cached_snapshot
+from utilities.selection import EntityFilter, SelectionQuery
+from utilities.cancellation import OperationCancelled
+from utilities.instrumentation import span
+from utilities.table_data import ColumnarTable
+from interface.workers.cad_job import CadJobWorker
 
 
-class ExtractorWorker(QThread):
+class ExtractorWorker(CadJobWorker):
     progress_signal = Signal(int)
     log_signal = Signal(str)
-    finished_signal = Signal(list)
+    # ColumnarTable: las filas se pasan a columnas aquí y no en la interfaz
+    finished_signal = Signal(object)
 
     def __init__(self, entity_type, layer_arg):
         super().__init__()
         self.entity_type = entity_type
         self.layer_arg = layer_arg
 
-    def run(self):
-        pythoncom.CoInitialize()
-        cad.connect()
+    def job_name(self) -> str:
+        return f"extraer {self.entity_type}"
+
+    def job_key(self):
+        return ("extractor", self.entity_type, self.layer_arg)
+
+    def failure_result(self):
+        return ColumnarTable.from_rows([])
+
+    def _ejecutar(self):
         try:
+            cad_session.ensure_connected()
+
             # Creamos una función anidada (callback) para despachar la señal de la GUI
             def emit_progress(pct):
                 self.progress_signal.emit(pct)
 
             if self.entity_type == "bloques":
-                data = entities.extract_blocks(
-                    layer_name=self.layer_arg, progress_callback=emit_progress
+                snap = self._leer_dibujo(
+                    snapshot.KIND_BLOCKS, snapshot.BLOCK_TYPES, emit_progress
                 )
+                data = entities.extract_blocks(layer_name=self.layer_arg, snapshot=snap)
             elif self.entity_type == "textos":
+                snap = self._leer_dibujo(
+                    snapshot.KIND_TEXTS, snapshot.TEXT_TYPES, emit_progress
+                )
                 data = entities.extract_texts(
-                    layer_name=self.layer_arg,
-                    text_type="all",
-                    progress_callback=emit_progress,
+                    layer_name=self.layer_arg, text_type="all", snapshot=snap
                 )
             else:
                 data = []
 
-            self.finished_signal.emit(data)
+            with span("tabla_columnar", items=len(data)):
+                tabla = ColumnarTable.from_rows(data)
+            del data  # La lista de diccionarios se libera antes de emitir
+            self.finished_signal.emit(tabla)
+        except OperationCancelled:
+            self.log_signal.emit("Extracción cancelada.")
+            self.finished_signal.emit(self.failure_result())
         except Exception as e:
             self.log_signal.emit(f"Error crítico en hilo de extracción: {e}")
-            self.finished_signal.emit([])
-        finally:
-            pythoncom.CoUninitialize()
+            self.finished_signal.emit(self.failure_result())
+
+    def _leer_dibujo(self, kind, entity_types, emit_progress):
+        """
+        Obtiene la instantánea desde la caché en disco o leyendo el dibujo.
+        Con una capa elegida, AutoCAD filtra vía SelectionSet y solo se leen esas entidades.
+        """
+        query = None
+        if self.layer_arg:
+            query = SelectionQuery(
+                [EntityFilter(entity_types, layers=[self.layer_arg])]
+            )
+
+        with span("lectura_dibujo"):
+            snap, desde_cache = cached_snapshot(
+                kinds=(kind,),
+                progress_callback=emit_progress,
+                query=query,
+                cancel_token=self.token,
+            )
+        if desde_cache:
+            self.log_signal.emit("Caché de extracción: HIT (dibujo sin cambios).")
+        else:
+            self.log_signal.emit("Caché de extracción: MISS (dibujo leído por COM).")
+        return snap
@@ -1,32 +1,79 @@
-import pythoncom
-import time
-from PySide6.QtCore import QThread, Signal
-from utilities.cad_manager import cad
-from utilities import geometry, entities, drawing, layers
+import os
+from PySide6.QtCore import Signal
+from utilities.cad_session import PRIORITY_BATCH, cad_session
+from utilities import geometry, entities, drawing, layers, snapshot, graph_csr
 from utilities.graph import NetworkGraph
+from utilities.numbering import assign_poles_to_path
 from utilities.geometry import calculate_distance
+from utilities.snapshot_cache import cached_snapshot
+from utilities.selection import EntityFilter, SelectionQuery
+from utilities.entity_reader import BlockFilter
 from utilities.config import SETTINGS
+from utilities.cad_manager import cad
+from utilities.cancellation import OperationCancelled
+from utilities.instrumentation import span
+from utilities.insertion_journal import (
+    SYNC_EVERY,
+    InsertionJournal,
+    committed_numbers,
+)
+from utilities.exporters import ReportWriter
+from utilities.table_data import discover_columns
+from interface.workers.cad_job import CadJobWorker
+
+# Handles revisados al buscar bloques insertados que no llegaron a la bitácora:
+# hasta SYNC_EVERY confirmaciones sin fsync, con sus atributos y SEQEND
+_MAX_HANDLES_HUERFANOS = 8 * SYNC_EVERY
+
+COLUMNA_NUMERO = "Número Asignado"
 
 
-class NumeracionWorker(QThread):
+class NumeracionWorker(CadJobWorker):
     """
-    Hilo de trabajo secundario para ejecutar la numeración sin bloquear la UI.
+    Trabajo de la sesión CAD que ejecuta la numeración sin bloquear la UI.
     """
 
     progress_signal = Signal(int)
     log_signal = Signal(str)
     finished_signal = Signal(dict)
 
+    priority = PRIORITY_BATCH
+
     def __init__(self, config_ui):
         super().__init__()
         self.cfg = config_ui
-        self.reporte_generado = []
-
-    def run(self):
-        pythoncom.CoInitialize()
-        time.sleep(0.5)
-        cad.connect()
+        # El reporte se escribe en disco a medida que se insertan los bloques
+        self.reporte = None
+
+    def job_name(self) -> str:
+        return f"numeración ({self.cfg.get('perfil_id')})"
+
+    def job_key(self):
+        # Una numeración encolada dos veces insertaría los números dos veces
+        return "numeracion"
+
+    def failure_result(self):
+        return {"success": False, **self._resumen_reporte()}
+
+    def _resumen_reporte(self) -> dict:
+        """Cierra el reporte (si lo hay) y devuelve su ruta y filas escritas."""
+        if self.reporte is None:
+            return {"reporte": None, "filas_reporte": 0}
+        self.reporte.close()
+        return {
+            "reporte": self.reporte.path,
+            "filas_reporte": self.reporte.rows_written,
+        }
+
+    def _ejecutar(self):
         try:
+            cad_session.ensure_connected()
+
+            if self.cfg.get("reanudar"):
+                exitos = self._reanudar()
+                self._finalizar(exitos)
+                return
+
             estrategia = self.cfg.get("estrategia", "DFS")
 
             capa_destino = self.cfg.get("capa_destino")
@@ -36,9 +83,30 @@ class NumeracionWorker(QThread):
                 f"Preparando capa de destino '{capa_destino}' con color {color_destino}..."
             )
 
-            layers.ensure_layer(capa_destino, color=color_destino)
+            with span("preparar_capa"):
+                layers.ensure_layer(capa_destino, color=color_destino)
 
             capas_asoc = self.cfg.get("capas_asociacion", [])
+
+            # Lectura única del dibujo: todos los extractores filtran sobre esta tabla
+            tipos_requeridos = {snapshot.KIND_BLOCKS}
+            if estrategia == "DFS":
+                tipos_requeridos |= {snapshot.KIND_LINES, snapshot.KIND_POLYLINES}
+            if capas_asoc:
+                tipos_requeridos.add(snapshot.KIND_TEXTS)
+
+            self.log_signal.emit("Leyendo el dibujo en una sola pasada...")
+            with span("lectura_dibujo"):
+                snap, desde_cache = cached_snapshot(
+                    kinds=tipos_requeridos,
+                    query=self._consulta_seleccion(estrategia),
+                    cancel_token=self.token,
+                )
+            self.log_signal.emit(
+                f"Caché de extracción: {'HIT' if desde_cache else 'MISS'}. "
+                f"Instantánea lista: {snap.summary()}."
+            )
+
             datos_asociar = []
             if capas_asoc:
                 self.log_signal.emit(
@@ -46,8 +114,12 @@ class NumeracionWorker(QThread):
                 )
 
                 for capa in capas_asoc:
-                    datos_asociar.extend(entities.extract_texts(layer_name=capa))
-                    datos_asociar.extend(entities.extract_blocks(layer_name=capa))
+                    datos_asociar.extend(
+                        entities.extract_texts(layer_name=capa, snapshot=snap)
+                    )
+                    datos_asociar.extend(
+                        entities.extract_blocks(layer_name=capa, snapshot=snap)
+                    )
 
                 self.log_signal.emit(
                     f"Se encontraron {len(datos_asociar)} entidades para asociación."
@@ -56,26 +128,12 @@ class NumeracionWorker(QThread):
             # TOPOLOGÍA (DFS)
             if estrategia == "DFS":
                 self.log_signal.emit("Modo DFS Iniciado. Extrayendo red y postes...")
-                segmentos = entities.extract_network_lines(self.cfg["dict_red"])
-                todos_los_bloques = entities.extract_blocks()
-                nombres_esperados = [
-                    k.upper() for k in self.cfg.get("dict_postes", {}).keys()
-                ]
-                filtro_capa = self.cfg.get("filtro_capa")
-
-                postes_validos = []
-                for b in todos_los_bloques:
-                    # nombre de bloque coincide?
-                    nombre_match = b["Nombre"].upper() in nombres_esperados
-
-                    # perfil exige una capa específica, coincide?
-                    capa_match = True
-                    if filtro_capa:
-                        capa_match = b["Capa"].upper() == filtro_capa.upper()
-
-                    # agregamos solo si pasa ambas pruebas
-                    if nombre_match and capa_match:
-                        postes_validos.append(b)
+                segmentos = entities.extract_network_lines(
+                    self.cfg["dict_red"], snapshot=snap
+                )
+                postes_validos = entities.extract_blocks(
+                    snapshot=snap, block_filter=self._filtro_postes()
+                )
 
                 if not segmentos or not postes_validos:
                     raise ValueError("Faltan datos de red o postes para ejecutar DFS.")
@@ -87,12 +145,29 @@ class NumeracionWorker(QThread):
                 segmentos = geometry.split_segments_with_poles(
                     segmentos, postes_validos, tolerancia=1.5
                 )
+                self.token.check()
 
                 self.progress_signal.emit(30)
 
-                grafo = NetworkGraph(tolerance=self.cfg["tolerancia_grafo"])
-                for p1, p2 in segmentos:
-                    grafo.add_line(p1, p2)
+                with span("construir_grafo", items=len(segmentos)):
+                    grafo = NetworkGraph(tolerance=self.cfg["tolerancia_grafo"])
+                    for p1, p2 in segmentos:
+                        grafo.add_line(p1, p2)
+                if grafo.merged_endpoints:
+                    self.log_signal.emit(
+                        f"Se unieron {grafo.merged_endpoints} extremos de vanos "
+                        "dentro de la tolerancia del grafo."
+                    )
+                if graph_csr.should_freeze(len(segmentos)):
+                    # Copia compacta en arreglos; se libera el grafo de diccionarios
+                    with span("congelar_grafo", items=len(grafo.nodes)):
+                        grafo = grafo.freeze()
+                    islas, _ = grafo.connected_components()
+                    if islas > 1:
+                        self.log_signal.emit(
+                            f"La red tiene {islas} islas; solo se recorre la "
+                            "conectada al punto de inicio."
+                        )
 
                 nodo_raiz, dist = grafo.find_nearest_node(
                     self.cfg["punto_inicio"], max_radius=self.cfg["radio_snap"]
@@ -100,7 +175,10 @@ class NumeracionWorker(QThread):
                 if not nodo_raiz:
                     raise ValueError("Punto de inicio muy alejado de la red.")
 
-                ruta_logica = grafo.dfs_traversal(nodo_raiz)
+                ruta_logica = grafo.dfs_traversal(
+                    nodo_raiz, order=self.cfg.get("orden_ramas")
+                )
+                self.token.check()
                 self.progress_signal.emit(60)
 
                 if datos_asociar:
@@ -109,6 +187,7 @@ class NumeracionWorker(QThread):
                         base_blocks=postes_validos,
                         data_entities=datos_asociar,
                         radius=self.cfg["radio_asociacion"],
+                        global_match=self.cfg.get("asociacion_global", False),
                     )
 
                 exitos = self._ejecutar_insercion_dfs(
@@ -120,25 +199,9 @@ class NumeracionWorker(QThread):
                 self.log_signal.emit(
                     "Modo Simple Iniciado. Buscando bloques específicos..."
                 )
-                todos_los_bloques = entities.extract_blocks()
-                nombres_esperados = [
-                    k.upper() for k in self.cfg.get("dict_postes", {}).keys()
-                ]
-                filtro_capa = self.cfg.get("filtro_capa")
-
-                postes_validos = []
-                for b in todos_los_bloques:
-                    # nombre del bloque coincide?
-                    nombre_match = b["Nombre"].upper() in nombres_esperados
-
-                    # perfil exige una capa específica, coincide?
-                    capa_match = True
-                    if filtro_capa:
-                        capa_match = b["Capa"].upper() == filtro_capa.upper()
-
-                    # agregamos si pasa ambas pruebas
-                    if nombre_match and capa_match:
-                        postes_validos.append(b)
+                postes_validos = entities.extract_blocks(
+                    snapshot=snap, block_filter=self._filtro_postes()
+                )
 
                 if not postes_validos:
                     raise ValueError(
@@ -160,120 +223,270 @@ class NumeracionWorker(QThread):
                         base_blocks=postes_validos,
                         data_entities=datos_asociar,
                         radius=self.cfg["radio_asociacion"],
+                        global_match=self.cfg.get("asociacion_global", False),
                     )
 
                 exitos = self._ejecutar_insercion_secuencial(
                     postes_ordenados, capa_destino
                 )
 
-            self.log_signal.emit(f"Inserción completa: {exitos} postes numerados.")
-            self.progress_signal.emit(100)
-            self.finished_signal.emit(
-                {
-                    "success": True,
-                    "reporte": self.reporte_generado,
-                }
+            self._finalizar(exitos)
+
+        except OperationCancelled:
+            resumen = self._resumen_reporte()
+            self.log_signal.emit(
+                f"Numeración cancelada: {resumen['filas_reporte']} postes numerados. "
+                "Puede reanudarse desde donde quedó."
             )
+            self.finished_signal.emit({"success": False, "cancelado": True, **resumen})
 
         except Exception as e:
             self.log_signal.emit(f"ERROR: {e}")
-            self.finished_signal.emit(
-                {
-                    "success": False,
-                    "reporte": self.reporte_generado,
-                }
-            )
+            self.finished_signal.emit(self.failure_result())
+
+    def _finalizar(self, exitos: int) -> None:
+        self.log_signal.emit(f"Inserción completa: {exitos} postes numerados.")
+        self.progress_signal.emit(100)
+        self.finished_signal.emit({"success": True, **self._resumen_reporte()})
+
+    def _filtro_postes(self) -> BlockFilter:
+        """Postes del perfil: nombre en 'dict_postes' y, si se exige, capa 'filtro_capa'."""
+        filtro_capa = self.cfg.get("filtro_capa")
+        return BlockFilter(
+            names=self.cfg.get("dict_postes", {}).keys(),
+            layers=[filtro_capa] if filtro_capa else None,
+        )
 
-        finally:
-            pythoncom.CoUninitialize()
+    def _consulta_seleccion(self, estrategia: str) -> SelectionQuery:
+        """
+        Filtro DXF con todo lo que usa el perfil (postes, datos de asociación y
+        red), para que AutoCAD entregue solo esas entidades.
+        """
+        filtro_capa = self.cfg.get("filtro_capa")
+        filtros = [
+            EntityFilter(
+                snapshot.BLOCK_TYPES,
+                layers=[filtro_capa] if filtro_capa else None,
+                block_names=self.cfg.get("dict_postes", {}).keys(),
+            )
+        ]
+        capas_asoc = self.cfg.get("capas_asociacion", [])
+        if capas_asoc:
+            filtros.append(
+                EntityFilter(
+                    snapshot.BLOCK_TYPES + snapshot.TEXT_TYPES, layers=capas_asoc
+                )
+            )
+        if estrategia == "DFS":
+            filtros.append(
+                EntityFilter(
+                    snapshot.LINE_TYPES + snapshot.POLYLINE_TYPES,
+                    layers=self.cfg["dict_red"].values(),
+                )
+            )
+        return SelectionQuery(filtros)
 
     # MÉTODOS AUXILIARES DE INSERCIÓN
 
     def _ejecutar_insercion_dfs(self, ruta_logica, postes_validos, capa_destino) -> int:
-        exitos = 0
-        numero_actual = 1
-        radio_asociacion = (
-            1.5  # Margen de captura desde el vértice de la línea al bloque
+        # Margen de captura desde el vértice de la línea al bloque
+        postes_en_ruta, postes_rezagados = assign_poles_to_path(
+            ruta_logica,
+            postes_validos,
+            radius=1.5,
+            reference_point=self.cfg["punto_inicio"],
         )
 
-        total_nodos = len(ruta_logica)
-
-        # ETAPA 1: RECORRIDO TOPOLÓGICO (NODOS MÚLTIPLES)
-        for idx, pt_grafo in enumerate(ruta_logica):
-            postes_en_este_nodo = []
-
-            # En lugar de 'break', recopilamos TODOS los postes en este radio
-            for poste in postes_validos:
-                dist_poste = calculate_distance(pt_grafo, (poste["X"], poste["Y"]))
-                if dist_poste <= radio_asociacion:
-                    postes_en_este_nodo.append((dist_poste, poste))
-
-            if postes_en_este_nodo:
-                # Los ordenamos por cercanía exacta al vértice de la red
-                postes_en_este_nodo.sort(key=lambda item: item[0])
-
-                for _, poste_encontrado in postes_en_este_nodo:
-                    if self._insertar_bloque(
-                        poste_encontrado, numero_actual, capa_destino
-                    ):
-                        exitos += 1
-                        numero_actual += 1
-                    # Retiramos para no contarlo dos veces
-                    postes_validos.remove(poste_encontrado)
-
-            # Progreso del 60% al 90%
-            self.progress_signal.emit(60 + int((idx / total_nodos) * 30))
-
         # ETAPA 2: BARRIDO DE POSTES REZAGADOS
-        # Si la lista no quedó vacía, es porque hay postes fuera de los ramales principales
-        if len(postes_validos) > 0:
+        # Si quedaron postes, es porque están fuera de los ramales principales
+        if postes_rezagados:
             self.log_signal.emit(
-                f"Barrido final: Numerando {len(postes_validos)} postes rezagados fuera de la red..."
-            )
-
-            # Tomamos el último punto del grafo como referencia, o el punto de inicio si algo falló
-            punto_ref = ruta_logica[-1] if ruta_logica else self.cfg["punto_inicio"]
-
-            # Ordenamos los rezagados por proximidad al final de la red
-            postes_rezagados = sorted(
-                postes_validos,
-                key=lambda p: calculate_distance((p["X"], p["Y"]), punto_ref),
+                f"Barrido final: Numerando {len(postes_rezagados)} postes rezagados fuera de la red..."
             )
 
-            for poste in postes_rezagados:
-                if self._insertar_bloque(poste, numero_actual, capa_destino):
-                    exitos += 1
-                    numero_actual += 1
-
-        return exitos
+        # Ambas etapas se numeran en un único lote: primero la ruta, luego los rezagados
+        # Progreso del 60% al 90%
+        return self._insertar_bloques(
+            postes_en_ruta + postes_rezagados, capa_destino, 60, 90
+        )
 
     def _ejecutar_insercion_secuencial(self, postes_ordenados, capa_destino) -> int:
-        exitos = 0
-        numero_actual = 1
-        total_postes = len(postes_ordenados)
-
-        for idx, poste in enumerate(postes_ordenados):
-            if self._insertar_bloque(poste, numero_actual, capa_destino):
-                exitos += 1
-                numero_actual += 1
-            self.progress_signal.emit(50 + int((idx / total_postes) * 50))
+        return self._insertar_bloques(postes_ordenados, capa_destino, 50, 100)
+
+    def _bitacora(self) -> InsertionJournal:
+        """Bitácora de este dibujo y perfil (ver utilities.insertion_journal)."""
+        documento = cad.doc.FullName or cad.doc.Name
+        return InsertionJournal.for_run(documento, self.cfg.get("perfil_id"))
+
+    def _abrir_reporte(self, bitacora: InsertionJournal, plan: list) -> None:
+        """
+        Reporte CSV junto a la bitácora. Las columnas salen de una pasada por
+        el plan, así cada fila se escribe en cuanto se confirma su bloque.
+        """
+        ruta = os.path.splitext(bitacora.path)[0] + "_reporte.csv"
+        self.reporte = ReportWriter(ruta, discover_columns(plan) + [COLUMNA_NUMERO])
+
+    def _insertar_bloques(
+        self, postes: list, capa_destino: str, progreso_desde: int, progreso_hasta: int
+    ) -> int:
+        """
+        Inserta la numeración de todos los postes en un solo lote y registra en el
+        reporte los que se insertaron, con el número que recibió cada uno.
+
+        El orden de numeración se guarda antes de insertar y cada inserción se
+        confirma en la bitácora; si la corrida termina sin errores se descarta.
+        """
+        bitacora = self._bitacora()
+        bitacora.start(
+            postes,
+            {
+                "capa_destino": capa_destino,
+                "desplazamiento": [SETTINGS.TEXT_OFFSET_X, SETTINGS.TEXT_OFFSET_Y],
+                "handseed": str(cad.doc.GetVariable("HANDSEED")),
+            },
+        )
+        self._abrir_reporte(bitacora, postes)
+        exitos = self._insertar_pendientes(
+            bitacora, postes, {}, capa_destino, progreso_desde, progreso_hasta
+        )
+        bitacora.discard()
         return exitos
 
-    def _insertar_bloque(
-        self, poste_datos: dict, numero: int, capa_destino: str
-    ) -> bool:
-        insercion_ok = drawing.insert_block_with_attributes(
-            x=poste_datos["X"] + SETTINGS.TEXT_OFFSET_X,
-            y=poste_datos["Y"] + SETTINGS.TEXT_OFFSET_Y,
-            block_name=SETTINGS.BLOQUE_A_INSERTAR,
-            layer=capa_destino,
-            scale=SETTINGS.ESCALA_BLOQUE,
-            attributes={SETTINGS.ATRIBUTO_ETIQUETA: str(numero)},
+    def _insertar_pendientes(
+        self,
+        bitacora: InsertionJournal,
+        plan: list,
+        confirmadas: dict,
+        capa_destino: str,
+        progreso_desde: int,
+        progreso_hasta: int,
+        desplazamiento=None,
+    ) -> int:
+        """
+        Inserta los postes del plan que no figuran en 'confirmadas'
+        ({indice: número}), numerando a continuación del último confirmado.
+        """
+        dx, dy = desplazamiento or (SETTINGS.TEXT_OFFSET_X, SETTINGS.TEXT_OFFSET_Y)
+        pendientes = [i for i in range(len(plan)) if i not in confirmadas]
+        colocaciones = [
+            {"x": plan[i]["X"] + dx, "y": plan[i]["Y"] + dy} for i in pendientes
+        ]
+
+        def emit_progress(pct):
+            rango = progreso_hasta - progreso_desde
+            self.progress_signal.emit(progreso_desde + int(pct * rango / 100))
+
+        # Los fallos no consumen número: el número es el conteo de éxitos acumulado
+        def confirmar(j, bloque, numero):
+            i = pendientes[j]
+            bitacora.record(i, plan[i].get("Handle"), numero, bloque.Handle)
+            confirmadas[i] = numero
+            self._registrar_en_reporte(plan[i], numero)
+
+        try:
+            drawing.insert_blocks_bulk(
+                colocaciones,
+                block_name=SETTINGS.BLOQUE_A_INSERTAR,
+                layer=capa_destino,
+                scale=SETTINGS.ESCALA_BLOQUE,
+                number_tag=SETTINGS.ATRIBUTO_ETIQUETA,
+                start_number=len(confirmadas) + 1,
+                progress_callback=emit_progress,
+                cancel_token=self.token,
+                on_inserted=confirmar,
+            )
+        finally:
+            # También al cancelar: lo confirmado queda en disco antes de salir
+            bitacora.close()
+        return len(confirmadas)
+
+    def _reanudar(self) -> int:
+        """
+        Continúa una numeración cancelada o interrumpida a partir de su bitácora,
+        sin volver a leer el dibujo: los postes ya confirmados se saltan y los
+        demás se numeran a continuación.
+        """
+        bitacora = self._bitacora()
+        estado = bitacora.load()
+        if estado is None:
+            raise ValueError("No hay una numeración interrumpida para reanudar.")
+
+        plan, meta = estado["plan"], estado["meta"]
+        confirmadas = committed_numbers(estado)
+        self._adoptar_huerfanos(bitacora, estado, confirmadas)
+
+        # El reporte incluye lo numerado en la corrida anterior
+        self._abrir_reporte(bitacora, plan)
+        for i in sorted(confirmadas, key=confirmadas.get):
+            self._registrar_en_reporte(plan[i], confirmadas[i])
+
+        self.log_signal.emit(
+            f"Reanudando numeración: {len(confirmadas)} de {len(plan)} postes ya "
+            "numerados según la bitácora."
+        )
+        layers.ensure_layer(meta["capa_destino"], color=self.cfg.get("color_destino"))
+        self.progress_signal.emit(10)
+
+        exitos = self._insertar_pendientes(
+            bitacora,
+            plan,
+            confirmadas,
+            meta["capa_destino"],
+            10,
+            100,
+            meta.get("desplazamiento"),
         )
+        bitacora.discard()
+        return exitos
 
-        if insercion_ok:
-            fila_reporte = poste_datos.copy()
-            fila_reporte["Número Asignado"] = numero
-            self.reporte_generado.append(fila_reporte)
+    def _adoptar_huerfanos(
+        self, bitacora: InsertionJournal, estado: dict, confirmadas: dict
+    ) -> None:
+        """
+        Un corte entre la inserción y su escritura en la bitácora (o antes del
+        fsync) deja bloques numerados que la bitácora no conoce. Como los
+        handles crecen, se revisan los creados después del último confirmado:
+        cada bloque de numeración que esté en la posición de un poste pendiente
+        del plan (no solo del primero: un fallo anterior queda sin confirmar) se
+        confirma en lugar de insertarlo de nuevo.
+        """
+        plan, meta = estado["plan"], estado["meta"]
+        dx, dy = meta.get("desplazamiento") or (0.0, 0.0)
+        pendientes = {}  # posición esperada -> índices del plan sin confirmar
+        for i in range(len(plan)):
+            if i not in confirmadas:
+                clave = (round(plan[i]["X"] + dx, 6), round(plan[i]["Y"] + dy, 6))
+                pendientes.setdefault(clave, []).append(i)
+        if not pendientes:
+            return
+
+        handles = [int(e["handle"], 16) for e in estado["confirmadas"].values()]
+        desde = max(handles) + 1 if handles else int(meta["handseed"], 16)
+        hasta = int(str(cad.doc.GetVariable("HANDSEED")), 16)
+
+        # Los handles crecen en el orden de inserción, que es el de numeración
+        for valor in range(desde, min(hasta, desde + _MAX_HANDLES_HUERFANOS)):
+            try:
+                obj = cad.late_bind(cad.doc.HandleToObject(f"{valor:X}"))
+                if (
+                    obj.EntityName != "AcDbBlockReference"
+                    or obj.Name.upper() != SETTINGS.BLOQUE_A_INSERTAR.upper()
+                ):
+                    continue
+                punto = obj.InsertionPoint
+            except Exception:
+                continue
+            indices = pendientes.get((round(punto[0], 6), round(punto[1], 6)))
+            if not indices:
+                continue
+            i = indices.pop(0)
+            numero = len(confirmadas) + 1
+            bitacora.record(i, plan[i].get("Handle"), numero, obj.Handle)
+            confirmadas[i] = numero
+            self.log_signal.emit(
+                f"Bloque {obj.Handle} insertado antes del corte: se conserva como N° {numero}."
+            )
+        bitacora.sync()
 
-        return insercion_ok
+    def _registrar_en_reporte(self, poste_datos: dict, numero: int) -> None:
+        self.reporte.write(poste_datos, {COLUMNA_NUMERO: numero})
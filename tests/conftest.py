@@ -0,0 +1,36 @@
+import json
+import os
+
+import pytest
+from utilities.cad_manager import cad, ComBackend
+from utilities.offline_cad import OfflineBackend, document_from_dict
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@pytest.fixture
+def load_fixture():
+    """Lee un dibujo de tests/fixtures (JSON) como diccionario."""
+
+    def _load(name: str) -> dict:
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            return json.load(f)
+
+    return _load
+
+
+@pytest.fixture
+def offline_cad():
+    """
+    Conecta el gestor global `cad` a un documento offline construido desde un
+    diccionario de fixture y restaura el backend COM al terminar.
+    """
+
+    def _connect(data: dict):
+        backend = OfflineBackend(document_from_dict(data))
+        cad.set_backend(backend)
+        cad.connect()
+        return backend.document
+
+    yield _connect
+    cad.set_backend(ComBackend())
@@ -33,3 +33,28 @@ def test_heterogeneous_data_association():
     assert "Data_Attr_CODIGO" in poste
     assert poste["Data_Attr_CODIGO"] == "COD-BLK-456"
     assert "Data_Texto" not in poste
+
+
+def test_global_match_is_order_independent():
+    # La etiqueta está a 2.0 de A pero a 1.0 de B
+    base_blocks = [
+        {"Handle": "A", "X": 0.0, "Y": 0.0},
+        {"Handle": "B", "X": 3.0, "Y": 0.0},
+    ]
+    data_entities = [{"Texto": "COD-1", "X": 2.0, "Y": 0.0}]
+
+    # Modo secuencial: A se evalúa primero y se queda con la etiqueta
+    secuencial = associate_data(
+        [dict(b) for b in base_blocks], data_entities, radius=5.0
+    )
+    assert secuencial[0].get("Data_Texto") == "COD-1"
+    assert "Data_Texto" not in secuencial[1]
+
+    # Modo global: la etiqueta va al poste realmente más cercano
+    for orden in (base_blocks, base_blocks[::-1]):
+        result = associate_data(
+            [dict(b) for b in orden], data_entities, radius=5.0, global_match=True
+        )
+        por_handle = {b["Handle"]: b for b in result}
+        assert por_handle["B"]["Data_Texto"] == "COD-1"
+        assert "Data_Texto" not in por_handle["A"]
@@ -0,0 +1,60 @@
+from benchmarks import synthetic
+from benchmarks.suite import (
+    compare,
+    load_baseline,
+    number_offline,
+    run_suite,
+    save_baseline,
+)
+from utilities.graph import NetworkGraph
+
+
+def test_generators_are_deterministic_and_connected():
+    assert synthetic.radial_feeder(50) == synthetic.radial_feeder(50)
+    malla = synthetic.meshed_grid(6, 6)
+    assert malla == synthetic.meshed_grid(6, 6)
+
+    grafo = NetworkGraph(tolerance=0.1)
+    for p1, p2 in synthetic.radial_feeder(200):
+        grafo.add_line(p1, p2)
+    assert len(grafo.dfs_traversal((0.0, 0.0))) == len(grafo.nodes)
+
+    postes = synthetic.poles_along(malla, 40)
+    etiquetas = synthetic.labels_near(postes, ratio=0.5)
+    assert len(postes) == 40 and 0 < len(etiquetas) < 40
+    assert len({p["Handle"] for p in postes}) == 40
+
+
+def test_offline_numbering_inserts_every_pole():
+    segmentos = synthetic.meshed_grid(5, 5)
+    postes = synthetic.poles_along(segmentos, 30)
+    documento = synthetic.feeder_document(
+        segmentos, postes, synthetic.labels_near(postes)
+    )
+    assert number_offline(documento) == 30
+
+
+def test_compare_flags_only_regressions_above_the_noise_floor():
+    filas = compare(
+        {"a": 0.30, "b": 0.004, "c": 0.10, "d": 1.0},
+        {"a": 0.10, "b": 0.001, "c": 0.09},
+        threshold=1.5,
+        noise_floor=0.005,
+    )
+    por_etapa = {f["etapa"]: f for f in filas}
+    assert por_etapa["a"]["regresion"] and round(por_etapa["a"]["razon"], 1) == 3.0
+    assert not por_etapa["b"]["regresion"]  # 4x, pero por debajo del piso de ruido
+    assert not por_etapa["c"]["regresion"]
+    assert por_etapa["d"]["base"] is None and not por_etapa["d"]["regresion"]
+
+
+def test_suite_round_trips_a_local_baseline(tmp_path):
+    ruta = str(tmp_path / "baseline.json")
+    assert load_baseline(ruta)["escalas"] == {}
+
+    tiempos = run_suite("tiny", repeat=1)
+    assert all(t > 0 for t in tiempos.values())
+    save_baseline("tiny", tiempos, ruta)
+    base = load_baseline(ruta)["escalas"]["tiny"]["tiempos"]
+    assert set(base) == set(tiempos)
+    assert not any(f["regresion"] for f in compare(tiempos, base))
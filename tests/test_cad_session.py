@@ -0,0 +1,120 @@
+import queue
+import threading
+
+import pytest
+
+from utilities.cad_manager import cad
+from utilities.cad_session import PRIORITY_BATCH, PRIORITY_INTERACTIVE, CADSession
+
+
+@pytest.fixture
+def session():
+    s = CADSession()
+    yield s
+    s.stop(timeout=5)
+
+
+def test_jobs_run_in_order_on_one_thread(session):
+    hilos, orden = set(), []
+
+    def trabajo(i):
+        hilos.add(threading.get_ident())
+        orden.append(i)
+        return i * 2
+
+    futuros = [session.submit(trabajo, i) for i in range(20)]
+    assert [f.result(timeout=5) for f in futuros] == [i * 2 for i in range(20)]
+    assert orden == list(range(20))
+    assert len(hilos) == 1 and threading.get_ident() not in hilos
+
+
+def test_errors_are_raised_by_the_future(session):
+    def falla():
+        raise ValueError("sin documento")
+
+    with pytest.raises(ValueError, match="sin documento"):
+        session.call(falla)
+    # La sesión sigue atendiendo después de un error
+    assert session.call(lambda: 1) == 1
+
+
+def test_nested_submit_runs_inline(session):
+    assert session.call(lambda: session.call(lambda: "anidado")) == "anidado"
+
+
+def test_ensure_connected_connects_once(offline_cad, session):
+    offline_cad({"name": "sesion.dwg"})
+    conexiones = []
+    original = cad.connect
+
+    def connect():
+        conexiones.append(1)
+        return original()
+
+    cad.doc = None
+    cad.connect = connect
+    try:
+        assert session.ensure_connected()
+        assert session.ensure_connected()
+    finally:
+        del cad.connect
+    assert len(conexiones) == 1
+    assert session.call(lambda: cad.doc.Name) == "sesion.dwg"
+
+
+def _ocupar(session):
+    """Bloquea el hilo de la sesión hasta que se libere el evento devuelto."""
+    liberar, ocupado = threading.Event(), threading.Event()
+
+    def bloqueo():
+        ocupado.set()
+        liberar.wait(5)
+
+    session.submit(bloqueo)
+    ocupado.wait(5)
+    return liberar
+
+
+def test_priorities_then_fifo(session):
+    liberar = _ocupar(session)
+    orden = []
+    session.schedule("lote", orden.append, "lote", priority=PRIORITY_BATCH)
+    session.schedule("extraer 1", orden.append, "extraer 1")
+    session.schedule("capas", orden.append, "capas", priority=PRIORITY_INTERACTIVE)
+    ultimo = session.schedule("extraer 2", orden.append, "extraer 2")
+    liberar.set()
+    ultimo.future.result(timeout=5)
+    session.call(lambda: None)
+    assert orden == ["capas", "extraer 1", "extraer 2", "lote"]
+
+
+def test_pending_jobs_with_same_key_are_coalesced(session):
+    liberar = _ocupar(session)
+    llamadas = []
+    primero = session.schedule("listar", llamadas.append, 1, key="capas:listar")
+    segundo = session.schedule("listar", llamadas.append, 2, key="capas:listar")
+    assert segundo is primero
+    liberar.set()
+    primero.future.result(timeout=5)
+    assert llamadas == [1]
+
+    # Una vez ejecutado, la misma clave vuelve a encolarse
+    session.schedule("listar", llamadas.append, 3, key="capas:listar").future.result(5)
+    assert llamadas == [1, 3]
+
+
+def test_queue_is_bounded_and_jobs_are_timed():
+    session = CADSession(max_pending=2)
+    try:
+        liberar = _ocupar(session)
+        session.submit(lambda: None)
+        ultimo = session.schedule("último", lambda: None)
+        with pytest.raises(queue.Full):
+            session.submit(lambda: None)
+        liberar.set()
+        ultimo.future.result(timeout=5)
+        assert ultimo.wait_time > 0 and ultimo.run_time is not None
+        session.call(lambda: None)
+        assert any(t["Trabajo"] == "último" for t in session.history)
+    finally:
+        session.stop(timeout=5)
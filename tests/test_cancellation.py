@@ -0,0 +1,108 @@
+import pytest
+
+from utilities import drawing, insertion_journal, snapshot
+from utilities.cancellation import CancelToken, OperationCancelled
+from utilities.insertion_journal import InsertionJournal
+
+
+def _bloques(doc, nombre="UBICACION POSTES UTM"):
+    return [
+        e
+        for e in doc.ModelSpace
+        if e.EntityName == "AcDbBlockReference" and e.Name == nombre
+    ]
+
+
+def test_cancelled_token_stops_snapshot(offline_cad, load_fixture):
+    offline_cad(load_fixture("red_simple.json"))
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(OperationCancelled):
+        snapshot.take_snapshot(cancel_token=token)
+
+
+def test_bulk_insert_stops_between_blocks_and_reports_each_commit(
+    offline_cad, load_fixture
+):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    antes = len(_bloques(doc))
+    token = CancelToken()
+    confirmados = []
+
+    def al_insertar(i, bloque, numero):
+        confirmados.append((i, bloque.Handle, numero))
+        if len(confirmados) == 3:
+            token.cancel()
+
+    colocaciones = [{"x": float(i), "y": 100.0} for i in range(10)]
+    with pytest.raises(OperationCancelled):
+        drawing.insert_blocks_bulk(
+            colocaciones,
+            block_name="UBICACION POSTES UTM",
+            layer="NUMERACION",
+            number_tag="000",
+            start_number=5,
+            cancel_token=token,
+            on_inserted=al_insertar,
+        )
+
+    assert [(i, n) for i, _, n in confirmados] == [(0, 5), (1, 6), (2, 7)]
+    assert len(_bloques(doc)) == antes + 3
+
+
+def test_journal_round_trip_and_resume_state(tmp_path):
+    bitacora = InsertionJournal.for_run(
+        "C:/planos/red.dwg", "EXISTENTES", str(tmp_path)
+    )
+    assert (
+        InsertionJournal.for_run("C:/planos/red.dwg", "PROYECTADOS", str(tmp_path)).path
+        != bitacora.path
+    )
+
+    plan = [{"Handle": "A1", "X": 0.0, "Y": 0.0}, {"Handle": "A2", "X": 5.0, "Y": 0.0}]
+    bitacora.start(plan, {"capa_destino": "NUMERACION"})
+    assert bitacora.pending()
+
+    bitacora.record(0, "A1", 1, "1F0")
+    bitacora.close()
+    # Corte a mitad de escritura: la última línea queda truncada
+    with open(bitacora.path, "a", encoding="utf-8") as f:
+        f.write('{"tipo": "insercion", "indice": 1, "nu')
+
+    estado = bitacora.load()
+    assert estado["plan"] == plan
+    assert estado["meta"] == {"capa_destino": "NUMERACION"}
+    assert list(estado["confirmadas"]) == [0]
+    assert estado["confirmadas"][0]["handle"] == "1F0"
+
+    # Al reanudar, lo nuevo no se pega a la línea truncada
+    bitacora.record(1, "A2", 2, "1F8")
+    assert sorted(bitacora.load()["confirmadas"]) == [0, 1]
+    assert not bitacora.pending()
+
+    bitacora.discard()
+    assert bitacora.load() is None and not bitacora.pending()
+
+
+def test_journal_syncs_in_batches_and_on_close(tmp_path, monkeypatch):
+    sincronizados = []
+    monkeypatch.setattr(insertion_journal.os, "fsync", sincronizados.append)
+    monkeypatch.setattr(insertion_journal, "SYNC_EVERY", 3)
+
+    bitacora = InsertionJournal.for_run(
+        "C:/planos/red.dwg", "EXISTENTES", str(tmp_path)
+    )
+    plan = [{"Handle": f"A{i}", "X": float(i), "Y": 0.0} for i in range(5)]
+    bitacora.start(plan)
+    assert len(sincronizados) == 1  # el plan se fuerza a disco de inmediato
+
+    for i in range(4):
+        bitacora.record(i, plan[i]["Handle"], i + 1, f"{0x200 + i:X}")
+    # Sin fsync por línea, pero cada confirmación ya es legible
+    assert len(sincronizados) == 2
+    assert sorted(bitacora.load()["confirmadas"]) == [0, 1, 2, 3]
+
+    bitacora.close()
+    assert len(sincronizados) == 3
+    bitacora.close()
+    assert len(sincronizados) == 3
@@ -0,0 +1,82 @@
+from collections import Counter
+
+from utilities import entities, snapshot
+from utilities.entity_reader import BlockFilter, EntityReader, PROPERTY_PLANS
+
+
+class CountingProxy:
+    """Envuelve una entidad y cuenta cada lectura de propiedad (= llamada COM)."""
+
+    def __init__(self, target):
+        self._target = target
+        self.reads = Counter()
+
+    def __getattr__(self, name):
+        self.reads[name] += 1
+        return getattr(self._target, name)
+
+
+def test_snapshot_reads_each_property_once(offline_cad, load_fixture, monkeypatch):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    proxies = [CountingProxy(obj) for obj in doc.ModelSpace]
+    monkeypatch.setattr(doc.ModelSpace, "Item", lambda i: proxies[i])
+
+    snap = snapshot.take_snapshot()
+
+    assert len(snap.blocks) == 3
+    for proxy in proxies:
+        repetidas = {prop: n for prop, n in proxy.reads.items() if n > 1}
+        assert not repetidas, f"{proxy._target.EntityName}: {repetidas}"
+
+
+def test_reader_counts_calls_per_plan(offline_cad, load_fixture):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    reader = EntityReader()
+
+    linea = doc.ModelSpace.Item(0)
+    name = reader.entity_name(linea)
+    _, props = reader.read(linea, name)
+
+    assert set(props) == set(PROPERTY_PLANS["AcDbLine"])
+    assert reader.calls == 1 + len(PROPERTY_PLANS["AcDbLine"])
+    assert reader.per_entity() == reader.calls
+
+
+def test_block_filter_skips_expensive_reads_for_rejected_blocks(
+    offline_cad, monkeypatch
+):
+    doc = offline_cad(
+        {
+            "blocks": {"POSTE_C_9": ["COD", "OBS"]},
+            "entities": [
+                {"type": "AcDbBlockReference", "layer": "POSTES", "name": "POSTE_C_9",
+                 "insertion": [0, 0], "attributes": {"COD": "P-1", "OBS": "x"}},
+                {"type": "AcDbBlockReference", "layer": "POSTES", "name": "ARBOL",
+                 "insertion": [5, 0]},
+                {"type": "AcDbBlockReference", "layer": "OTRA", "name": "POSTE_C_9",
+                 "insertion": [9, 0]},
+            ],
+        }
+    )  # fmt: skip
+    proxies = [CountingProxy(obj) for obj in doc.ModelSpace]
+    monkeypatch.setattr(doc.ModelSpace, "Item", lambda i: proxies[i])
+
+    filtro = BlockFilter(names=["poste_c_9"], layers=["postes"], attribute_tags=["COD"])
+    postes = entities.extract_blocks(block_filter=filtro)
+
+    assert [(p["Handle"], p["Attr_COD"]) for p in postes] == [
+        (proxies[0].Handle, "P-1")
+    ]
+    assert "Attr_OBS" not in postes[0]
+    for rechazado in proxies[1:]:
+        assert "InsertionPoint" not in rechazado.reads
+        assert "GetAttributes" not in rechazado.reads
+
+
+def test_anonymous_blocks_read_effective_name(offline_cad, load_fixture):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    doc.ModelSpace.Item(3).Name = "*U4"
+
+    postes = entities.extract_blocks(block_filter=BlockFilter(names=["POSTE_C_9"]))
+    assert len(postes) == 2
+    assert {p["Nombre"] for p in postes} == {"POSTE_C_9"}
@@ -0,0 +1,103 @@
+import csv
+import os
+
+import pytest
+
+from utilities.cancellation import CancelToken, OperationCancelled
+from utilities.exporters import (
+    FORMAT_COLZ,
+    ReportWriter,
+    available_formats,
+    export_table,
+    format_for_path,
+    infer_column_type,
+    read_colz,
+)
+from utilities.table_data import ColumnarTable, discover_columns
+
+FILAS = [
+    {
+        "Handle": f"{i:X}",
+        "X": i * 1.5,
+        "Numero": i,
+        "Attr_TIPO": "T1" if i % 2 else None,
+    }
+    for i in range(23)
+]
+
+
+def test_format_and_type_inference():
+    assert format_for_path("salida.PARQUET") == "parquet"
+    assert format_for_path("salida.txt") == "csv"
+    assert FORMAT_COLZ in available_formats()
+    assert infer_column_type([1, None, 2]) == "int"
+    assert infer_column_type([1, 2.5]) == "float"
+    assert infer_column_type([True, False]) == "bool"
+    assert infer_column_type([1, "A"]) == "str"
+    assert infer_column_type([None]) == "str"
+
+
+def test_csv_export_is_written_in_chunks(tmp_path):
+    tabla = ColumnarTable.from_rows(FILAS)
+    avances = []
+    ruta = str(tmp_path / "datos.csv")
+    assert (
+        export_table(tabla, ruta, chunk_rows=5, progress_callback=avances.append) == 23
+    )
+    assert avances == [21, 43, 65, 86, 100]
+
+    with open(ruta, encoding="utf-8", newline="") as f:
+        filas = list(csv.DictReader(f))
+    assert len(filas) == 23
+    assert filas[3] == {"Handle": "3", "X": "4.5", "Numero": "3", "Attr_TIPO": "T1"}
+    assert filas[4]["Attr_TIPO"] == ""
+
+
+def test_colz_round_trip_keeps_types(tmp_path):
+    tabla = ColumnarTable.from_rows(FILAS)
+    ruta = str(tmp_path / "datos.colz")
+    export_table(tabla, ruta, chunk_rows=7)
+    leida = read_colz(ruta)
+    assert leida.columns == tabla.columns
+    assert list(leida.iter_rows()) == list(tabla.iter_rows())
+    assert isinstance(leida.value(0, 1), float) and leida.value(2, 2) == 2
+
+
+def test_cancelled_export_removes_partial_file(tmp_path):
+    token = CancelToken()
+    ruta = str(tmp_path / "datos.csv")
+
+    def cancelar_al_avanzar(pct):
+        token.cancel()
+
+    with pytest.raises(OperationCancelled):
+        export_table(
+            ColumnarTable.from_rows(FILAS),
+            ruta,
+            chunk_rows=5,
+            progress_callback=cancelar_al_avanzar,
+            cancel_token=token,
+        )
+    assert not os.path.exists(ruta)
+
+
+def test_report_writer_appends_rows_as_they_arrive(tmp_path):
+    plan = [{"Handle": "A1", "X": 1.0}, {"Handle": "A2", "X": 2.0, "Capa": "P"}]
+    ruta = str(tmp_path / "sub" / "reporte.csv")
+    with ReportWriter(ruta, discover_columns(plan) + ["N"], flush_every=1) as reporte:
+        reporte.write(plan[1], {"N": 1})
+        with open(ruta, encoding="utf-8") as f:
+            assert f.read().splitlines() == ["Handle,X,Capa,N", "A2,2.0,P,1"]
+        reporte.write(plan[0], {"N": 2})
+    assert reporte.rows_written == 2
+    with open(ruta, encoding="utf-8") as f:
+        assert f.read().splitlines()[-1] == "A1,1.0,,2"
+
+
+def test_parquet_export_when_pyarrow_is_available(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    ruta = str(tmp_path / "datos.parquet")
+    export_table(ColumnarTable.from_rows(FILAS), ruta, chunk_rows=10)
+    leida = pq.read_table(ruta)
+    assert leida.num_rows == 23
+    assert leida.column("Numero").to_pylist() == list(range(23))
@@ -1,5 +1,10 @@
 # import pytest
-from utilities.geometry import calculate_distance, sort_blocks_by_path, associate_data
+from utilities.geometry import (
+    calculate_distance,
+    sort_blocks_by_path,
+    associate_data,
+    split_segments_with_poles,
+)
 
 
 def test_calculate_distance():
@@ -41,3 +46,21 @@ def test_associate_data():
     # Verificamos que el dato cercano se heredó al bloque base
     assert "Data_Texto" in result[0]
     assert result[0]["Data_Texto"] == "COD-123"
+
+
+def test_split_segments_with_poles():
+    segmentos = [((0.0, 0.0), (30.0, 0.0)), ((30.0, 0.0), (30.0, 30.0))]
+    postes = [
+        {"Handle": "P2", "X": 20.0, "Y": 0.5},  # Sobre el primer tramo
+        {"Handle": "P1", "X": 10.0, "Y": -0.5},  # Sobre el primer tramo
+        {"Handle": "P3", "X": 40.0, "Y": 15.0},  # Fuera de tolerancia
+    ]
+
+    result = split_segments_with_poles(segmentos, postes, tolerancia=1.5)
+
+    assert result == [
+        ((0.0, 0.0), (10.0, 0.0)),
+        ((10.0, 0.0), (20.0, 0.0)),
+        ((20.0, 0.0), (30.0, 0.0)),
+        ((30.0, 0.0), (30.0, 30.0)),
+    ]
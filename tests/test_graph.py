@@ -0,0 +1,123 @@
+import random
+import sys
+from utilities.graph import NetworkGraph, point_to_key
+
+
+def _recursive_dfs(grafo: NetworkGraph, start):
+    """Versión recursiva original, como referencia de orden de visita."""
+    visited, path = set(), []
+
+    def dfs(key):
+        visited.add(key)
+        path.append(grafo.nodes[key])
+        for neighbor, _ in grafo.adj.get(key):
+            if neighbor not in visited:
+                dfs(neighbor)
+
+    dfs(grafo.key_of(start))
+    return path
+
+
+def test_iterative_dfs_matches_recursive_order():
+    rng = random.Random(11)
+    grafo = NetworkGraph(tolerance=0.1)
+    puntos = [
+        (float(rng.randint(0, 30)), float(rng.randint(0, 30))) for _ in range(200)
+    ]
+    for _ in range(400):
+        grafo.add_line(rng.choice(puntos), rng.choice(puntos))
+
+    inicio = grafo.nodes[next(iter(grafo.adj))]
+    assert grafo.dfs_traversal(inicio) == _recursive_dfs(grafo, inicio)
+
+
+def test_dfs_handles_feeders_longer_than_recursion_limit():
+    grafo = NetworkGraph(tolerance=0.1)
+    largo = sys.getrecursionlimit() * 3
+    for i in range(largo):
+        grafo.add_line((float(i), 0.0), (float(i + 1), 0.0))
+
+    ruta = grafo.dfs_traversal((0.0, 0.0))
+    assert len(ruta) == largo + 1
+    assert ruta[-1] == (float(largo), 0.0)
+
+
+def test_branch_ordering_policies():
+    # Desde (0,0) la red llega a (10,0) y se bifurca: derivación corta hacia
+    # arriba y continuación recta (más larga) hacia la derecha.
+    grafo = NetworkGraph(tolerance=0.1)
+    grafo.add_line((0.0, 0.0), (10.0, 0.0))
+    grafo.add_line((10.0, 0.0), (10.0, 5.0))
+    grafo.add_line((10.0, 0.0), (25.0, 0.0))
+    grafo.add_line((25.0, 0.0), (40.0, 0.0))
+
+    assert grafo.dfs_traversal((0.0, 0.0))[2] == (10.0, 5.0)
+    assert grafo.dfs_traversal((0.0, 0.0), order="shortest_edge")[2] == (10.0, 5.0)
+    assert grafo.dfs_traversal((0.0, 0.0), order="straightest")[2] == (25.0, 0.0)
+    assert grafo.dfs_traversal((0.0, 0.0), order="longest_subtree_last") == [
+        (0.0, 0.0),
+        (10.0, 0.0),
+        (10.0, 5.0),
+        (25.0, 0.0),
+        (40.0, 0.0),
+    ]
+
+
+def test_node_keys_are_exact_fixed_point_integers():
+    # 0.1 + 0.2 != 0.3 en float, pero ambos son el mismo punto a 4 decimales
+    assert point_to_key((0.1 + 0.2, 0.0), 0) == point_to_key((0.3, 0.0), 0)
+    assert point_to_key((0.30000000000000004, 1.0), 0.1) == (3000, 10000)
+    # El snap se hace sobre enteros: a ambos lados del mismo punto medio no hay ruido
+    assert point_to_key((0.05, 0.0), 0.1) == point_to_key((0.0999, 0.0), 0.1)
+    assert point_to_key((0.0499, 0.0), 0.1) == (0, 0)
+    assert point_to_key((-0.05, 0.0), 0.1) == (0, 0)
+
+    grafo = NetworkGraph(tolerance=0.1)
+    grafo.add_line((0.0, 0.0), (0.1 + 0.2, 0.0))
+    grafo.add_line((0.3, 0.0), (0.3, 5.0))
+    assert len(grafo.adj) == 3
+    assert all(isinstance(c, int) for key in grafo.adj for c in key)
+
+    # La API pública sigue en coordenadas float
+    nodo, dist = grafo.find_nearest_node((0.31, 0.0), max_radius=1.0)
+    assert nodo == (0.3, 0.0) and isinstance(nodo[0], float)
+    # El nodo conserva el primer extremo de su grupo
+    assert grafo.dfs_traversal(nodo)[0] == (0.1 + 0.2, 0.0)
+    largo, ruta = grafo.get_path_length((0.0, 0.0), (0.3, 5.0))
+    assert abs(largo - 5.3) < 1e-9 and ruta[-1] == (0.3, 5.0)
+
+
+def test_path_length_off_network_or_between_islands_is_none():
+    grafo = NetworkGraph(tolerance=0.1)
+    grafo.add_line((0.0, 0.0), (10.0, 0.0))
+    grafo.add_line((100.0, 0.0), (110.0, 0.0))
+    # Un extremo fuera de la red, los dos fuera y dos islas separadas
+    assert grafo.get_path_length((0.0, 0.0), (500.0, 500.0)) == (None, [])
+    assert grafo.get_path_length((900.0, 900.0), (500.0, 500.0)) == (None, [])
+    assert grafo.get_path_length((0.0, 0.0), (110.0, 0.0)) == (None, [])
+
+
+def test_endpoints_within_tolerance_merge_across_cell_borders():
+    # Extremos a 2 cm, uno a cada lado de un borde de redondeo de 0.1 m
+    grafo = NetworkGraph(tolerance=0.1)
+    grafo.add_line((0.0, 0.0), (10.049, 0.0))
+    grafo.add_line((10.051, 0.0), (10.051, 8.0))
+    grafo.add_line((10.06, 0.0), (20.0, 0.0))  # se une a los dos anteriores
+    assert len(grafo.nodes) == 4
+    assert grafo.merged_endpoints == 2
+    assert grafo.dfs_traversal((0.0, 0.0))[1] == (10.049, 0.0)
+
+    # La unión es transitiva: una cadena de extremos a 8 cm queda en un nodo
+    cadena = NetworkGraph(tolerance=0.1)
+    cadena.add_line((0.0, 5.0), (1.0, 0.0))
+    cadena.add_line((1.16, 0.0), (2.0, 5.0))
+    cadena.add_line((1.08, 0.0), (3.0, 5.0))  # puente entre los dos nodos
+    assert len(cadena.nodes) == 4 and cadena.merged_endpoints == 2
+    assert sorted(len(vecinos) for vecinos in cadena.adj.values()) == [1, 1, 1, 3]
+    assert cadena.key_of((1.16, 0.0)) == cadena.key_of((1.0, 0.0))
+
+    # Más allá de la tolerancia los extremos siguen separados
+    separados = NetworkGraph(tolerance=0.1)
+    separados.add_line((0.0, 0.0), (1.0, 0.0))
+    separados.add_line((1.11, 0.0), (2.0, 0.0))
+    assert len(separados.nodes) == 4 and separados.merged_endpoints == 0
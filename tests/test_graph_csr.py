@@ -0,0 +1,85 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from benchmarks import synthetic
+from utilities.graph import NEIGHBOR_ORDERS, ORDER_LONGEST_SUBTREE_LAST, NetworkGraph
+
+
+def _grafo(segmentos):
+    grafo = NetworkGraph(tolerance=0.1)
+    for p1, p2 in segmentos:
+        grafo.add_line(p1, p2)
+    return grafo
+
+
+@pytest.mark.parametrize(
+    "segmentos",
+    [synthetic.radial_feeder(400), synthetic.meshed_grid(12, 12)],
+    ids=["radial", "malla"],
+)
+def test_frozen_graph_matches_dict_graph(segmentos):
+    grafo = _grafo(segmentos)
+    csr = grafo.freeze()
+    assert len(csr) == len(grafo.nodes)
+    assert csr.edge_count == sum(len(v) for v in grafo.adj.values()) // 2
+
+    inicio = (0.0, 0.0)
+    for order in list(NEIGHBOR_ORDERS) + [ORDER_LONGEST_SUBTREE_LAST]:
+        assert csr.dfs_traversal(inicio, order) == grafo.dfs_traversal(inicio, order)
+
+    assert csr.find_nearest_node((3.0, 2.0), 10.0) == grafo.find_nearest_node(
+        (3.0, 2.0), 10.0
+    )
+    fin = segmentos[-1][1]
+    largo, ruta = csr.get_path_length(inicio, fin)
+    esperado, ruta_dict = grafo.get_path_length(inicio, fin)
+    assert largo == pytest.approx(esperado)
+    assert ruta[0] == ruta_dict[0] and ruta[-1] == ruta_dict[-1]
+
+
+def test_components_paths_and_memory():
+    grafo = _grafo(
+        [((0.0, 0.0), (10.0, 0.0)), ((10.0, 0.0), (20.0, 0.0))]
+        + [((100.0, 0.0), (110.0, 0.0))]
+    )
+    csr = grafo.freeze()
+    cantidad, etiquetas = csr.connected_components()
+    assert cantidad == 2 and etiquetas.tolist() == [0, 0, 0, 1, 1]
+    assert csr.component_of((110.0, 0.0)) == [(100.0, 0.0), (110.0, 0.0)]
+    assert csr.get_path_length((0.0, 0.0), (110.0, 0.0)) == (None, [])
+    assert csr.get_path_length((0.0, 0.0), (20.0, 0.0)) == (
+        20.0,
+        [(0.0, 0.0), (10.0, 0.0), (20.0, 0.0)],
+    )
+    assert csr.dfs_traversal((500.0, 0.0)) == []
+    with pytest.raises(ValueError):
+        csr.dfs_traversal((0.0, 0.0), order=lambda g, k, p, n: n)
+
+    # 5 nodos y 3 aristas: claves y coordenadas (32 B/nodo), offsets, vecinos y pesos
+    assert csr.nbytes == 5 * 32 + 6 * 8 + 6 * (4 + 8)
+
+
+def test_lookups_resolve_merged_endpoints_like_the_dict_graph():
+    # Extremos a 2 cm de distintos vanos quedan unidos en un solo nodo
+    grafo = _grafo(
+        [
+            ((0.0, 0.0), (10.049, 0.0)),
+            ((10.051, 0.0), (10.051, 8.0)),
+            ((10.06, 0.0), (20.0, 0.0)),
+        ]
+    )
+    assert grafo.merged_endpoints == 2
+    csr = grafo.freeze()
+    claves = list(grafo.nodes)
+
+    for punto in [(10.049, 0.0), (10.051, 0.0), (10.06, 0.0), (10.1, 0.0), (5.0, 5.0)]:
+        clave = grafo.key_of(punto)
+        esperado = claves.index(clave) if clave is not None else None
+        assert csr.node_index(punto) == esperado
+    assert csr.get_path_length((10.06, 0.0), (10.051, 8.0)) == grafo.get_path_length(
+        (10.06, 0.0), (10.051, 8.0)
+    )
+    assert csr.find_nearest_node((10.0, 1.0), 5.0) == grafo.find_nearest_node(
+        (10.0, 1.0), 5.0
+    )
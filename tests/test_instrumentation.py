@@ -0,0 +1,158 @@
+import json
+
+from utilities import drawing, instrumentation, layers, snapshot
+from utilities.instrumentation import (
+    add_com_calls,
+    add_items,
+    com_call_count,
+    counted,
+    finish_run,
+    span,
+    start_run,
+    traced,
+    write_run_summary,
+)
+
+
+@traced("paso")
+def _paso(n):
+    add_items(n)
+    add_com_calls(2)
+    return n
+
+
+def test_spans_without_a_run_are_free_no_ops():
+    assert instrumentation.current_run() is None
+    with span("suelta") as s:
+        s.add_items(3)
+    assert _paso(4) == 4
+    assert finish_run() is None
+
+
+def test_stages_accumulate_time_items_and_com_calls():
+    perfil = start_run("prueba")
+    with span("externa", items=10):
+        _paso(3)
+        _paso(5)
+    with span("otra"):
+        pass
+    assert finish_run() is perfil
+    assert instrumentation.current_run() is None
+
+    etapas = {e["etapa"]: e for e in perfil.summary()["etapas"]}
+    assert list(etapas) == ["paso", "externa", "otra"]
+    assert etapas["paso"]["veces"] == 2 and etapas["paso"]["nivel"] == 1
+    assert etapas["paso"]["elementos"] == 8 and etapas["paso"]["com"] == 4
+    assert etapas["externa"]["elementos"] == 10 and etapas["externa"]["com"] == 4
+    assert etapas["otra"]["elementos"] is None
+    assert perfil.com_calls == 4
+
+    lineas = perfil.format_lines()
+    assert lineas[0].startswith("Tiempos de 'prueba'")
+    assert "    paso: " in lineas[1] and "2 veces" in lineas[1]
+
+
+def test_nested_run_restores_the_outer_one():
+    externa = start_run("externa")
+    interna = start_run("interna")
+    with span("solo_interna"):
+        pass
+    assert finish_run() is interna
+    assert instrumentation.current_run() is externa
+    finish_run()
+    assert "solo_interna" not in externa.stages
+
+
+def test_summary_is_appended_as_json_lines(tmp_path):
+    for nombre in ("a", "b"):
+        start_run(nombre)
+        with span("etapa"):
+            pass
+        ruta = write_run_summary(finish_run(), folder=str(tmp_path))
+    with open(ruta, encoding="utf-8") as f:
+        resumenes = [json.loads(line) for line in f]
+    assert [r["trabajo"] for r in resumenes] == ["a", "b"]
+    assert resumenes[0]["etapas"][0]["etapa"] == "etapa"
+
+
+class _Capa:
+    def __init__(self, nombre):
+        self.Name = nombre
+
+
+class _Documento:
+    def __init__(self):
+        self.ActiveLayer = _Capa("0")
+        self.capas = {"A": _Capa("A")}
+
+    def Item(self, nombre):
+        return self.capas[nombre]
+
+
+def test_counted_counts_reads_writes_and_calls_and_unwraps_arguments():
+    doc = _Documento()
+    envuelto = counted(doc)
+    antes = com_call_count()
+    previa = envuelto.ActiveLayer  # lectura
+    envuelto.ActiveLayer = envuelto.Item("A")  # llamada + asignación
+    envuelto.ActiveLayer = previa  # asignación
+    assert com_call_count() - antes == 4
+    # El backend recibe el objeto original, no la envoltura
+    assert type(doc.ActiveLayer) is _Capa and doc.ActiveLayer.Name == "0"
+    assert previa.Name == "0" and com_call_count() - antes == 5
+
+
+class _Coleccion:
+    """Como un CDispatch de pywin32: invocable por su miembro por defecto."""
+
+    def __init__(self, capas):
+        self.capas = capas
+
+    def __call__(self, nombre):
+        return self.capas[nombre]
+
+    def Item(self, nombre):
+        return self.capas[nombre]
+
+
+class _DocumentoCom:
+    def __init__(self):
+        self.Layers = _Coleccion({"A": _Coleccion({})})
+        self.ActiveLayer = _Coleccion({})
+
+
+def test_counted_reads_callable_com_objects_as_properties():
+    doc = _DocumentoCom()
+    envuelto = counted(doc)
+    antes = com_call_count()
+    capas = envuelto.Layers  # lectura: objeto invocable, no método
+    assert isinstance(capas, instrumentation._Counted)
+    envuelto.ActiveLayer = capas.Item("A")
+    assert doc.ActiveLayer is doc.Layers.capas["A"]
+    assert com_call_count() - antes == 3
+
+
+def test_snapshot_and_bulk_insert_report_com_calls(offline_cad, load_fixture):
+    offline_cad(load_fixture("red_simple.json"))
+    layers.ensure_layer("NUMERACION")
+
+    perfil = start_run("numeración")
+    snap = snapshot.take_snapshot(kinds=(snapshot.KIND_BLOCKS,))
+    drawing.insert_blocks_bulk(
+        [{"x": 0.0, "y": 0.0}, {"x": 10.0, "y": 0.0}],
+        block_name="UBICACION POSTES UTM",
+        layer="NUMERACION",
+        number_tag="000",
+    )
+    finish_run()
+
+    lectura = perfil.stages["take_snapshot"]
+    assert lectura["elementos"] > 0 and lectura["com"] > 0
+    insercion = perfil.stages["insert_blocks_bulk"]
+    # Capa (lectura, Layers, Item, asignación), por bloque InsertBlock,
+    # HasAttributes, GetAttributes y TextString, la única etiqueta una vez,
+    # restauración de la capa y Regen
+    assert insercion["elementos"] == 2
+    assert insercion["com"] == 4 + 2 * 4 + 1 + 2
+    assert perfil.com_calls == lectura["com"] + insercion["com"]
+    assert snap.blocks
@@ -0,0 +1,111 @@
+import pytest
+
+from utilities import mirror, snapshot
+from utilities.cad_manager import ComBackend, cad
+from utilities.mirror import MODE_EVENTS, MODE_POLLING, LiveMirror
+from utilities.offline_cad import OfflineBackend, document_from_dict
+
+
+def _sin_indice(record: dict) -> dict:
+    return {k: v for k, v in record.items() if k != "Indice"}
+
+
+def _assert_matches_full_read(mirror: LiveMirror) -> None:
+    espejo = mirror.snapshot()
+    leida = snapshot.take_snapshot()
+    assert espejo.blocks == leida.blocks
+    assert espejo.texts == leida.texts
+    # "Indice" solo ordena: el espejo no renumera tras un borrado
+    for coleccion in ("lines", "polylines"):
+        propia, completa = getattr(espejo, coleccion), getattr(leida, coleccion)
+        assert list(propia) == list(completa)
+        assert sorted(propia, key=lambda h: propia[h]["Indice"]) == list(completa)
+        assert [_sin_indice(r) for r in propia.values()] == [
+            _sin_indice(r) for r in completa.values()
+        ]
+    assert espejo.layer_usage == leida.layer_usage
+    assert espejo.total_entities == leida.total_entities
+
+
+@pytest.fixture
+def polling_cad(load_fixture):
+    backend = OfflineBackend(document_from_dict(load_fixture("red_simple.json")))
+    backend.events = False
+    cad.set_backend(backend)
+    cad.connect()
+    yield backend.document
+    cad.set_backend(ComBackend())
+
+
+def test_events_keep_mirror_in_sync(offline_cad, load_fixture):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    mirror = LiveMirror()
+    assert mirror.start()
+    assert mirror.mode == MODE_EVENTS
+    _assert_matches_full_read(mirror)
+
+    version = mirror.version
+    nuevo = doc.ModelSpace.InsertBlock(
+        (500, 500, 0), "UBICACION POSTES UTM", 1, 1, 1, 0
+    )
+    doc.ModelSpace.Item(0).Layer = "POSTES"
+    doc.ModelSpace.Item(1).Delete()
+    assert mirror.version > version
+    assert nuevo.Handle in mirror.block_index
+    _assert_matches_full_read(mirror)
+
+    mirror.stop()
+    doc.ModelSpace.Item(0).Delete()
+    assert mirror.snapshot().total_entities == doc.ModelSpace.Count + 1
+
+
+def test_attribute_edit_updates_block_record(offline_cad, load_fixture):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    mirror = LiveMirror()
+    mirror.start()
+
+    bloque = doc.ModelSpace.InsertBlock((0, 0, 0), "UBICACION POSTES UTM")
+    assert mirror.snapshot().blocks[bloque.Handle]["Attr_000"] == ""
+    bloque.GetAttributes()[0].TextString = "P-99"
+    registro = mirror.snapshot().blocks[bloque.Handle]
+    assert registro["Attr_000"] == "P-99"
+
+    # Los bloques del fixture también se actualizan (el evento trae el atributo)
+    poste = next(
+        obj
+        for obj in doc.ModelSpace
+        if obj.EntityName == "AcDbBlockReference" and obj.HasAttributes
+    )
+    poste.GetAttributes()[0].TextString = "EDITADO"
+    etiqueta = poste.GetAttributes()[0].TagString
+    assert mirror.snapshot().blocks[poste.Handle][f"Attr_{etiqueta}"] == "EDITADO"
+    mirror.stop()
+
+
+def test_polling_detects_additions_and_erasures(polling_cad):
+    doc = polling_cad
+    mirror = LiveMirror()
+    assert mirror.start()
+    assert mirror.mode == MODE_POLLING
+
+    doc.ModelSpace.AddLine((0, 0, 0), (5, 5, 0), "NUEVA")
+    doc.ModelSpace.Item(0).Delete()
+    assert mirror.poll() == 2
+    _assert_matches_full_read(mirror)
+    assert mirror.poll() == 0
+
+
+def test_mirror_of_another_document_is_not_served(
+    offline_cad, load_fixture, monkeypatch
+):
+    espejo = LiveMirror()
+    monkeypatch.setattr(mirror, "live_mirror", espejo)
+    datos = load_fixture("red_simple.json")
+    offline_cad(dict(datos, name="C:/planos/red.dwg"))
+    assert espejo.start() and espejo.document == "C:/planos/red.dwg"
+    assert mirror.mirror_snapshot() is not None
+
+    # El usuario pasa a otro dibujo: el espejo viejo no se usa y se detiene
+    offline_cad(dict(datos, name="C:/planos/otro.dwg"))
+    assert mirror.mirror_snapshot() is None
+    assert not espejo.running and espejo.document is None
@@ -0,0 +1,21 @@
+from utilities.numbering import assign_poles_to_path
+
+
+def test_assign_poles_to_path_orders_by_route_then_stragglers():
+    ruta = [(0.0, 0.0), (10.0, 0.0), (20.0, 0.0)]
+    postes = [
+        {"Handle": "C", "X": 20.5, "Y": 0.0},
+        {"Handle": "B2", "X": 10.0, "Y": 1.0},  # Mismo vértice, más lejos que B1
+        {"Handle": "B1", "X": 10.2, "Y": 0.0},
+        {"Handle": "LEJOS", "X": 100.0, "Y": 0.0},
+        {"Handle": "A", "X": 0.0, "Y": -0.5},
+        {"Handle": "CERCA", "X": 30.0, "Y": 0.0},
+    ]
+
+    en_ruta, rezagados = assign_poles_to_path(ruta, postes, radius=1.5)
+
+    assert [p["Handle"] for p in en_ruta] == ["A", "B1", "B2", "C"]
+    # Rezagados ordenados por cercanía al último vértice del recorrido
+    assert [p["Handle"] for p in rezagados] == ["CERCA", "LEJOS"]
+    # La lista original no se modifica
+    assert len(postes) == 6
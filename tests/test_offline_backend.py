@@ -0,0 +1,97 @@
+from utilities import entities, layers, drawing, snapshot
+from utilities.offline_cad import load_dxf
+
+
+def test_extractors_over_offline_drawing(offline_cad, load_fixture):
+    offline_cad(load_fixture("red_simple.json"))
+
+    snap = snapshot.take_snapshot()
+    assert len(snap.blocks) == 3
+    assert len(snap.texts) == 2
+
+    # Solo las líneas de la capa de red: 1 línea + 2 tramos de polilínea
+    segmentos = entities.extract_network_lines(
+        {"red": "CAT_LINEA DE RED EXISTENTE"}, snapshot=snap
+    )
+    assert segmentos == [((0, 0), (10, 0)), ((10, 0), (20, 0)), ((20, 0), (20, 10))]
+
+    postes = entities.extract_blocks(layer_name="postes", snapshot=snap)
+    assert [p["Nombre"] for p in postes] == ["POSTE_C_9", "POSTE_C_9", "POSTE_M_8"]
+
+    textos = entities.extract_texts(layer_name="CAT_COD_POSTE", snapshot=snap)
+    assert [t["Texto"] for t in textos] == ["P-001", "P-002"]
+
+    estado = {fila["Nombre"]: fila["Estado"] for fila in layers.get_layers_status(snap)}
+    assert estado["SIN_USO"] == "Vacía"
+    assert estado["POSTES"] == "En Uso"
+
+
+def test_insert_block_records_writes(offline_cad, load_fixture):
+    doc = offline_cad(load_fixture("red_simple.json"))
+
+    ok = drawing.insert_block_with_attributes(
+        x=5.0,
+        y=5.0,
+        block_name="UBICACION POSTES UTM",
+        layer="NUMERACION",
+        attributes={"000": "7"},
+    )
+
+    assert ok
+    ops = doc.writes
+    assert ops[0]["op"] == "InsertBlock"
+    handle = doc.writes[0]["handle"]
+    assert {"op": "SetAttribute", "handle": handle, "tag": "000", "value": "7"} in ops
+
+    nuevo = doc.ModelSpace.Item(doc.ModelSpace.Count - 1)
+    assert nuevo.Layer == "NUMERACION"
+    assert nuevo.GetAttributes()[0].TextString == "7"
+
+
+def test_load_dxf(tmp_path):
+    # Pares (código de grupo, valor) de un DXF ASCII mínimo
+    tags = [
+        (0, "SECTION"), (2, "ENTITIES"),
+        (0, "LINE"), (5, "1F"), (8, "RED"), (10, 0.0), (20, 0.0), (11, 5.0), (21, 0.0),
+        (0, "INSERT"), (8, "POSTES"), (2, "POSTE_C_9"), (66, 1),
+        (10, 5.0), (20, 0.0), (50, 90.0),
+        (0, "ATTRIB"), (8, "POSTES"), (2, "COD"), (1, "A-1"),
+        (0, "SEQEND"),
+        (0, "ENDSEC"), (0, "EOF"),
+    ]  # fmt: skip
+    path = tmp_path / "plano.dxf"
+    path.write_text("\n".join(f"{c}\n{v}" for c, v in tags), encoding="utf-8")
+
+    doc = load_dxf(str(path))
+
+    assert doc.ModelSpace.Count == 2
+    linea, poste = doc.ModelSpace.Item(0), doc.ModelSpace.Item(1)
+    assert linea.EntityName == "AcDbLine" and linea.EndPoint == (5.0, 0.0, 0.0)
+    assert poste.Name == "POSTE_C_9"
+    assert poste.GetAttributes()[0].TextString == "A-1"
+    assert abs(poste.Rotation - 1.5707963) < 1e-6
+
+
+def test_insert_blocks_bulk_numbers_and_regens_once(offline_cad, load_fixture):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    layers.ensure_layer("NUMERACION")
+    antes = doc.ModelSpace.Count
+
+    resultados = drawing.insert_blocks_bulk(
+        [{"x": 0.0, "y": 0.0}, {"x": 10.0, "y": 0.0}, {"x": 20.0, "y": 10.0}],
+        block_name="UBICACION POSTES UTM",
+        layer="NUMERACION",
+        number_tag="000",
+        start_number=1,
+    )
+
+    assert resultados == [True, True, True]
+    nuevos = [doc.ModelSpace.Item(i) for i in range(antes, doc.ModelSpace.Count)]
+    assert [b.GetAttributes()[0].TextString for b in nuevos] == ["1", "2", "3"]
+    assert all(b.Layer == "NUMERACION" for b in nuevos)
+
+    ops = [w["op"] for w in doc.writes]
+    assert "Update" not in ops
+    assert ops.count("Regen") == 1
+    # La capa activa se restaura al terminar
+    assert doc.ActiveLayer.Name == "0"
@@ -0,0 +1,95 @@
+import pytest
+
+from utilities import entities, snapshot
+from utilities.selection import (
+    EntityFilter,
+    SelectionQuery,
+    _wildcard_regex,
+    escape_wildcard,
+)
+
+
+@pytest.mark.parametrize(
+    "patron, texto, esperado",
+    [
+        ("LINE,LWPOLYLINE", "lwpolyline", True),
+        ("LINE,LWPOLYLINE", "POLYLINE", False),
+        ("POSTE_C_#", "POSTE_C_9", True),
+        ("POSTE_C_#", "POSTE_C_9P", False),
+        ("CAT_*", "CAT_COD_POSTE", True),
+        ("~CAT_*", "CAT_COD_POSTE", False),
+        ("`*U*", "*U12", True),
+        ("`*U*", "POSTE_U", False),
+        (escape_wildcard("CAT_OBS POSTE-1"), "CAT_OBS POSTE-1", True),
+    ],
+)
+def test_wildcards(patron, texto, esperado):
+    assert bool(_wildcard_regex(patron).match(texto)) is esperado
+
+
+def test_query_codes_group_filters_with_or():
+    query = SelectionQuery(
+        [
+            EntityFilter(snapshot.BLOCK_TYPES, block_names=["POSTE_C_9"]),
+            EntityFilter(snapshot.LINE_TYPES, layers=["red"]),
+        ]
+    )
+    assert query.dxf_codes() == [
+        (410, "Model"),
+        (-4, "<OR"),
+        (-4, "<AND"),
+        (0, "INSERT"),
+        (2, "POSTE_C_9,`*U*"),
+        (-4, "AND>"),
+        (-4, "<AND"),
+        (0, "LINE"),
+        (8, "RED"),
+        (-4, "AND>"),
+        (-4, "OR>"),
+    ]
+
+
+def test_filtered_snapshot_matches_full_scan(offline_cad, load_fixture):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    # Bloque dinámico modificado: nombre anónimo, EffectiveName real
+    doc.ModelSpace.Item(5).Name = "*U7"
+
+    query = SelectionQuery(
+        [
+            EntityFilter(snapshot.BLOCK_TYPES, block_names=["POSTE_C_9", "POSTE_M_8"]),
+            EntityFilter(snapshot.TEXT_TYPES, layers=["cat_cod_poste"]),
+            EntityFilter(
+                snapshot.LINE_TYPES + snapshot.POLYLINE_TYPES,
+                layers=["CAT_LINEA DE RED EXISTENTE"],
+            ),
+        ]
+    )
+    kinds = (
+        snapshot.KIND_BLOCKS,
+        snapshot.KIND_TEXTS,
+        snapshot.KIND_LINES,
+        snapshot.KIND_POLYLINES,
+    )
+    filtrada = snapshot.take_filtered_snapshot(query, kinds=kinds)
+    completa = snapshot.take_snapshot(kinds=kinds)
+
+    # La línea de OTRA_CAPA no se lee
+    assert filtrada.total_entities == completa.total_entities - 1
+    assert filtrada.scope is not None
+    assert filtrada.blocks == completa.blocks
+    assert filtrada.texts == completa.texts
+
+    red = {"red": "CAT_LINEA DE RED EXISTENTE"}
+    assert entities.extract_network_lines(
+        red, snapshot=filtrada
+    ) == entities.extract_network_lines(red, snapshot=completa)
+
+    # El SelectionSet temporal no queda en el documento
+    assert doc.SelectionSets.Count == 0
+
+
+def test_filtered_snapshot_rejects_layer_usage(offline_cad, load_fixture):
+    offline_cad(load_fixture("red_simple.json"))
+    query = SelectionQuery([EntityFilter(snapshot.BLOCK_TYPES)])
+    with pytest.raises(ValueError):
+        snapshot.take_filtered_snapshot(query, kinds=(snapshot.KIND_LAYERS,))
@@ -0,0 +1,85 @@
+from utilities import snapshot
+from utilities.cad_manager import cad
+from utilities.snapshot_cache import SnapshotCache, cached_snapshot
+
+
+def test_second_read_of_unchanged_drawing_hits_cache(
+    offline_cad, load_fixture, tmp_path
+):
+    offline_cad(load_fixture("red_simple.json"))
+    cache = SnapshotCache(str(tmp_path / "snapshots.sqlite"))
+
+    primera, hit = cached_snapshot(kinds=(snapshot.KIND_BLOCKS,), cache=cache)
+    assert not hit
+
+    segunda, hit = cached_snapshot(kinds=(snapshot.KIND_BLOCKS,), cache=cache)
+    assert hit
+    assert segunda.blocks == primera.blocks
+    assert segunda.total_entities == primera.total_entities
+
+
+def test_view_changes_do_not_bypass_cache(offline_cad, load_fixture, tmp_path):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    cache = SnapshotCache(str(tmp_path / "snapshots.sqlite"))
+    cached_snapshot(kinds=(snapshot.KIND_BLOCKS,), cache=cache)
+
+    # Un zoom activa otros bits de DBMOD, pero no el de la base de datos
+    cad.app.ZoomExtents()
+    assert doc.GetVariable("DBMOD") == 4
+    _, hit = cached_snapshot(kinds=(snapshot.KIND_BLOCKS,), cache=cache)
+    assert hit
+
+
+def test_cache_grows_to_cover_new_kinds(offline_cad, load_fixture, tmp_path):
+    offline_cad(load_fixture("red_simple.json"))
+    cache = SnapshotCache(str(tmp_path / "snapshots.sqlite"))
+
+    cached_snapshot(kinds=(snapshot.KIND_BLOCKS,), cache=cache)
+    snap, hit = cached_snapshot(kinds=(snapshot.KIND_TEXTS,), cache=cache)
+    assert not hit
+    assert snap.covers(snapshot.KIND_BLOCKS, snapshot.KIND_TEXTS)
+
+    _, hit = cached_snapshot(kinds=(snapshot.KIND_BLOCKS,), cache=cache)
+    assert hit
+
+
+def test_unsaved_changes_bypass_cache_until_saved(offline_cad, load_fixture, tmp_path):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    cache = SnapshotCache(str(tmp_path / "snapshots.sqlite"))
+    cached_snapshot(kinds=(snapshot.KIND_BLOCKS,), cache=cache)
+
+    # Cambiar una propiedad no altera el conteo ni la semilla de handles
+    doc.ModelSpace.Item(0).Layer = "OTRA"
+    _, hit = cached_snapshot(kinds=(snapshot.KIND_BLOCKS,), cache=cache)
+    assert not hit
+
+    doc.Save()
+    _, hit = cached_snapshot(kinds=(snapshot.KIND_BLOCKS,), cache=cache)
+    assert not hit
+    _, hit = cached_snapshot(kinds=(snapshot.KIND_BLOCKS,), cache=cache)
+    assert hit
+
+
+def test_partial_reads_are_not_cached(offline_cad, load_fixture, tmp_path, monkeypatch):
+    doc = offline_cad(load_fixture("red_simple.json"))
+    cache = SnapshotCache(str(tmp_path / "snapshots.sqlite"))
+
+    # Una entidad que no se puede leer (p. ej. "llamada rechazada" de COM)
+    msp = doc.ModelSpace
+    item = msp.Item
+
+    def item_rechazado(i):
+        if i == 0:
+            raise RuntimeError("Call was rejected by callee.")
+        return item(i)
+
+    monkeypatch.setattr(msp, "Item", item_rechazado)
+    parcial, hit = cached_snapshot(kinds=(snapshot.KIND_LINES,), cache=cache)
+    assert not hit and parcial.skipped == 1 and not parcial.complete
+
+    monkeypatch.setattr(msp, "Item", item)
+    completa, hit = cached_snapshot(kinds=(snapshot.KIND_LINES,), cache=cache)
+    assert not hit and completa.complete
+    assert len(completa.lines) == len(parcial.lines) + 1
+    _, hit = cached_snapshot(kinds=(snapshot.KIND_LINES,), cache=cache)
+    assert hit
@@ -0,0 +1,54 @@
+import math
+import random
+from utilities.spatial import GridIndex
+from utilities.graph import NetworkGraph
+
+
+def _brute_force(points: dict, query, k=None, radius=None):
+    ranked = sorted(
+        (math.hypot(query[0] - x, query[1] - y), key) for key, (x, y) in points.items()
+    )
+    if radius is not None:
+        ranked = [item for item in ranked if item[0] <= radius]
+    return ranked if k is None else ranked[:k]
+
+
+def test_grid_index_matches_brute_force():
+    rng = random.Random(7)
+    index = GridIndex(cell_size=3.0)
+    points = {}
+    for i in range(500):
+        points[i] = (rng.uniform(-50, 50), rng.uniform(-50, 50))
+        index.insert(i, points[i])
+
+    # Eliminación y reubicación mantienen el índice coherente
+    for i in range(0, 500, 5):
+        index.remove(i)
+        del points[i]
+    points[1] = (0.0, 0.0)
+    index.insert(1, points[1])
+
+    for _ in range(50):
+        q = (rng.uniform(-60, 60), rng.uniform(-60, 60))
+        expected = _brute_force(points, q, k=5)
+        got = [(d, key) for d, key, _ in index.k_nearest(q, 5)]
+        assert got == expected
+
+        expected_r = _brute_force(points, q, radius=7.5)
+        got_r = [(d, key) for d, key, _ in index.within(q, 7.5)]
+        assert got_r == expected_r
+
+
+def test_find_nearest_node_respects_radius():
+    grafo = NetworkGraph(tolerance=0.1)
+    grafo.add_line((0.0, 0.0), (10.0, 0.0))
+    grafo.add_line((10.0, 0.0), (10.0, 10.0))
+
+    key, dist = grafo.find_nearest_node((9.0, 1.0), max_radius=5.0)
+    assert key == (10.0, 0.0)
+    assert math.isclose(dist, math.sqrt(2))
+
+    assert grafo.find_nearest_node((50.0, 50.0), max_radius=5.0) == (None, None)
+
+    cercanos = grafo.find_k_nearest_nodes((0.0, 0.0), k=2)
+    assert [key for key, _ in cercanos] == [(0.0, 0.0), (10.0, 0.0)]
@@ -0,0 +1,40 @@
+from utilities.table_data import ColumnarTable, discover_columns
+
+FILAS = [
+    {"Handle": "A1", "Nombre": "POSTE", "X": 10.0, "Attr_NUM": "3"},
+    {"Handle": "A2", "Nombre": "poste", "X": 2.5},
+    {"Handle": "A3", "Nombre": "CAJA", "X": 7, "Attr_TIPO": "T1"},
+    {"Handle": "A4", "Nombre": "POSTE"},
+]
+
+
+def test_schema_is_discovered_in_first_appearance_order():
+    assert discover_columns(FILAS) == ["Handle", "Nombre", "X", "Attr_NUM", "Attr_TIPO"]
+    assert discover_columns([]) == []
+
+
+def test_columnar_table_round_trips_rows():
+    tabla = ColumnarTable.from_rows(FILAS)
+    assert len(tabla) == 4 and tabla.column_count == 5
+    assert [tabla.row(i) for i in range(len(tabla))] == FILAS
+    assert tabla.value(1, tabla.columns.index("Attr_NUM")) is None
+    assert list(tabla.iter_rows([2]))[0] == ["A3", "CAJA", 7, None, "T1"]
+
+
+def test_sort_puts_numbers_first_and_missing_last():
+    tabla = ColumnarTable.from_rows(FILAS)
+    x = tabla.columns.index("X")
+    assert tabla.sort_order(x) == [1, 2, 0, 3]
+    assert tabla.sort_order(x, descending=True) == [3, 0, 2, 1]
+
+    nombre = tabla.columns.index("Nombre")
+    assert [tabla.value(i, nombre) for i in tabla.sort_order(nombre)][:1] == ["CAJA"]
+
+
+def test_filter_is_case_insensitive_and_keeps_order():
+    tabla = ColumnarTable.from_rows(FILAS)
+    assert tabla.filter_rows("poste") == [0, 1, 3]
+    orden = tabla.sort_order(tabla.columns.index("X"))
+    assert tabla.filter_rows("POSTE", orden) == [1, 0, 3]
+    assert tabla.filter_rows("t1") == [2]
+    assert tabla.filter_rows("no existe") == []
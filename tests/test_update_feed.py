@@ -0,0 +1,49 @@
+import logging
+import threading
+
+from utilities.geometry import MAX_DETAILED_WARNINGS, sort_blocks_by_path
+from utilities.update_feed import UpdateFeed
+
+
+def test_progress_is_coalesced_to_last_value_per_sink():
+    feed = UpdateFeed()
+    barra_a, barra_b = [], []
+    publicar_a = feed.progress_to(barra_a.append)
+    for valor in range(0, 101):
+        publicar_a(valor)
+    feed.publish_progress(barra_b.append, 7)
+
+    lineas, descartadas, progreso = feed.drain()
+    assert lineas == [] and descartadas == 0
+    for sink, valor in progreso:
+        sink(valor)
+    assert barra_a == [100] and barra_b == [7]
+    assert feed.drain() == ([], 0, [])
+
+
+def test_log_lines_are_batched_in_a_bounded_buffer():
+    feed = UpdateFeed(max_pending_lines=100)
+
+    def escribir(hilo):
+        for i in range(500):
+            feed.publish_log(f"{hilo}:{i}")
+
+    hilos = [threading.Thread(target=escribir, args=(h,)) for h in range(4)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    lineas, descartadas, _ = feed.drain()
+    assert len(lineas) == 100
+    assert descartadas == 4 * 500 - 100
+
+
+def test_out_of_range_blocks_are_summarized(caplog):
+    bloques = [{"Handle": f"B{i}", "X": 1000.0 + i, "Y": 0.0} for i in range(50)]
+    with caplog.at_level(logging.WARNING, logger="utilities.geometry"):
+        sort_blocks_by_path(bloques, [(0.0, 0.0), (1.0, 0.0)], search_radius=1.0)
+
+    detalle = [r for r in caplog.records if "Handle:" in r.getMessage()]
+    assert len(detalle) == MAX_DETAILED_WARNINGS
+    assert any("30 bloques más" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,128 @@
+import copy
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utilities import geometry, vector_geometry
+from utilities.geometry import (
+    associate_data,
+    point_to_segment_projection,
+    sort_blocks_by_path,
+    split_segments_with_poles,
+)
+
+
+def _random_points(n, seed, span=200.0):
+    rng = random.Random(seed)
+    # Coordenadas en rejilla de 0.5 para forzar empates en distancia
+    return [
+        (round(rng.uniform(0, span) * 2) / 2, round(rng.uniform(0, span) * 2) / 2)
+        for _ in range(n)
+    ]
+
+
+def _blocks(points, prefix):
+    return [
+        {"Handle": f"{prefix}{i}", "X": x, "Y": y, "Attr_N": str(i)}
+        for i, (x, y) in enumerate(points)
+    ]
+
+
+def _both_modes(monkeypatch, func, *args, **kwargs):
+    """Ejecuta 'func' con la ruta escalar y con la vectorizada."""
+    monkeypatch.setattr(vector_geometry, "VECTORIZE_MIN_PAIRS", 10**12)
+    escalar = func(*copy.deepcopy(args), **kwargs)
+    monkeypatch.setattr(vector_geometry, "VECTORIZE_MIN_PAIRS", 1)
+    vectorizado = func(*copy.deepcopy(args), **kwargs)
+    return escalar, vectorizado
+
+
+@pytest.mark.parametrize("global_match", [False, True])
+def test_associate_data_vectorized_matches_scalar(monkeypatch, global_match):
+    bases = _blocks(_random_points(300, 1), "B")
+    datos = _blocks(_random_points(400, 2), "D")
+
+    escalar, vectorizado = _both_modes(
+        monkeypatch, associate_data, bases, datos, 3.0, global_match=global_match
+    )
+    assert escalar == vectorizado
+
+
+def test_sort_blocks_by_path_vectorized_matches_scalar(monkeypatch):
+    path = _random_points(150, 3)
+    blocks = _blocks(_random_points(250, 4), "P")
+
+    escalar, vectorizado = _both_modes(
+        monkeypatch, sort_blocks_by_path, blocks, path, 4.0
+    )
+    assert [b["Handle"] for b in escalar] == [b["Handle"] for b in vectorizado]
+
+
+def test_split_segments_vectorized_matches_scalar(monkeypatch):
+    rng = random.Random(8)
+    puntos = _random_points(120, 9)
+    segmentos = [(rng.choice(puntos), rng.choice(puntos)) for _ in range(150)]
+    # Postes sobre los segmentos (desplazados) y algunos sueltos
+    postes = []
+    for n in range(300):
+        (ax, ay), (bx, by) = rng.choice(segmentos)
+        t = rng.random()
+        postes.append(
+            {
+                "Handle": f"P{n}",
+                "X": ax + t * (bx - ax) + rng.uniform(-2, 2),
+                "Y": ay + t * (by - ay) + rng.uniform(-2, 2),
+            }
+        )
+
+    escalar, vectorizado = _both_modes(
+        monkeypatch, split_segments_with_poles, segmentos, postes, 1.5
+    )
+    redondeo = [
+        tuple((round(x, 4), round(y, 4)) for x, y in segmento) for segmento in escalar
+    ]
+    assert len(escalar) > len(segmentos)
+    assert redondeo == [
+        tuple((round(x, 4), round(y, 4)) for x, y in segmento)
+        for segmento in vectorizado
+    ]
+
+
+def test_projection_batch_matches_scalar():
+    rng = random.Random(5)
+    casos = [
+        tuple((rng.uniform(-10, 10), rng.uniform(-10, 10)) for _ in range(3))
+        for _ in range(200)
+    ]
+    casos.append(((1.0, 1.0), (2.0, 2.0), (2.0, 2.0)))  # segmento degenerado
+
+    p, a, b = (np.array([c[k] for c in casos]) for k in range(3))
+    proyecciones, distancias = vector_geometry.project_points_to_segments(p, a, b)
+
+    for n, (pp, aa, bb) in enumerate(casos):
+        proy, dist = point_to_segment_projection(pp, aa, bb)
+        assert round(dist, 4) == round(float(distancias[n]), 4)
+        assert round(proy[0], 4) == round(float(proyecciones[n][0]), 4)
+        assert round(proy[1], 4) == round(float(proyecciones[n][1]), 4)
+
+
+@pytest.mark.parametrize(
+    "origen", [(0.0, 0.0), (500_000.0, 9_000_000.0)], ids=["local", "utm"]
+)
+def test_pairs_within_radius_is_exhaustive(origen):
+    # En UTM, X e Y están en rangos muy distintos: cada eje se dimensiona aparte
+    a = np.array(_random_points(600, 6)) + origen
+    b = np.array(_random_points(500, 7)) + origen
+
+    ia, jb, d = vector_geometry.pairs_within_radius(a, b, 2.5)
+    obtenidos = set(zip(ia.tolist(), jb.tolist()))
+
+    esperados = {
+        (i, j)
+        for i in range(len(a))
+        for j in range(len(b))
+        if geometry.calculate_distance(a[i], b[j]) <= 2.5
+    }
+    assert obtenidos == esperados
@@ -1,12 +1,137 @@
-import win32com.client
-import pythoncom
 import logging
 
+try:
+    import win32com.client
+    import pythoncom
+except ImportError:  # Entornos sin pywin32 (Linux/CI): solo backends offline
+    win32com = None
+    pythoncom = None
+
+
+# EntityName -> interfaz de la biblioteca de tipos de AutoCAD (enlace temprano)
+EARLY_BOUND_INTERFACES = {
+    "AcDbBlockReference": "IAcadBlockReference",
+    "AcDbText": "IAcadText",
+    "AcDbMText": "IAcadMText",
+    "AcDbLine": "IAcadLine",
+    "AcDbPolyline": "IAcadLWPolyline",
+    "AcDb2dPolyline": "IAcad2DPolyline",
+    "AcDb3dPolyline": "IAcad3DPolyline",
+}
+
+
+class ComBackend:
+    """
+    Backend real: se engancha a una instancia activa de AutoCAD vía COM (pywin32).
+    """
+
+    name = "com"
+
+    def __init__(self):
+        # Se activa cuando el módulo makepy de AutoCAD está generado (gencache)
+        self.early_bound = False
+
+    def connect(self):
+        """Devuelve (app, doc) del AutoCAD activo. Lanza excepción si no hay."""
+        if win32com is None:
+            raise RuntimeError("pywin32 no está instalado en este entorno.")
+        # GetActiveObject lanza error si AutoCAD no está abierto
+        app = win32com.client.GetActiveObject("AutoCAD.Application")
+        app = self._early_bind(app)
+        return app, app.ActiveDocument
+
+    def _early_bind(self, app):
+        """
+        Genera (una sola vez, queda en el gencache de pywin32) las clases makepy
+        de la biblioteca de tipos de AutoCAD. Con ellas las propiedades se
+        invocan por DISPID conocido en lugar de resolver nombres en cada acceso.
+        """
+        try:
+            app = win32com.client.gencache.EnsureDispatch(app._oleobj_)
+            self.early_bound = True
+        except Exception as e:
+            self.early_bound = False
+            logging.getLogger("CADManager").warning(
+                f"Enlace temprano no disponible, se usa IDispatch dinámico: {e}"
+            )
+        return app
+
+    def bind_entity(self, obj, entity_name: str):
+        """Devuelve la entidad con la interfaz makepy de su tipo, si existe."""
+        interface = EARLY_BOUND_INTERFACES.get(entity_name)
+        if not self.early_bound or interface is None:
+            return obj
+        try:
+            return win32com.client.CastTo(obj, interface)
+        except Exception:
+            return obj
+
+    def late_bind(self, obj):
+        """
+        Con enlace temprano, HandleToObject, ObjectIdToObject y los eventos
+        devuelven objetos tipados como IAcadObject, sin EntityName, Name ni
+        InsertionPoint. Se devuelven con IDispatch dinámico para que cualquier
+        propiedad se resuelva por nombre (bind_entity puede tiparlos después).
+        """
+        try:
+            return win32com.client.dynamic.Dispatch(getattr(obj, "_oleobj_", obj))
+        except Exception:
+            return obj
+
+    def variant_point(self, x: float, y: float, z: float = 0.0):
+        return win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, (x, y, z))
+
+    def select_all(self, selection, codes: list, values: list) -> None:
+        """Ejecuta SelectionSet.Select en modo 'todo el dibujo' con un filtro DXF."""
+        filter_type = win32com.client.VARIANT(
+            pythoncom.VT_ARRAY | pythoncom.VT_I2, codes
+        )
+        filter_data = win32com.client.VARIANT(
+            pythoncom.VT_ARRAY | pythoncom.VT_VARIANT, values
+        )
+        # 5 = acSelectionSetAll; los puntos de la ventana no aplican
+        selection.Select(5, pythoncom.Empty, pythoncom.Empty, filter_type, filter_data)
+
+    def subscribe(self, document, sink):
+        """
+        Conecta 'sink' a los eventos ObjectAdded/ObjectModified/ObjectErased
+        del documento. Los eventos llegan al hilo que se suscribió mientras
+        este procese mensajes (el bucle de Qt o pump_events()).
+        """
+        backend = self
+
+        class _DocumentEvents:
+            def OnObjectAdded(self, obj):
+                sink.on_object_added(backend.late_bind(obj))
+
+            def OnObjectModified(self, obj):
+                sink.on_object_modified(backend.late_bind(obj))
+
+            def OnObjectErased(self, object_id):
+                sink.on_object_erased(object_id)
+
+        return win32com.client.WithEvents(document, _DocumentEvents)
+
+    def pump_events(self) -> None:
+        if pythoncom is not None:
+            pythoncom.PumpWaitingMessages()
+
+    def init_thread(self) -> None:
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+
+    def release_thread(self) -> None:
+        if pythoncom is not None:
+            pythoncom.CoUninitialize()
+
 
 class CADManager:
     """
-    Gestor Singleton para la conexión COM con AutoCAD.
+    Gestor Singleton para la conexión con AutoCAD.
     Reemplaza totalmente a pyautocad eliminando dependencias externas.
+
+    El acceso real al dibujo se delega en un backend intercambiable
+    (ComBackend por defecto, OfflineBackend para ejecuciones sin AutoCAD).
     """
 
     _instance = None
@@ -17,15 +142,22 @@ class CADManager:
             cls._instance.app = None
             cls._instance.doc = None
             cls._instance.msp = None  # ModelSpace
+            cls._instance.backend = ComBackend()
             cls._instance.logger = logging.getLogger("CADManager")
         return cls._instance
 
+    def set_backend(self, backend) -> None:
+        """Cambia el backend activo y descarta la conexión anterior."""
+        self.backend = backend
+        self.app = None
+        self.doc = None
+        self.msp = None
+        self.logger.info(f"Backend CAD activo: {backend.name}")
+
     def connect(self) -> bool:
-        """Intenta conectar a una instancia activa de AutoCAD."""
+        """Intenta conectar al documento activo del backend."""
         try:
-            # GetActiveObject lanza error si AutoCAD no está abierto
-            self.app = win32com.client.GetActiveObject("AutoCAD.Application")
-            self.doc = self.app.ActiveDocument
+            self.app, self.doc = self.backend.connect()
             self.msp = self.doc.ModelSpace
             self.logger.info(f"Conectado exitosamente a: {self.doc.Name}")
             return True
@@ -40,8 +172,43 @@ class CADManager:
         return self.doc is not None
 
     def variant_point(self, x: float, y: float, z: float = 0.0):
-        """Convierte coordenadas Python a VARIANT (array de doubles) para AutoCAD."""
-        return win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, (x, y, z))
+        """Convierte coordenadas Python al tipo de punto que espera el backend."""
+        return self.backend.variant_point(x, y, z)
+
+    def bind_entity(self, obj, entity_name: str):
+        """Prepara una entidad para leer sus propiedades (enlace temprano en COM)."""
+        return self.backend.bind_entity(obj, entity_name)
+
+    def late_bind(self, obj):
+        """
+        Prepara un objeto obtenido fuera del recorrido del ModelSpace
+        (HandleToObject, ObjectIdToObject) para leer cualquier propiedad.
+        """
+        return self.backend.late_bind(obj)
+
+    def select_all(self, selection, codes: list, values: list) -> None:
+        """Llena un SelectionSet con las entidades que cumplen el filtro DXF."""
+        self.backend.select_all(selection, codes, values)
+
+    def subscribe(self, sink):
+        """
+        Suscribe 'sink' (on_object_added/modified/erased) a los eventos del
+        documento activo. Devuelve un objeto con close(). Lanza excepción si
+        el backend no ofrece eventos.
+        """
+        return self.backend.subscribe(self.doc, sink)
+
+    def pump_events(self) -> None:
+        """Entrega los eventos pendientes en el hilo actual."""
+        self.backend.pump_events()
+
+    def init_thread(self) -> None:
+        """Prepara el hilo actual para usar el backend (CoInitialize en COM)."""
+        self.backend.init_thread()
+
+    def release_thread(self) -> None:
+        """Libera los recursos del hilo actual (CoUninitialize en COM)."""
+        self.backend.release_thread()
 
 
 # Instancia global lista para importar
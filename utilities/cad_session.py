@@ -0,0 +1,296 @@
+"""
+Sesión CAD: un único hilo STA dueño de la conexión con AutoCAD.
+
+Los objetos COM de AutoCAD pertenecen al apartamento (STA) del hilo que los
+obtuvo; usarlos desde otro hilo sin serializar es inseguro. En lugar de que
+cada trabajo inicialice COM, reconecte (GetActiveObject) y espere, todas las
+operaciones sobre el dibujo se encolan aquí y se ejecutan de a una en un hilo
+de larga vida que conecta una sola vez.
+
+La cola es también el planificador de trabajos de la interfaz:
+    - acotada (max_pending): si se llena, schedule() lanza queue.Full;
+    - con prioridades: un listado de capas no espera detrás de una numeración
+      encolada (el trabajo en curso no se interrumpe);
+    - con fusión: un trabajo con la misma 'key' que otro aún pendiente no se
+      encola de nuevo, se devuelve el pendiente;
+    - con tiempos por trabajo (espera y ejecución) en el log y en 'history'.
+
+Mientras no hay trabajo, el hilo entrega los mensajes pendientes (eventos del
+documento para el espejo en vivo).
+"""
+
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Optional
+
+from .cad_manager import CADManager, cad
+from .cancellation import CancelToken
+
+logger = logging.getLogger(__name__)
+
+# Segundos de espera de la cola entre entregas de mensajes en reposo
+IDLE_INTERVAL = 0.05
+
+# Trabajos pendientes como máximo (el que está en ejecución no cuenta)
+MAX_PENDING = 32
+
+# Prioridades: menor valor = antes
+PRIORITY_INTERACTIVE = 0  # Respuestas inmediatas (conectar, listar/crear capas)
+PRIORITY_NORMAL = 10  # Extracciones
+PRIORITY_BATCH = 20  # Procesos largos que modifican el dibujo (numeración)
+
+
+class Job:
+    """Operación encolada en la sesión CAD, con su Future y sus tiempos."""
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        args: tuple = (),
+        kwargs: Optional[dict] = None,
+        priority: int = PRIORITY_NORMAL,
+        key: Optional[Hashable] = None,
+        token: Optional[CancelToken] = None,
+    ):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.priority = priority
+        self.key = key
+        self.token = token or CancelToken()
+        self.future = Future()
+        self.submitted = time.perf_counter()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def wait_time(self) -> float:
+        return (self.started or time.perf_counter()) - self.submitted
+
+    @property
+    def run_time(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        return (self.finished or time.perf_counter()) - self.started
+
+    def timing(self) -> dict:
+        return {
+            "Trabajo": self.name,
+            "Prioridad": self.priority,
+            "Espera_s": round(self.wait_time, 4),
+            "Ejecucion_s": round(self.run_time or 0.0, 4),
+            "Estado": self._state(),
+        }
+
+    def cancel(self) -> None:
+        """Si aún espera en la cola se descarta; si está en curso se avisa por el token."""
+        if not self.future.cancel():
+            self.token.cancel()
+
+    def _state(self) -> str:
+        if self.future.cancelled() or (self.token.cancelled and self.future.done()):
+            return "cancelado"
+        if not self.future.done():
+            return "pendiente" if self.started is None else "en curso"
+        return "error" if self.future.exception() is not None else "ok"
+
+    def run(self) -> None:
+        if not self.future.set_running_or_notify_cancel():
+            return  # Cancelado mientras esperaba en la cola
+        self.started = time.perf_counter()
+        try:
+            self.future.set_result(self.fn(*self.args, **self.kwargs))
+        except BaseException as e:
+            self.future.set_exception(e)
+        finally:
+            self.finished = time.perf_counter()
+
+
+class CADSession:
+    """
+    Hilo de larga vida que ejecuta operaciones CAD por prioridad y, dentro de
+    cada prioridad, en orden de llegada.
+
+    Uso:
+        future = cad_session.submit(layers.ensure_layer, "RED", 3)
+        ok = future.result()
+        nombre = cad_session.call(lambda: cad.doc.Name)
+        job = cad_session.schedule(
+            "listar capas", listar, priority=PRIORITY_INTERACTIVE, key="capas:listar"
+        )
+    """
+
+    def __init__(
+        self,
+        manager: CADManager = cad,
+        idle_interval: float = IDLE_INTERVAL,
+        max_pending: int = MAX_PENDING,
+    ):
+        self.manager = manager
+        self.idle_interval = idle_interval
+        self.max_pending = max_pending
+        self.history: deque = deque(maxlen=100)  # job.timing() de los terminados
+        self._heap: list = []
+        self._pending_by_key: Dict[Hashable, Job] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: threading.Thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_session_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def start(self) -> None:
+        """Arranca el hilo si aún no está en marcha (se llama solo al encolar)."""
+        with self._cond:
+            if self.running:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._loop, name="CADSession", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """Termina el hilo después de los trabajos ya encolados."""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify()
+        thread.join(timeout)
+        with self._cond:
+            if self._thread is thread and not thread.is_alive():
+                self._thread = None
+
+    def schedule(
+        self,
+        name: str,
+        fn: Callable,
+        *args,
+        priority: int = PRIORITY_NORMAL,
+        key: Optional[Hashable] = None,
+        token: Optional[CancelToken] = None,
+        **kwargs,
+    ) -> Job:
+        """
+        Encola un trabajo y lo devuelve (su resultado en job.future).
+
+        Raises:
+            queue.Full: Si ya hay 'max_pending' trabajos esperando.
+        """
+        job = Job(name, fn, args, kwargs, priority, key, token)
+        if self.in_session_thread():
+            # Un trabajo que encola otro no puede esperarlo en cola: se ejecuta ya
+            job.run()
+            return job
+
+        self.start()
+        with self._cond:
+            pending = self._pending_by_key.get(key) if key is not None else None
+            if pending is not None and not pending.future.cancelled():
+                logger.info(f"Trabajo '{name}' fusionado con uno pendiente.")
+                return pending
+            if len(self._heap) >= self.max_pending:
+                raise queue.Full(
+                    f"Hay {len(self._heap)} trabajos CAD pendientes; "
+                    f"'{name}' no se encoló."
+                )
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            if key is not None:
+                self._pending_by_key[key] = job
+            self._cond.notify()
+        return job
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Encola fn(*args, **kwargs) con prioridad normal y devuelve su Future."""
+        name = getattr(fn, "__name__", "operación")
+        return self.schedule(name, fn, *args, **kwargs).future
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Ejecuta fn en el hilo de la sesión (antes que los lotes) y espera."""
+        name = getattr(fn, "__name__", "operación")
+        job = self.schedule(name, fn, *args, priority=PRIORITY_INTERACTIVE, **kwargs)
+        return job.future.result()
+
+    def ensure_connected(self) -> bool:
+        """
+        Conecta solo si la sesión aún no tiene documento. Espera el resultado:
+        desde la interfaz, encolar connect_if_needed con SessionCall.
+        """
+        if self.manager.is_connected:
+            return True
+        return self.call(self.connect_if_needed)
+
+    def connect_if_needed(self) -> bool:
+        """Cuerpo de ensure_connected; corre en el hilo de la sesión."""
+        if self.manager.is_connected:
+            return True
+        return self.manager.connect()
+
+    def _next_job(self) -> Optional[Job]:
+        """Espera el próximo trabajo; None si toca entregar mensajes o salir."""
+        with self._cond:
+            if not self._heap and not self._stopping:
+                self._cond.wait(self.idle_interval)
+            if not self._heap:
+                return None
+            _, _, job = heapq.heappop(self._heap)
+            if job.key is not None and self._pending_by_key.get(job.key) is job:
+                del self._pending_by_key[job.key]
+            return job
+
+    def _loop(self) -> None:
+        self.manager.init_thread()
+        logger.info("Sesión CAD iniciada.")
+        try:
+            while True:
+                job = self._next_job()
+                if job is None:
+                    if self._stopping:
+                        break
+                    self._pump()
+                    continue
+                job.run()
+                self._record(job)
+                self._pump()
+        finally:
+            self.manager.release_thread()
+            logger.info("Sesión CAD finalizada.")
+
+    def _record(self, job: Job) -> None:
+        timing = job.timing()
+        self.history.append(timing)
+        if job.started is not None:
+            logger.info(
+                f"Trabajo '{job.name}' ({timing['Estado']}): "
+                f"espera {timing['Espera_s']:.2f}s, "
+                f"ejecución {timing['Ejecucion_s']:.2f}s."
+            )
+
+    def _pump(self) -> None:
+        try:
+            self.manager.pump_events()
+        except Exception as e:
+            logger.debug(f"Sesión CAD: fallo al entregar mensajes: {e}")
+
+
+# Instancia global lista para importar
+cad_session = CADSession()
@@ -0,0 +1,37 @@
+"""
+Cancelación cooperativa de trabajos largos.
+
+El hilo de la interfaz marca el token; los bucles de extracción e inserción
+lo consultan en cada entidad y cortan con OperationCancelled en un punto
+seguro (nunca a mitad de una inserción).
+"""
+
+import threading
+from typing import Optional
+
+
+class OperationCancelled(Exception):
+    """El usuario canceló el trabajo en curso."""
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        """Lanza OperationCancelled si se pidió cancelar."""
+        if self._event.is_set():
+            raise OperationCancelled("Operación cancelada por el usuario.")
+
+
+def check_cancelled(token: Optional[CancelToken]) -> None:
+    """Igual que token.check(), admitiendo token None (no cancelable)."""
+    if token is not None and token.cancelled:
+        raise OperationCancelled("Operación cancelada por el usuario.")
@@ -28,6 +28,8 @@ class AppSettings:
         self.ATRIBUTO_ETIQUETA = "000"
         self.ESCALA_BLOQUE = 2.0
         self.PERFILES_NUMERACION = {}  # Se inicializa vacío para cargar desde JSON
+        self.ESPEJO_EN_VIVO = False  # Mantener el dibujo en memoria vía eventos
+        self.ESPEJO_INTERVALO_MS = 1000  # Entrega de eventos / sondeo del espejo
         self.LAYER_COLORS = {
             "1": "Rojo",
             "2": "Amarillo",
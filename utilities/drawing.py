@@ -1,9 +1,13 @@
 import logging
+from typing import List, Optional
 from .cad_manager import cad
+from .cancellation import CancelToken, OperationCancelled
+from .instrumentation import add_items, counted, traced
 
 logger = logging.getLogger(__name__)
 
 
+@traced("insert_block_with_attributes")
 def insert_block_with_attributes(
     x: float,
     y: float,
@@ -32,8 +36,8 @@ def insert_block_with_attributes(
         # Convertir punto a variante COM
         insertion_point = cad.variant_point(x, y, 0.0)
 
-        # Insertar el bloque
-        block_ref = cad.msp.InsertBlock(
+        # Insertar el bloque (las llamadas COM se cuentan en la envoltura)
+        block_ref = counted(cad.msp).InsertBlock(
             insertion_point, block_name, scale, scale, scale, rotation
         )
         block_ref.Layer = layer
@@ -54,3 +58,154 @@ def insert_block_with_attributes(
     except Exception as e:
         logger.error(f"Error insertando bloque '{block_name}' en ({x}, {y}): {e}")
         return False
+
+
+def _activate_layer(doc, layer: str):
+    """
+    Activa la capa de destino para que las inserciones nazcan en ella y no haya
+    que asignar `Layer` entidad por entidad. Devuelve la capa previa (o None si
+    no se pudo activar).
+    """
+    try:
+        previous = doc.ActiveLayer
+        doc.ActiveLayer = doc.Layers.Item(layer)
+        return previous
+    except Exception as e:
+        logger.debug(f"No se pudo activar la capa '{layer}': {e}")
+        return None
+
+
+@traced("insert_blocks_bulk")
+def insert_blocks_bulk(
+    placements: List[dict],
+    block_name: str,
+    layer: str,
+    scale: float = 1.0,
+    rotation: float = 0.0,
+    number_tag: Optional[str] = None,
+    start_number: int = 1,
+    progress_callback=None,
+    cancel_token: Optional[CancelToken] = None,
+    on_inserted=None,
+) -> List[bool]:
+    """
+    Inserta muchos bloques en lote y devuelve un vector de éxito por elemento.
+
+    A diferencia de llamar a insert_block_with_attributes por cada bloque:
+      - La capa de destino se activa una vez en lugar de asignarse a cada bloque.
+      - Las etiquetas de atributo del bloque se leen una sola vez y se cachean.
+      - No se llama a `Update()` por atributo; se hace un único Regen al final.
+
+    Args:
+        placements: [{"x": float, "y": float, "attributes": {TAG: valor}}, ...]
+        number_tag: Si se indica, cada inserción exitosa recibe en ese atributo un
+                    número correlativo desde start_number. Un fallo no consume
+                    número (el siguiente bloque lo recibe).
+        progress_callback: Función opcional que recibe el porcentaje (0-100).
+        cancel_token: Se consulta antes de cada inserción. Al cancelar se
+                      restaura la capa activa, se regenera y se lanza
+                      OperationCancelled; lo insertado hasta ahí queda en el dibujo.
+        on_inserted: Función opcional on_inserted(i, block_ref, numero) llamada
+                     tras cada inserción completa (p. ej. para una bitácora).
+    """
+    results = [False] * len(placements)
+    if not cad.is_connected:
+        logger.error("AutoCAD no está conectado.")
+        return results
+
+    # Las llamadas COM se cuentan en la envoltura de msp / doc
+    msp, doc = counted(cad.msp), counted(cad.doc)
+    previous_layer = _activate_layer(doc, layer)
+    tag_positions = None  # {TAG_EN_MAYÚSCULAS: posición en GetAttributes()}
+    next_number = start_number
+    total = len(placements)
+    cancelled = False
+    add_items(total)
+
+    try:
+        for i, placement in enumerate(placements):
+            if cancel_token is not None and cancel_token.cancelled:
+                cancelled = True
+                break
+            if progress_callback and i % 50 == 0:
+                progress_callback(int((i / total) * 100))
+
+            x, y = placement["x"], placement["y"]
+            block_ref = None
+            try:
+                block_ref = msp.InsertBlock(
+                    cad.variant_point(x, y, 0.0),
+                    block_name,
+                    scale,
+                    scale,
+                    scale,
+                    rotation,
+                )
+                if previous_layer is None:
+                    block_ref.Layer = layer
+
+                values = {
+                    k.upper(): v for k, v in (placement.get("attributes") or {}).items()
+                }
+                if number_tag:
+                    values[number_tag.upper()] = next_number
+
+                if values:
+                    attributes = (
+                        block_ref.GetAttributes() if block_ref.HasAttributes else ()
+                    )
+                    if tag_positions is None:
+                        tag_positions = {
+                            att.TagString.upper(): pos
+                            for pos, att in enumerate(attributes)
+                        }
+                    for tag, value in values.items():
+                        pos = tag_positions.get(tag)
+                        if pos is not None and pos < len(attributes):
+                            attributes[pos].TextString = str(value)
+
+                number = next_number if number_tag else None
+                results[i] = True
+                if number_tag:
+                    next_number += 1
+
+            except Exception as e:
+                logger.error(
+                    f"Error insertando bloque '{block_name}' en ({x}, {y}): {e}"
+                )
+                # No dejamos bloques sin numerar en el dibujo
+                if block_ref is not None:
+                    try:
+                        block_ref.Delete()
+                    except Exception:
+                        pass
+
+            # Fuera del try: si la bitácora falla, el lote se detiene
+            if results[i] and on_inserted is not None:
+                on_inserted(i, block_ref, number)
+    finally:
+        if previous_layer is not None:
+            try:
+                doc.ActiveLayer = previous_layer
+            except Exception:
+                pass
+
+    # Un único regenerado en lugar de un Update() por atributo
+    try:
+        doc.Regen(1)  # acAllViewports
+    except Exception as e:
+        logger.warning(f"No se pudo regenerar el dibujo: {e}")
+
+    if cancelled:
+        logger.info(
+            f"Inserción en lote cancelada: {sum(results)}/{total} bloques '{block_name}'."
+        )
+        raise OperationCancelled(
+            f"Inserción cancelada tras {sum(results)} de {total} bloques."
+        )
+
+    if progress_callback:
+        progress_callback(100)
+
+    logger.info(f"Inserción en lote: {sum(results)}/{total} bloques '{block_name}'.")
+    return results
@@ -0,0 +1,185 @@
+"""
+Capa de lectura de entidades: cada propiedad se pide una sola vez por objeto.
+
+Cada acceso a una propiedad de un objeto COM es un viaje de ida y vuelta a
+AutoCAD (y los puntos se serializan como SAFEARRAY). El lector sigue un
+"plan de propiedades" por tipo de entidad que enumera exactamente qué leer,
+usa el enlace temprano (makepy) que ofrezca el backend y cuenta las llamadas
+para poder medir el ahorro.
+"""
+
+import logging
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .cad_manager import cad
+
+logger = logging.getLogger(__name__)
+
+# Propiedades a leer por tipo de entidad (EntityName de ObjectARX)
+PROPERTY_PLANS: Dict[str, Tuple[str, ...]] = {
+    "AcDbBlockReference": (
+        "Handle",
+        "Layer",
+        "Name",
+        "InsertionPoint",
+        "Rotation",
+        "HasAttributes",
+    ),
+    "AcDbText": ("Handle", "Layer", "InsertionPoint", "TextString"),
+    "AcDbMText": ("Handle", "Layer", "InsertionPoint", "TextString"),
+    "AcDbLine": ("Handle", "Layer", "StartPoint", "EndPoint"),
+    "AcDbPolyline": ("Handle", "Layer", "Coordinates"),
+    "AcDb2dPolyline": ("Handle", "Layer", "Coordinates"),
+    "AcDb3dPolyline": ("Handle", "Layer", "Coordinates"),
+}
+
+# Plan para entidades que solo aportan al conteo de uso por capa
+LAYER_ONLY_PLAN = ("Layer",)
+
+# Los bloques se leen en dos etapas: primero lo barato para filtrar y solo
+# para los que pasan el filtro, la geometría y los atributos
+BLOCK_KEY_PLAN = ("Handle", "Layer", "Name")
+BLOCK_DETAIL_PLAN = ("InsertionPoint", "Rotation")
+
+# Propiedades que algunos objetos no exponen (p. ej. EffectiveName en bloques simples)
+OPTIONAL_PROPERTIES = frozenset({"EffectiveName"})
+
+
+class EntityReader:
+    """
+    Lee entidades siguiendo PROPERTY_PLANS y lleva la cuenta de llamadas COM
+    (una por propiedad leída, incluida EntityName y cada atributo).
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.entities = 0
+        self.calls_by_type: Dict[str, int] = {}
+
+    def _count(self, entity_name: str, n: int = 1) -> None:
+        self.calls += n
+        self.calls_by_type[entity_name] = self.calls_by_type.get(entity_name, 0) + n
+
+    def entity_name(self, obj) -> str:
+        """Primera llamada sobre cada objeto: decide qué plan aplicar."""
+        self.entities += 1
+        self.calls += 1
+        return obj.EntityName
+
+    def read(
+        self,
+        obj,
+        entity_name: str,
+        plan: Optional[Tuple[str, ...]] = None,
+        bind: bool = True,
+    ) -> Tuple[object, dict]:
+        """
+        Lee una vez cada propiedad del plan (por defecto el de su tipo).
+
+        Args:
+            bind: False si 'obj' ya es el objeto enlazado de una lectura anterior.
+
+        Returns:
+            (objeto enlazado, {propiedad: valor}). El objeto enlazado sirve para
+            lecturas posteriores (p. ej. attributes()) sin volver a enlazarlo.
+        """
+        bound = cad.bind_entity(obj, entity_name) if bind else obj
+        plan = plan if plan is not None else PROPERTY_PLANS.get(entity_name, ())
+        values = {}
+        for prop in plan:
+            self._count(entity_name)
+            if prop in OPTIONAL_PROPERTIES:
+                try:
+                    values[prop] = getattr(bound, prop)
+                except Exception:
+                    pass
+            else:
+                values[prop] = getattr(bound, prop)
+        return bound, values
+
+    def attributes(
+        self,
+        bound,
+        entity_name: str = "AcDbBlockReference",
+        tags: Optional[FrozenSet[str]] = None,
+    ) -> List[tuple]:
+        """
+        Devuelve [(TagString, TextString), ...] de una referencia de bloque.
+        Con 'tags' (en mayúsculas) solo se lee el TextString de esas etiquetas.
+        """
+        attribs = bound.GetAttributes()
+        self._count(entity_name, 1 + len(attribs))
+        result = []
+        for attrib in attribs:
+            tag = attrib.TagString
+            if tags is None or tag.upper() in tags:
+                self._count(entity_name)
+                result.append((tag, attrib.TextString))
+        return result
+
+    def per_entity(self) -> float:
+        return self.calls / self.entities if self.entities else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.calls} llamadas COM en {self.entities} entidades "
+            f"({self.per_entity():.1f} por entidad)"
+        )
+
+
+class BlockFilter:
+    """
+    Filtro compilado para referencias de bloque, aplicado mientras se leen:
+    capa y nombre se comprueban con las propiedades baratas y solo los bloques
+    que pasan leen geometría, EffectiveName (si son anónimos) y atributos.
+
+    Args:
+        names: Nombres efectivos aceptados (None = todos, vacío = ninguno).
+        layers: Capas aceptadas (None = todas, vacío = ninguna).
+        attribute_tags: Etiquetas de atributo a leer (None = todas, vacío = ninguna).
+    """
+
+    def __init__(
+        self,
+        names: Optional[Iterable[str]] = None,
+        layers: Optional[Iterable[str]] = None,
+        attribute_tags: Optional[Iterable[str]] = None,
+    ):
+        self.names = frozenset(n.upper() for n in names) if names is not None else None
+        self.layers = (
+            frozenset(l.upper() for l in layers) if layers is not None else None
+        )
+        self.attribute_tags = (
+            frozenset(t.upper() for t in attribute_tags)
+            if attribute_tags is not None
+            else None
+        )
+
+    def accepts_layer(self, layer: str) -> bool:
+        return self.layers is None or layer.upper() in self.layers
+
+    def accepts_name(self, name: str) -> bool:
+        return self.names is None or name.upper() in self.names
+
+    def wants_attributes(self) -> bool:
+        return self.attribute_tags is None or bool(self.attribute_tags)
+
+    def apply(self, block: dict) -> Optional[dict]:
+        """Versión en memoria: filtra y proyecta un registro ya extraído."""
+        if not (
+            self.accepts_layer(block["Capa"]) and self.accepts_name(block["Nombre"])
+        ):
+            return None
+        if self.attribute_tags is None:
+            return dict(block)
+        return {
+            k: v
+            for k, v in block.items()
+            if not k.startswith("Attr_") or k[5:].upper() in self.attribute_tags
+        }
+
+    def signature(self) -> str:
+        def fmt(values):
+            return None if values is None else sorted(values)
+
+        return f"{fmt(self.names)}|{fmt(self.layers)}|{fmt(self.attribute_tags)}"
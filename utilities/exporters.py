@@ -0,0 +1,280 @@
+"""
+Exportación por bloques de resultados tabulares (extractor y reportes).
+
+Las filas se escriben en tandas de CHUNK_ROWS sin armar el archivo completo en
+memoria, así que exportar se puede hacer fuera del hilo de la interfaz y
+cancelar entre tandas. Formatos:
+
+    csv      Texto, siempre disponible.
+    parquet  Columnar (requiere pyarrow).
+    arrow    Arrow IPC / Feather v2 (requiere pyarrow).
+    colz     Columnar propio de respaldo: JSON Lines comprimido con gzip, una
+             línea de cabecera y luego una línea por tanda con sus columnas.
+
+El reporte de numeración se escribe fila a fila mientras se insertan los
+bloques (ReportWriter), en vez de acumular una copia de cada poste.
+"""
+
+import csv
+import gzip
+import json
+import logging
+import os
+from numbers import Number
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cancellation import CancelToken, check_cancelled
+from .table_data import ColumnarTable
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depende del entorno
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# Filas por tanda de escritura
+CHUNK_ROWS = 5000
+
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+FORMAT_ARROW = "arrow"
+FORMAT_COLZ = "colz"
+
+_EXTENSIONS = {
+    ".csv": FORMAT_CSV,
+    ".parquet": FORMAT_PARQUET,
+    ".arrow": FORMAT_ARROW,
+    ".feather": FORMAT_ARROW,
+    ".colz": FORMAT_COLZ,
+}
+
+# Se incrementa si cambia el formato colz
+COLZ_FORMAT = 1
+
+# Tipos de columna para los formatos columnares
+TYPE_INT = "int"
+TYPE_FLOAT = "float"
+TYPE_BOOL = "bool"
+TYPE_STR = "str"
+
+
+def available_formats() -> List[str]:
+    """Formatos que se pueden escribir en este entorno."""
+    formats = [FORMAT_CSV]
+    if pa is not None:
+        formats += [FORMAT_PARQUET, FORMAT_ARROW]
+    formats.append(FORMAT_COLZ)
+    return formats
+
+
+def format_for_path(path: str) -> str:
+    """Formato según la extensión del archivo (CSV si no se reconoce)."""
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), FORMAT_CSV)
+
+
+def infer_column_type(values: Iterable) -> str:
+    """
+    Tipo de una columna en una pasada: bool, int o float si todos los valores
+    presentes lo son (enteros y reales mezclados dan float); si no, str.
+    """
+    kind = None
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            current = TYPE_BOOL
+        elif isinstance(value, int):
+            current = TYPE_INT
+        elif isinstance(value, Number):
+            current = TYPE_FLOAT
+        else:
+            return TYPE_STR
+        if kind is None or kind == current:
+            kind = current
+        elif {kind, current} == {TYPE_INT, TYPE_FLOAT}:
+            kind = TYPE_FLOAT
+        else:
+            return TYPE_STR
+    return kind or TYPE_STR
+
+
+def _column_converter(kind: str) -> Callable:
+    if kind == TYPE_FLOAT:
+        return lambda v: None if v is None else float(v)
+    if kind == TYPE_STR:
+        return lambda v: None if v is None else str(v)
+    return lambda v: v
+
+
+def _chunks(table: ColumnarTable, chunk_rows: int) -> Iterator[Tuple[int, int]]:
+    for start in range(0, len(table), chunk_rows):
+        yield start, min(start + chunk_rows, len(table))
+
+
+def _report(progress_callback, done: int, total: int) -> None:
+    if progress_callback and total:
+        progress_callback(int(done * 100 / total))
+
+
+def _write_csv(path, table, chunk_rows, progress_callback, cancel_token) -> None:
+    with open(path, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(table.columns)
+        for start, end in _chunks(table, chunk_rows):
+            check_cancelled(cancel_token)
+            # csv escribe None (celda vacía) como ""
+            writer.writerows(table.iter_rows(range(start, end)))
+            _report(progress_callback, end, len(table))
+
+
+def _arrow_schema(table: ColumnarTable, kinds: List[str]):
+    types = {
+        TYPE_INT: pa.int64(),
+        TYPE_FLOAT: pa.float64(),
+        TYPE_BOOL: pa.bool_(),
+        TYPE_STR: pa.string(),
+    }
+    return pa.schema([(name, types[k]) for name, k in zip(table.columns, kinds)])
+
+
+def _write_arrow(path, fmt, table, chunk_rows, progress_callback, cancel_token):
+    kinds = [infer_column_type(table.column(name)) for name in table.columns]
+    converters = [_column_converter(k) for k in kinds]
+    schema = _arrow_schema(table, kinds)
+    if fmt == FORMAT_PARQUET:
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+
+    try:
+        for start, end in _chunks(table, chunk_rows):
+            check_cancelled(cancel_token)
+            arrays = [
+                pa.array(
+                    [conv(v) for v in table.column(name)[start:end]], type=field.type
+                )
+                for name, conv, field in zip(table.columns, converters, schema)
+            ]
+            batch = pa.record_batch(arrays, schema=schema)
+            if fmt == FORMAT_PARQUET:
+                writer.write_batch(batch)
+            else:
+                writer.write(batch)
+            _report(progress_callback, end, len(table))
+    finally:
+        writer.close()
+
+
+def _write_colz(path, table, chunk_rows, progress_callback, cancel_token) -> None:
+    kinds = [infer_column_type(table.column(name)) for name in table.columns]
+    converters = [_column_converter(k) for k in kinds]
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        header = {
+            "formato": COLZ_FORMAT,
+            "columnas": table.columns,
+            "tipos": kinds,
+            "filas": len(table),
+        }
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for start, end in _chunks(table, chunk_rows):
+            check_cancelled(cancel_token)
+            columns = [
+                [conv(v) for v in table.column(name)[start:end]]
+                for name, conv in zip(table.columns, converters)
+            ]
+            f.write(json.dumps(columns, ensure_ascii=False) + "\n")
+            _report(progress_callback, end, len(table))
+
+
+def export_table(
+    table: ColumnarTable,
+    path: str,
+    fmt: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    progress_callback=None,
+    cancel_token: Optional[CancelToken] = None,
+) -> int:
+    """
+    Escribe la tabla en 'path' por tandas y devuelve las filas escritas.
+    Sin 'fmt', el formato sale de la extensión. Si se cancela, el archivo a
+    medio escribir se borra y se relanza OperationCancelled.
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt not in available_formats():
+        raise ValueError(f"Formato de exportación no disponible: {fmt}")
+
+    try:
+        if fmt == FORMAT_CSV:
+            _write_csv(path, table, chunk_rows, progress_callback, cancel_token)
+        elif fmt == FORMAT_COLZ:
+            _write_colz(path, table, chunk_rows, progress_callback, cancel_token)
+        else:
+            _write_arrow(path, fmt, table, chunk_rows, progress_callback, cancel_token)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    logger.info(f"Exportadas {len(table)} filas ({fmt}) a {path}.")
+    return len(table)
+
+
+def read_colz(path: str) -> ColumnarTable:
+    """Lee un archivo colz completo (para verificarlo o convertirlo)."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("formato") != COLZ_FORMAT:
+            raise ValueError(f"Formato colz no soportado en {path}.")
+        data = [[] for _ in header["columnas"]]
+        for line in f:
+            for column, values in zip(data, json.loads(line)):
+                column.extend(values)
+    return ColumnarTable(header["columnas"], data, header["filas"])
+
+
+class ReportWriter:
+    """
+    CSV que se escribe a medida que llegan las filas. Las columnas se fijan al
+    abrir (p. ej. con discover_columns sobre el plan completo) y cada fila se
+    alinea con ellas; las claves que no están en 'columns' se ignoran.
+
+    Uso:
+        with ReportWriter(ruta, columnas) as reporte:
+            reporte.write(poste, {"Número Asignado": 3})
+    """
+
+    def __init__(self, path: str, columns: List[str], flush_every: int = 100):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.path = path
+        self.columns = columns
+        self.rows_written = 0
+        self._flush_every = flush_every
+        self._file = open(path, mode="w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, row: dict, extra: Optional[Dict] = None) -> None:
+        if extra:
+            self._writer.writerow(
+                [extra[c] if c in extra else row.get(c) for c in self.columns]
+            )
+        else:
+            self._writer.writerow([row.get(c) for c in self.columns])
+        self.rows_written += 1
+        if self.rows_written % self._flush_every == 0:
+            self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,58 +1,43 @@
 import math
 import logging
 from .cad_manager import cad
+from .snapshot import DrawingSnapshot, take_snapshot, KIND_POLYLINES
+from .spatial import GridIndex
+from . import vector_geometry
+from .instrumentation import add_items, traced
 
 logger = logging.getLogger(__name__)
 
+# Bloques fuera de alcance que se detallan como advertencia (el resto en DEBUG)
+MAX_DETAILED_WARNINGS = 20
 
-def get_polyline_points(layer_name: str) -> list:
+
+def get_polyline_points(layer_name: str, snapshot: DrawingSnapshot = None) -> list:
     """
-    Extrae los vértices de una polilínea en una capa específica usando win32com puro.
+    Extrae los vértices de la primera polilínea encontrada en una capa específica.
+    Si se proporciona 'snapshot', la busca en ella sin volver a leer el dibujo.
     Devuelve una lista de tuplas (x, y).
     """
-    if not cad.is_connected:
-        logger.error("AutoCAD no está conectado.")
-        return []
+    if snapshot is None:
+        if not cad.is_connected:
+            logger.error("AutoCAD no está conectado.")
+            return []
+        snapshot = take_snapshot(kinds=(KIND_POLYLINES,))
+    else:
+        snapshot.require(KIND_POLYLINES)
 
-    path_points = []
     logger.info(f"Buscando polilínea de ruta en la capa '{layer_name}'...")
 
-    try:
-        found_valid = False
-        total_objects = cad.msp.Count
-
-        for i in range(total_objects):
-            obj = cad.msp.Item(i)
-            if (
-                obj.EntityName in ["AcDbPolyline", "AcDb2dPolyline", "AcDb3dPolyline"]
-                and obj.Layer.upper() == layer_name.upper()
-            ):
-                coords = obj.Coordinates
-
-                # Identificamos el salto del array de coordenadas
-                # LWPOLYLINE -> [x1, y1, x2, y2...]
-                # 2d/3dPolyline -> [x1, y1, z1, x2, y2, z2...]
-                step = 2 if obj.EntityName == "AcDbPolyline" else 3
-
-                for j in range(0, len(coords), step):
-                    # Extraemos solo X e Y para análisis 2D
-                    path_points.append((round(coords[j], 4), round(coords[j + 1], 4)))
-
-                found_valid = True
-                logger.info(
-                    f"Ruta detectada: {obj.EntityName} con {len(path_points)} vértices."
-                )
-                break
-
-        if not found_valid:
-            logger.warning(
-                f"No se encontró ninguna polilínea en la capa '{layer_name}'."
+    for polyline in snapshot.polylines.values():
+        if polyline["Capa"].upper() == layer_name.upper():
+            path_points = list(polyline["Puntos"])
+            logger.info(
+                f"Ruta detectada: {polyline['Tipo']} con {len(path_points)} vértices."
             )
+            return path_points
 
-    except Exception as e:
-        logger.error(f"Error extrayendo vértices de la polilínea: {e}")
-
-    return path_points
+    logger.warning(f"No se encontró ninguna polilínea en la capa '{layer_name}'.")
+    return []
 
 
 def calculate_distance(p1: tuple, p2: tuple) -> float:
@@ -82,24 +67,40 @@ def sort_blocks_by_path(
         f"Ordenando {len(pool)} bloques (Radio: {search_radius}u | Estricto: {strict_mode})..."
     )
 
-    # Se captura por cercanía a los vértices de la ruta
-    for mx, my in path_points:
-        close_ones = []
+    vectorize = vector_geometry.should_vectorize(len(path_points), len(pool))
 
-        # Buscamos candidatos en el pool restante
-        for blk in pool:
-            dist = calculate_distance((blk["X"], blk["Y"]), (mx, my))
-            if dist <= search_radius:
-                close_ones.append((dist, blk))
+    if vectorize:
+        # Mismo resultado que el barrido: cada bloque queda en el primer vértice que lo alcanza
+        vertex, dist = vector_geometry.first_capture(
+            vector_geometry.as_points(path_points),
+            vector_geometry.blocks_to_points(pool),
+            search_radius,
+        )
+        captured = vector_geometry.np.nonzero(vertex >= 0)[0]
+        order = captured[
+            vector_geometry.np.lexsort((captured, dist[captured], vertex[captured]))
+        ]
+        ordered_blocks = [pool[i] for i in order]
+        pool = [pool[i] for i in vector_geometry.np.nonzero(vertex < 0)[0]]
+    else:
+        # Se captura por cercanía a los vértices de la ruta
+        for mx, my in path_points:
+            close_ones = []
+
+            # Buscamos candidatos en el pool restante
+            for blk in pool:
+                dist = calculate_distance((blk["X"], blk["Y"]), (mx, my))
+                if dist <= search_radius:
+                    close_ones.append((dist, blk))
 
-        if close_ones:
-            # Ordenamos el sub-grupo por cercanía exacta al vértice (distancia)
-            close_ones.sort(key=lambda item: item[0])
+            if close_ones:
+                # Ordenamos el sub-grupo por cercanía exacta al vértice (distancia)
+                close_ones.sort(key=lambda item: item[0])
 
-            for dist, blk in close_ones:
-                ordered_blocks.append(blk)
-                if blk in pool:
-                    pool.remove(blk)
+                for dist, blk in close_ones:
+                    ordered_blocks.append(blk)
+                    if blk in pool:
+                        pool.remove(blk)
 
     # Gestión de bloques sobrantes
     sobrantes = len(pool)
@@ -107,25 +108,42 @@ def sort_blocks_by_path(
         logger.warning(
             f"AUDITORÍA: Se detectaron {sobrantes} bloques fuera del radio de {search_radius}m."
         )
-        # Iterar sobre los bloques no capturados para un loggeo exhaustivo
-        for out_block in pool:
+        # Calcular a qué distancia exacta quedó cada bloque del punto más cercano de la ruta
+        if path_points and vectorize:
+            _, min_dists = vector_geometry.nearest_vertex(
+                vector_geometry.as_points(path_points),
+                vector_geometry.blocks_to_points(pool),
+            )
+            min_dists = min_dists.tolist()
+        elif path_points:
+            min_dists = [
+                min(calculate_distance((b["X"], b["Y"]), pt) for pt in path_points)
+                for b in pool
+            ]
+
+        # Detalle de los bloques no capturados: los primeros como advertencia,
+        # el resto en nivel DEBUG para no inundar el registro
+        for n, out_block in enumerate(pool):
             coord_x = out_block.get("X")
             coord_y = out_block.get("Y")
             handle = out_block.get("Handle", "N/A")
+            log = logger.warning if n < MAX_DETAILED_WARNINGS else logger.debug
 
-            # Calcular a qué distancia exacta quedó del punto más cercano de la ruta
             if path_points:
-                min_dist_to_path = min(
-                    calculate_distance((coord_x, coord_y), pt) for pt in path_points
-                )
-                logger.warning(
+                min_dist_to_path = min_dists[n]
+                log(
                     f"[FUERA DE ALCANCE] Handle: {handle} en coordenadas (X: {coord_x}, Y: {coord_y}). "
                     f"Distancia a la ruta: {min_dist_to_path:.2f}m (Excede límite de {search_radius}m)"
                 )
             else:
-                logger.warning(
+                log(
                     f"[FUERA DE ALCANCE] Handle: {handle} en coordenadas (X: {coord_x}, Y: {coord_y})."
                 )
+        if sobrantes > MAX_DETAILED_WARNINGS:
+            logger.warning(
+                f"[FUERA DE ALCANCE] ... y {sobrantes - MAX_DETAILED_WARNINGS} bloques más "
+                "(detalle en nivel DEBUG)."
+            )
 
         if strict_mode:
             logger.warning(
@@ -143,39 +161,83 @@ def sort_blocks_by_path(
     return ordered_blocks
 
 
-def associate_data(base_blocks: list, data_entities: list, radius: float) -> list:
+def _copy_associated_fields(base: dict, data: dict) -> None:
+    # Agregamos un prefijo 'Data_' para no chocar con atributos propios del poste
+    for key, val in data.items():
+        if key.startswith("Attr_") or key == "Texto":
+            base[f"Data_{key}"] = val
+
+
+@traced("associate_data")
+def associate_data(
+    base_blocks: list, data_entities: list, radius: float, global_match: bool = False
+) -> list:
     """
     Asocia atributos de 'data_entities' (textos o bloques) a 'base_blocks'
-    basándose en la cercanía espacial (dentro de un radio).
+    basándose en la cercanía espacial (dentro de un radio). Cada dato se
+    asigna como máximo a un bloque base.
+
+    Args:
+        global_match: Si es False, cada bloque base (en su orden) toma el dato libre
+                      más cercano. Si es True, se ordenan todos los pares candidatos
+                      por distancia y cada dato va al bloque del que realmente está
+                      más cerca, sin depender del orden de 'base_blocks'.
     """
-    logger.info(f"Iniciando asociación de datos (Radio de búsqueda: {radius}m)...")
+    logger.info(
+        f"Iniciando asociación de datos (Radio de búsqueda: {radius}m | "
+        f"Global: {global_match})..."
+    )
     associated_count = 0
-    pool_datos = data_entities.copy()
-
-    for base in base_blocks:
-        bx, by = base["X"], base["Y"]
-        closest_data = None
-        min_dist = radius
-
-        for entity in pool_datos:
-            ex, ey = entity["X"], entity["Y"]
-            dist = calculate_distance((bx, by), (ex, ey))
-
-            # Buscamos la entidad más cercana dentro del radio permitido
-            if dist <= min_dist:
-                min_dist = dist
-                closest_data = entity
-
-        if closest_data:
-            # Si encontramos algo, le pasamos los datos relevantes al bloque base
-            # Agregamos un prefijo 'Data_' para no chocar con atributos propios del poste
-            for key, val in closest_data.items():
-                if key.startswith("Attr_") or key == "Texto":
-                    base[f"Data_{key}"] = val
+    add_items(len(base_blocks))
 
+    if vector_geometry.should_vectorize(len(base_blocks), len(data_entities)):
+        associated_count = _associate_vectorized(
+            base_blocks, data_entities, radius, global_match
+        )
+        logger.info(
+            f"Asociación exitosa: Se cruzó información en {associated_count} bloques."
+        )
+        return base_blocks
+
+    indice_datos = GridIndex(cell_size=max(radius, 1.0))
+    for i, entity in enumerate(data_entities):
+        indice_datos.insert(i, (entity["X"], entity["Y"]))
+
+    if global_match:
+        # Todos los pares (distancia, base, dato) dentro del radio, del más cercano al más lejano
+        pares = []
+        for b, base in enumerate(base_blocks):
+            for dist, i, _ in indice_datos.within((base["X"], base["Y"]), radius):
+                pares.append((dist, b, i))
+        pares.sort()
+
+        bases_asignadas = set()
+        datos_asignados = set()
+        for _, b, i in pares:
+            if b in bases_asignadas or i in datos_asignados:
+                continue
+            _copy_associated_fields(base_blocks[b], data_entities[i])
+            bases_asignadas.add(b)
+            datos_asignados.add(i)
+            associated_count += 1
+    else:
+        for base in base_blocks:
+            candidatos = indice_datos.within((base["X"], base["Y"]), radius)
+            if not candidatos:
+                continue
+
+            # Ante empates en distancia gana el último dato de la lista (criterio histórico)
+            min_dist = candidatos[0][0]
+            closest = candidatos[0][1]
+            for dist, i, _ in candidatos[1:]:
+                if dist > min_dist:
+                    break
+                closest = i
+
+            _copy_associated_fields(base, data_entities[closest])
             associated_count += 1
-            # Retiramos el dato del pool para no asignarlo a dos postes distintos
-            pool_datos.remove(closest_data)
+            # Retiramos el dato del índice para no asignarlo a dos postes distintos
+            indice_datos.remove(closest)
 
     logger.info(
         f"Asociación exitosa: Se cruzó información en {associated_count} bloques."
@@ -183,6 +245,42 @@ def associate_data(base_blocks: list, data_entities: list, radius: float) -> lis
     return base_blocks
 
 
+def _associate_vectorized(
+    base_blocks: list, data_entities: list, radius: float, global_match: bool
+) -> int:
+    """
+    Variante de associate_data para volúmenes grandes: los pares candidatos se
+    obtienen de una vez con NumPy y se recorren con los mismos criterios de
+    desempate que la versión con GridIndex.
+    """
+    np = vector_geometry.np
+    b_idx, d_idx, dist = vector_geometry.pairs_within_radius(
+        vector_geometry.blocks_to_points(base_blocks),
+        vector_geometry.blocks_to_points(data_entities),
+        radius,
+    )
+
+    if global_match:
+        # Mismo orden que sort() sobre tuplas (distancia, base, dato)
+        order = np.lexsort((d_idx, b_idx, dist))
+    else:
+        # Por base en su orden; dentro de cada base, la más cercana y ante
+        # empates el último dato de la lista (criterio histórico)
+        order = np.lexsort((-d_idx, dist, b_idx))
+
+    bases_asignadas = set()
+    datos_asignados = set()
+    count = 0
+    for b, i in zip(b_idx[order].tolist(), d_idx[order].tolist()):
+        if b in bases_asignadas or i in datos_asignados:
+            continue
+        _copy_associated_fields(base_blocks[b], data_entities[i])
+        bases_asignadas.add(b)
+        datos_asignados.add(i)
+        count += 1
+    return count
+
+
 def point_to_segment_projection(p: tuple, a: tuple, b: tuple) -> tuple:
     """
     Proyecta un punto p sobre el vector ab.
@@ -210,26 +308,80 @@ def point_to_segment_projection(p: tuple, a: tuple, b: tuple) -> tuple:
     return (proj_x, proj_y), dist
 
 
+def _project_candidates(p1, p2, postes, indice_postes, tolerancia) -> list:
+    """[(distancia_desde_p1, proyección)] de los postes que caen sobre p1-p2."""
+    postes_en_segmento = []
+    # Los candidatos llegan en el orden original de 'postes' (desempates estables)
+    for i in indice_postes.near_segment(p1, p2, tolerancia):
+        coords_poste = (postes[i]["X"], postes[i]["Y"])
+        proj, dist = point_to_segment_projection(coords_poste, p1, p2)
+
+        # Si el poste pertenece a esta línea
+        if dist <= tolerancia:
+            dist_from_p1 = calculate_distance(p1, proj)
+            postes_en_segmento.append((dist_from_p1, proj))
+    return postes_en_segmento
+
+
+def _project_candidates_vectorized(segmentos, postes, tolerancia) -> list:
+    """
+    Variante de _project_candidates para volúmenes grandes: los pares
+    (segmento, poste candidato) se obtienen y se proyectan de una vez con
+    NumPy. Devuelve una lista por segmento, con los postes en su orden original.
+    """
+    np = vector_geometry.np
+    resultado = [[] for _ in segmentos]
+    if not segmentos or not postes:
+        return resultado
+
+    extremos = np.asarray(segmentos, dtype=np.float64).reshape(-1, 4)
+    puntos = vector_geometry.blocks_to_points(postes)
+    seg_idx, poste_idx = vector_geometry.segment_candidates(
+        extremos[:, :2], extremos[:, 2:], puntos, tolerancia
+    )
+    a = extremos[seg_idx, :2]
+    proj, dist = vector_geometry.project_points_to_segments(
+        puntos[poste_idx], a, extremos[seg_idx, 2:]
+    )
+
+    sobre = np.nonzero(dist <= tolerancia)[0]
+    desde_p1 = np.hypot(a[sobre, 0] - proj[sobre, 0], a[sobre, 1] - proj[sobre, 1])
+    for s, d, x, y in zip(
+        seg_idx[sobre].tolist(),
+        desde_p1.tolist(),
+        proj[sobre, 0].tolist(),
+        proj[sobre, 1].tolist(),
+    ):
+        resultado[s].append((d, (x, y)))
+    return resultado
+
+
+@traced("split_segments_with_poles")
 def split_segments_with_poles(
     segmentos: list, postes: list, tolerancia: float = 1.0
 ) -> list:
     """
     Cruza líneas con postes. Si un poste está sobre la línea, divide la arista $A \to B$
     en $A \to Poste \to B$.
+
+    Los postes se indexan en una rejilla espacial, de modo que cada segmento solo
+    evalúa los postes de las celdas que atraviesa en lugar de todos los postes.
     """
     nuevos_segmentos = []
+    add_items(len(segmentos))
 
-    for p1, p2 in segmentos:
-        postes_en_segmento = []
-        for poste in postes:
-            coords_poste = (poste["X"], poste["Y"])
-            proj, dist = point_to_segment_projection(coords_poste, p1, p2)
-
-            # Si el poste pertenece a esta línea
-            if dist <= tolerancia:
-                dist_from_p1 = calculate_distance(p1, proj)
-                postes_en_segmento.append((dist_from_p1, proj))
+    if vector_geometry.should_vectorize(len(segmentos), len(postes)):
+        proyecciones = _project_candidates_vectorized(segmentos, postes, tolerancia)
+    else:
+        indice_postes = GridIndex(cell_size=max(2.0 * tolerancia, 1.0))
+        for i, poste in enumerate(postes):
+            indice_postes.insert(i, (poste["X"], poste["Y"]))
+        proyecciones = (
+            _project_candidates(p1, p2, postes, indice_postes, tolerancia)
+            for p1, p2 in segmentos
+        )
 
+    for (p1, p2), postes_en_segmento in zip(segmentos, proyecciones):
         if not postes_en_segmento:
             nuevos_segmentos.append((p1, p2))
         else:
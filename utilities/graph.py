@@ -1,46 +1,208 @@
+import math
 import logging
-from typing import Tuple, List, Dict, Optional, Any
+from typing import Tuple, List, Dict, Optional, Callable, Union
 from .geometry import calculate_distance
+from .instrumentation import add_items, traced
+from .spatial import GridIndex, DEFAULT_CELL_SIZE
 
 logger = logging.getLogger(__name__)
 Point2D = Tuple[float, float]
+NodeKey = Tuple[int, int]
 
+# Resolución de las claves de nodo: la misma de round(..., 4) en la extracción
+COORD_SCALE = 10_000
 
-def point_to_key(point: Point2D, tolerance: float) -> Tuple[float, float]:
+
+def quantize(value: float) -> int:
+    """Coordenada en unidades enteras de 1e-4 (punto fijo)."""
+    return round(value * COORD_SCALE)
+
+
+def key_to_point(key: NodeKey) -> Point2D:
+    """Coordenadas (float) de una clave de nodo."""
+    return (key[0] / COORD_SCALE, key[1] / COORD_SCALE)
+
+
+def point_to_key(point: Point2D, tolerance: float) -> NodeKey:
     """
     Normaliza una coordenada aplicando un redondeo (snap) basado en tolerancia.
+
+    La clave es un par de enteros en unidades de 1e-4: el punto se cuantiza y
+    el snap se hace con aritmética entera (la mitad redondea hacia arriba), así
+    dos puntos iguales a 4 decimales caen siempre en el mismo nodo, sin el
+    ruido de redondeo que dejaba multiplicar floats (0.30000000000000004).
     """
-    if tolerance == 0:
-        return point
-    x = round(point[0] / tolerance) * tolerance
-    y = round(point[1] / tolerance) * tolerance
-    return (x, y)
+    qx = round(point[0] * COORD_SCALE)
+    qy = round(point[1] * COORD_SCALE)
+    step = round(tolerance * COORD_SCALE)
+    if step <= 1:
+        return (qx, qy)
+    half = step // 2
+    return ((qx + half) // step * step, (qy + half) // step * step)
+
+
+# POLÍTICAS DE ORDEN DE RAMAS PARA EL DFS
+
+ORDER_INSERTION = "insertion"
+ORDER_SHORTEST_EDGE = "shortest_edge"
+ORDER_STRAIGHTEST = "straightest"
+ORDER_LONGEST_SUBTREE_LAST = "longest_subtree_last"
+
+
+def order_by_insertion(graph, key, parent, neighbors):
+    """Respeta el orden en que se agregaron las líneas (comportamiento histórico)."""
+    return neighbors
+
+
+def order_by_shortest_edge(graph, key, parent, neighbors):
+    """Recorre primero la arista más corta."""
+    return sorted(neighbors, key=lambda item: item[1])
+
+
+def order_by_straightest(graph, key, parent, neighbors):
+    """
+    Continuidad angular: recorre primero la rama que menos se desvía de la
+    dirección de llegada (sigue la línea más recta).
+    """
+    if parent is None:
+        return neighbors
+
+    px, py = graph.nodes[parent]
+    cx, cy = graph.nodes[key]
+    heading = math.atan2(cy - py, cx - px)
+
+    def turn(item):
+        nx, ny = graph.nodes[item[0]]
+        delta = math.atan2(ny - cy, nx - cx) - heading
+        return abs(math.atan2(math.sin(delta), math.cos(delta)))
+
+    return sorted(neighbors, key=turn)
+
+
+NEIGHBOR_ORDERS = {
+    ORDER_INSERTION: order_by_insertion,
+    ORDER_SHORTEST_EDGE: order_by_shortest_edge,
+    ORDER_STRAIGHTEST: order_by_straightest,
+    # ORDER_LONGEST_SUBTREE_LAST se resuelve en NetworkGraph (requiere precálculo)
+}
 
 
 class NetworkGraph:
     """
     Grafo no dirigido que representa la linea de red existente.
     Usa listas de adyacencia para almacenar conexiones y pesos (distancias).
+    Mantiene un índice espacial de rejilla con los nodos para que las búsquedas
+    de cercanía (snap) no recorran todo el grafo.
+
+    Internamente los nodos se identifican por claves enteras (point_to_key);
+    los métodos públicos reciben y devuelven coordenadas float.
+
+    Los extremos a una distancia <= tolerance se unen en un mismo nodo aunque
+    caigan a ambos lados de una celda de redondeo: cada extremo nuevo se une
+    (union-find) con los extremos ya vistos en las celdas vecinas de un hash
+    espacial con celdas del tamaño de la tolerancia. La unión es transitiva, y
+    si un extremo une dos nodos existentes sus aristas se fusionan. Cada nodo
+    conserva la clave y las coordenadas del primer extremo de su grupo.
     """
 
-    def __init__(self, tolerance: float = 0.1):
-        self.adj: Dict[
-            Tuple[float, float], List[Tuple[Tuple[float, float], float]]
-        ] = {}
-        self.nodes: Dict[Tuple[float, float], Point2D] = {}
+    def __init__(self, tolerance: float = 0.1, cell_size: float = DEFAULT_CELL_SIZE):
+        self.adj: Dict[NodeKey, List[Tuple[NodeKey, float]]] = {}
+        self.nodes: Dict[NodeKey, Point2D] = {}
         self.tolerance = tolerance
+        self.index = GridIndex(cell_size)
+        # Union-find sobre los extremos distintos (a 1e-4) vistos hasta ahora
+        self._parent: Dict[NodeKey, NodeKey] = {}
+        self._born: Dict[NodeKey, int] = {}
+        self._step = max(round(tolerance * COORD_SCALE), 1)
+        self._cells: Dict[Tuple[int, int], List[NodeKey]] = {}
         logger.debug(f"Inicializando Grafo con tolerancia: {tolerance}m")
 
+    @property
+    def merged_endpoints(self) -> int:
+        """Extremos distintos que se unieron a otro nodo por estar dentro de la tolerancia."""
+        return len(self._parent) - len(self.nodes)
+
+    def _find(self, q: NodeKey) -> NodeKey:
+        parent = self._parent
+        root = q
+        while parent[root] != root:
+            root = parent[root]
+        # Compresión de caminos
+        while parent[q] != root:
+            parent[q], q = root, parent[q]
+        return root
+
+    def _cluster(self, point: Point2D) -> NodeKey:
+        """Clave del nodo al que pertenece el extremo (lo crea o fusiona si hace falta)."""
+        q = point_to_key(point, 0)
+        if q in self._parent:
+            return self._find(q)
+
+        step = self._step
+        limit = (self.tolerance * COORD_SCALE) ** 2
+        cx, cy = q[0] // step, q[1] // step
+        roots = set()
+        for ix in (cx - 1, cx, cx + 1):
+            for iy in (cy - 1, cy, cy + 1):
+                for other in self._cells.get((ix, iy), ()):
+                    dx, dy = other[0] - q[0], other[1] - q[1]
+                    if dx * dx + dy * dy <= limit:
+                        roots.add(self._find(other))
+
+        self._cells.setdefault((cx, cy), []).append(q)
+        self._born[q] = len(self._born)
+        if not roots:
+            self._parent[q] = q
+            self.nodes[q] = point
+            self.index.insert(q, point)
+            return q
+
+        # El grupo más antiguo conserva su clave; los demás se fusionan en él
+        keep = min(roots, key=self._born.__getitem__)
+        self._parent[q] = keep
+        for root in roots:
+            if root != keep:
+                self._merge_nodes(keep, root)
+        return keep
+
+    def _merge_nodes(self, keep: NodeKey, gone: NodeKey) -> None:
+        """Une el nodo 'gone' en 'keep' trasladando sus aristas."""
+        self._parent[gone] = keep
+        del self.nodes[gone]
+        self.index.remove(gone)
+        for neighbor, dist in self.adj.pop(gone, ()):
+            self.adj[neighbor] = [
+                (key, d) for key, d in self.adj[neighbor] if key != gone
+            ]
+            if neighbor == keep:
+                continue  # La arista quedó dentro del nodo fusionado
+            edges = self.adj.setdefault(keep, [])
+            if not any(key == neighbor for key, _ in edges):
+                edges.append((neighbor, dist))
+                self.adj[neighbor].append((keep, dist))
+
+    def key_of(self, point: Point2D) -> Optional[NodeKey]:
+        """
+        Clave interna del nodo que corresponde a un punto: el de su extremo si
+        ya se agregó, o el nodo más cercano dentro de la tolerancia.
+        """
+        q = point_to_key(point, 0)
+        if q in self._parent:
+            return self._find(q)
+        found = self.index.nearest(point, max_radius=self.tolerance)
+        return found[1] if found is not None else None
+
+    def endpoint_aliases(self) -> Dict[NodeKey, NodeKey]:
+        """Clave de cada extremo visto (a 1e-4) -> clave del nodo al que se unió."""
+        return {q: self._find(q) for q in self._parent}
+
     def add_line(self, p1: Point2D, p2: Point2D) -> None:
         """
         Agrega una conexión (arista) entre dos puntos (nodos).
         """
-        # Obtener claves únicas (con Snap)
-        key1 = point_to_key(p1, self.tolerance)
-        key2 = point_to_key(p2, self.tolerance)
-
-        self.nodes[key1] = p1
-        self.nodes[key2] = p2
+        # Obtener claves únicas (agrupando extremos dentro de la tolerancia)
+        key1 = self._cluster(p1)
+        key2 = self._cluster(p2)
 
         if key1 == key2:
             logger.debug(f"Saltando línea de longitud 0 entre {p1} y {p2}")
@@ -58,64 +220,161 @@ class NetworkGraph:
             self.adj[key1].append((key2, dist))
             self.adj[key2].append((key1, dist))
 
-    def dfs_traversal(self, start_node: Point2D) -> List[Point2D]:
+    def freeze(self):
+        """
+        Copia compacta de solo lectura en arreglos NumPy (graph_csr.FrozenGraph),
+        con las mismas consultas. Requiere NumPy (graph_csr.available()).
+        """
+        from .graph_csr import FrozenGraph
+
+        return FrozenGraph.from_graph(self)
+
+    def _neighbor_order(self, order, start_key) -> Callable:
+        """
+        Resuelve la política de orden de ramas a una función
+        (nodo, nodo_padre, vecinos) -> vecinos_ordenados.
+        """
+        if order is None:
+            order = ORDER_INSERTION
+        if callable(order):
+            return lambda key, parent, neighbors: order(self, key, parent, neighbors)
+        if order == ORDER_LONGEST_SUBTREE_LAST:
+            sizes = self._subtree_sizes(start_key)
+            return lambda key, parent, neighbors: sorted(
+                neighbors, key=lambda item: sizes.get(item[0], 0)
+            )
+        try:
+            policy = NEIGHBOR_ORDERS[order]
+        except KeyError:
+            raise ValueError(f"Política de orden de ramas desconocida: {order}")
+        return lambda key, parent, neighbors: policy(self, key, parent, neighbors)
+
+    def _subtree_sizes(self, start_key) -> Dict[NodeKey, int]:
+        """
+        Tamaño del subárbol de cada nodo en el árbol DFS (orden de inserción)
+        que parte de start_key. Se usa como estimación del largo de cada rama.
+        """
+        order, parents = self._iterative_dfs(start_key, lambda k, p, n: n)
+        sizes = dict.fromkeys(order, 1)
+        for key in reversed(order):
+            parent = parents[key]
+            if parent is not None:
+                sizes[parent] += sizes[key]
+        return sizes
+
+    def _iterative_dfs(self, start_key, sort_neighbors: Callable):
+        """
+        DFS con pila explícita: mismo orden de visita que la versión recursiva,
+        sin límite de profundidad. Devuelve (claves_en_orden, padre_de_cada_clave).
+        """
+        visited = {start_key}
+        order = [start_key]
+        parents = {start_key: None}
+
+        stack_keys = [start_key]
+        stack_neighbors = [sort_neighbors(start_key, None, self.adj[start_key])]
+        stack_pos = [0]
+
+        while stack_keys:
+            neighbors = stack_neighbors[-1]
+            pos = stack_pos[-1]
+            # Avanzamos hasta el siguiente vecino aún no visitado
+            while pos < len(neighbors) and neighbors[pos][0] in visited:
+                pos += 1
+
+            if pos == len(neighbors):
+                stack_keys.pop()
+                stack_neighbors.pop()
+                stack_pos.pop()
+                continue
+
+            stack_pos[-1] = pos + 1
+            parent_key = stack_keys[-1]
+            neighbor_key = neighbors[pos][0]
+
+            visited.add(neighbor_key)
+            order.append(neighbor_key)
+            parents[neighbor_key] = parent_key
+
+            stack_keys.append(neighbor_key)
+            stack_neighbors.append(
+                sort_neighbors(neighbor_key, parent_key, self.adj[neighbor_key])
+            )
+            stack_pos.append(0)
+
+        return order, parents
+
+    @traced("dfs_traversal")
+    def dfs_traversal(
+        self, start_node: Point2D, order: Union[str, Callable, None] = None
+    ) -> List[Point2D]:
         """
         Recorrido en profundidad (DFS) adaptado para topología de red.
         Útil para enumerar postes secuencialmente a lo largo de ramas conectadas.
+
+        Usa una pila explícita, por lo que soporta alimentadores de cualquier largo.
+
+        Args:
+            order: Política para decidir qué rama recorrer primero en cada nodo:
+                   "insertion" (por defecto, orden en que se agregaron las líneas),
+                   "shortest_edge", "straightest", "longest_subtree_last", o una
+                   función (grafo, nodo, nodo_padre, vecinos) -> vecinos_ordenados.
         """
-        start_key = point_to_key(start_node, self.tolerance)
+        start_key = self.key_of(start_node)
         if start_key not in self.adj:
             logger.warning("El nodo de inicio no pertenece a la red.")
             return []
 
-        visited = set()
-        path = []
-
-        def dfs(current_key):
-            visited.add(current_key)
-            path.append(self.nodes[current_key])
-            for neighbor_key, _ in self.adj.get(current_key):
-                if neighbor_key not in visited:
-                    dfs(neighbor_key)
-
-        dfs(start_key)
-        return path
+        sort_neighbors = self._neighbor_order(order, start_key)
+        visit_order, _ = self._iterative_dfs(start_key, sort_neighbors)
+        add_items(len(visit_order))
+        return [self.nodes[key] for key in visit_order]
 
     def find_nearest_node(
         self, point: Point2D, max_radius: float = 5.0
-    ) -> Tuple[Optional[Tuple[float, float]], Optional[float]]:
+    ) -> Tuple[Optional[Point2D], Optional[float]]:
         """
         Encuentra el nodo del grafo más cercano a un punto dado (ej. un Equipo).
 
         Returns:
-            Tuple(NodeKey, Distancia): Retorna None, None si no encuentra nada en el radio.
+            Tuple(Nodo, Distancia): Nodo son las coordenadas ajustadas (snap) del
+            nodo. Retorna None, None si no encuentra nada en el radio.
         """
-        best_node = None
-        min_dist = float("inf")
-
-        # Búsqueda lineal optimizada con caja delimitadora simple
-        for key, coords in self.nodes.items():
-            if abs(point[0] - coords[0]) > max_radius:
-                continue
-            if abs(point[1] - coords[1]) > max_radius:
-                continue
+        found = self.index.nearest(point, max_radius=max_radius)
 
-            d = calculate_distance(point, coords)
-            if d < min_dist:
-                min_dist = d
-                best_node = key
-
-        # Solo logueamos si NO encuentra nada, para depurar
-        if best_node is None and min_dist > max_radius:
+        if found is None:
             logger.debug(f"No se encontró nodo cercano a {point} en radio {max_radius}")
-            pass
+            return None, None
 
-        if min_dist <= max_radius:
-            return best_node, min_dist
-        return None, None
+        dist, key, _ = found
+        return key_to_point(key), dist
+
+    def find_nodes_within(
+        self, point: Point2D, radius: float
+    ) -> List[Tuple[Point2D, float]]:
+        """
+        Devuelve todos los nodos a una distancia <= radius del punto,
+        como [(NodeKey, Distancia), ...] ordenados por cercanía.
+        """
+        return [
+            (key_to_point(key), dist)
+            for dist, key, _ in self.index.within(point, radius)
+        ]
+
+    def find_k_nearest_nodes(
+        self, point: Point2D, k: int, max_radius: Optional[float] = None
+    ) -> List[Tuple[Point2D, float]]:
+        """
+        Devuelve los k nodos más cercanos al punto (opcionalmente limitados a
+        max_radius), como [(NodeKey, Distancia), ...] ordenados por cercanía.
+        """
+        return [
+            (key_to_point(key), dist)
+            for dist, key, _ in self.index.k_nearest(point, k, max_radius)
+        ]
 
     def get_path_length(
-        self, start_node: Any, end_node: Any
+        self, start_node: Point2D, end_node: Point2D
     ) -> Tuple[Optional[float], List[Point2D]]:
         """
         Ejecuta el algoritmo de Dijkstra para encontrar la ruta más corta.
@@ -125,6 +384,11 @@ class NetworkGraph:
         """
         import heapq
 
+        start_node = self.key_of(start_node)
+        end_node = self.key_of(end_node)
+        if start_node is None or end_node is None:
+            return None, []  # Algún extremo no pertenece a la red
+
         # Cola de prioridad: (distancia_acumulada, nodo_actual)
         queue = [(0, start_node)]
         visited = {}  # Diccionario: nodo -> (distancia, nodo_padre)
@@ -158,4 +422,4 @@ class NetworkGraph:
                         visited[neighbor] = (new_dist, current_node)
                         heapq.heappush(queue, (new_dist, neighbor))
 
-        return None  # No hay camino (islas separadas)
+        return None, []  # No hay camino (islas separadas)
@@ -0,0 +1,422 @@
+"""
+Representación compacta (CSR) de solo lectura de un NetworkGraph.
+
+Una vez armado el grafo, NetworkGraph.freeze() lo convierte en arreglos NumPy
+contiguos (compressed sparse row):
+
+    keys       int64  N×2   claves de punto fijo (1e-4) de cada nodo
+    coords     float64 N×2  coordenadas de cada nodo (las de graph.nodes)
+    offsets    int64  N+1   vecinos del nodo i en neighbors[offsets[i]:offsets[i+1]]
+    neighbors  int32  2E    índice de cada vecino, en el orden de adj
+    weights    float64 2E   largo de cada arista
+
+Las búsquedas por punto usan la misma rejilla (spatial.GridIndex) y el mismo
+mapa de extremos unidos que el NetworkGraph de origen, así que resuelven cada
+punto al mismo nodo que NetworkGraph.key_of sin recorrer todos los nodos.
+
+Cada arista ocupa 12 bytes por sentido, frente a los cientos de bytes de una
+tupla (clave, distancia) dentro de una lista de un diccionario. Los recorridos
+leen los arreglos a través de memoryview, que entrega enteros de Python sin
+crear escalares NumPy, y conservan el orden de visita de NetworkGraph.
+
+NumPy es opcional: si no está instalado `available()` devuelve False y se
+sigue usando NetworkGraph directamente.
+"""
+
+import heapq
+import logging
+import math
+from itertools import chain
+from typing import Callable, List, Optional, Tuple
+
+from .graph import (
+    ORDER_INSERTION,
+    ORDER_LONGEST_SUBTREE_LAST,
+    ORDER_SHORTEST_EDGE,
+    ORDER_STRAIGHTEST,
+    key_to_point,
+    point_to_key,
+)
+from .instrumentation import add_items, traced
+from .spatial import DEFAULT_CELL_SIZE, GridIndex
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+logger = logging.getLogger(__name__)
+Point2D = Tuple[float, float]
+
+# Desde este número de vanos la copia CSR compensa el costo de congelar
+FREEZE_MIN_SEGMENTS = 100_000
+
+
+def available() -> bool:
+    return np is not None
+
+
+def should_freeze(n_segments: int) -> bool:
+    """Indica si conviene congelar un grafo armado con n_segments vanos."""
+    return np is not None and n_segments >= FREEZE_MIN_SEGMENTS
+
+
+class FrozenGraph:
+    """
+    Grafo no dirigido inmutable en formato CSR. Expone las mismas consultas
+    que NetworkGraph (find_nearest_node, dfs_traversal, get_path_length) y
+    además las componentes conexas. Los nodos se identifican por su índice
+    (0..N-1), en el orden de graph.nodes.
+    """
+
+    def __init__(
+        self,
+        keys,
+        coords,
+        offsets,
+        neighbors,
+        weights,
+        tolerance: float,
+        aliases: Optional[dict] = None,
+        cell_size: float = DEFAULT_CELL_SIZE,
+    ):
+        """
+        Args:
+            aliases: {clave de extremo: índice de nodo} con los extremos unidos
+                     por tolerancia (NetworkGraph.endpoint_aliases). Por defecto
+                     solo las claves de los nodos.
+        """
+        if np is None:
+            raise RuntimeError(
+                "NumPy no está instalado: no se puede congelar el grafo."
+            )
+        self.keys = keys
+        self.coords = coords
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+        self.tolerance = tolerance
+        if aliases is None:
+            aliases = {(qx, qy): i for i, (qx, qy) in enumerate(keys.tolist())}
+        self._aliases = aliases
+        # Índice de cada nodo en una rejilla, en orden de nodos (mismos empates)
+        self._grid = GridIndex(cell_size)
+        for i, point in enumerate(zip(coords[:, 0].tolist(), coords[:, 1].tolist())):
+            self._grid.insert(i, point)
+
+    @classmethod
+    def from_graph(cls, graph) -> "FrozenGraph":
+        """Convierte un NetworkGraph ya armado (no lo modifica)."""
+        if np is None:
+            raise RuntimeError(
+                "NumPy no está instalado: no se puede congelar el grafo."
+            )
+        position = {key: i for i, key in enumerate(graph.nodes)}
+        n = len(position)
+        adj = graph.adj
+        degrees = np.fromiter(
+            (len(adj.get(key, ())) for key in graph.nodes), dtype=np.int64, count=n
+        )
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+        total = int(offsets[-1])
+
+        neighbors = np.fromiter(
+            (position[nb] for key in graph.nodes for nb, _ in adj.get(key, ())),
+            dtype=np.int32,
+            count=total,
+        )
+        weights = np.fromiter(
+            (d for key in graph.nodes for _, d in adj.get(key, ())),
+            dtype=np.float64,
+            count=total,
+        )
+        keys = np.fromiter(
+            chain.from_iterable(graph.nodes), dtype=np.int64, count=2 * n
+        ).reshape(n, 2)
+        coords = np.fromiter(
+            chain.from_iterable(graph.nodes.values()), dtype=np.float64, count=2 * n
+        ).reshape(n, 2)
+        aliases = {q: position[key] for q, key in graph.endpoint_aliases().items()}
+        frozen = cls(
+            keys,
+            coords,
+            offsets,
+            neighbors,
+            weights,
+            graph.tolerance,
+            aliases,
+            graph.index.cell_size,
+        )
+        logger.debug(
+            f"Grafo congelado: {n} nodos, {total // 2} aristas, "
+            f"{frozen.nbytes / 1e6:.1f} MB."
+        )
+        return frozen
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.neighbors) // 2
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada por los arreglos."""
+        return sum(
+            a.nbytes
+            for a in (
+                self.keys,
+                self.coords,
+                self.offsets,
+                self.neighbors,
+                self.weights,
+            )
+        )
+
+    def point(self, i: int) -> Point2D:
+        return (float(self.coords[i, 0]), float(self.coords[i, 1]))
+
+    def _points(self, indices) -> List[Point2D]:
+        # Dos columnas planas: tolist() de la matriz N×2 crea N listas
+        # intermedias y dispara el recolector de basura en redes grandes
+        selected = self.coords[np.asarray(indices, dtype=np.int64)]
+        return list(zip(selected[:, 0].tolist(), selected[:, 1].tolist()))
+
+    # BÚSQUEDAS
+
+    def _nearest(self, point: Point2D, max_radius: float) -> Tuple[int, float]:
+        """(índice, distancia) del nodo más cercano, o (-1, inf) fuera del radio."""
+        found = self._grid.nearest(point, max_radius=max_radius)
+        if found is None:
+            return -1, math.inf
+        dist, i, _ = found
+        return i, dist
+
+    def node_index(self, point: Point2D) -> Optional[int]:
+        """
+        Índice del nodo que corresponde a un punto, como NetworkGraph.key_of:
+        el del grupo de su extremo si es uno de los extremos del grafo, o el
+        más cercano dentro de la tolerancia.
+        """
+        i = self._aliases.get(point_to_key(point, 0))
+        if i is not None:
+            return i
+        i, _ = self._nearest(point, self.tolerance)
+        return i if i >= 0 else None
+
+    def find_nearest_node(
+        self, point: Point2D, max_radius: float = 5.0
+    ) -> Tuple[Optional[Point2D], Optional[float]]:
+        """Igual que NetworkGraph.find_nearest_node (coordenadas de la clave)."""
+        i, dist = self._nearest(point, max_radius)
+        if i < 0:
+            return None, None
+        return key_to_point(tuple(self.keys[i].tolist())), dist
+
+    # RECORRIDOS
+
+    def _sorted_rows(self, rank):
+        """Vecinos de cada fila reordenados por 'rank' (orden estable)."""
+        rows = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.offsets))
+        perm = np.lexsort((rank, rows))
+        return self.neighbors[perm]
+
+    def _straightest(self, neighbors) -> Callable:
+        """
+        Ordena in situ la fila de cada nodo al expandirlo: el padre de un nodo
+        ya está fijado cuando se expande, así que basta ordenar una vez.
+        """
+        coords = self.coords.ravel().tolist()
+        offsets = memoryview(self.offsets)
+        nbrs = memoryview(neighbors)
+
+        def sort_row(i, parent):
+            if parent < 0:
+                return
+            px, py = coords[2 * parent], coords[2 * parent + 1]
+            cx, cy = coords[2 * i], coords[2 * i + 1]
+            heading = math.atan2(cy - py, cx - px)
+
+            def turn(n):
+                delta = math.atan2(coords[2 * n + 1] - cy, coords[2 * n] - cx) - heading
+                return abs(math.atan2(math.sin(delta), math.cos(delta)))
+
+            lo, hi = offsets[i], offsets[i + 1]
+            nbrs[lo:hi] = np.array(sorted(nbrs[lo:hi], key=turn), dtype=np.int32)
+
+        return sort_row
+
+    def _dfs(self, start: int, neighbors, sort_row: Optional[Callable] = None):
+        """
+        DFS con pila explícita sobre el CSR, mismo orden de visita que
+        NetworkGraph._iterative_dfs. La pila guarda la posición de cada nodo
+        dentro de 'neighbors'. sort_row(nodo, padre), si se indica, reordena
+        la fila del nodo antes de expandirlo. Devuelve (índices_en_orden,
+        padres) con padre -1 para el inicio y los nodos no alcanzados.
+        """
+        offsets = memoryview(self.offsets)
+        nbrs = memoryview(neighbors)
+        visited = bytearray(len(self))
+        parents = np.full(len(self), -1, dtype=np.int64)
+        parent_of = memoryview(parents)
+
+        if sort_row:
+            sort_row(start, -1)
+        visited[start] = 1
+        order = [start]
+        stack_nodes = [start]
+        stack_pos = [offsets[start]]
+        stack_end = [offsets[start + 1]]
+
+        while stack_nodes:
+            pos = stack_pos[-1]
+            end = stack_end[-1]
+            # Avanzamos hasta el siguiente vecino aún no visitado
+            while pos < end and visited[nbrs[pos]]:
+                pos += 1
+
+            if pos == end:
+                stack_nodes.pop()
+                stack_pos.pop()
+                stack_end.pop()
+                continue
+
+            stack_pos[-1] = pos + 1
+            parent = stack_nodes[-1]
+            node = nbrs[pos]
+
+            visited[node] = 1
+            order.append(node)
+            parent_of[node] = parent
+
+            if sort_row:
+                sort_row(node, parent)
+            stack_nodes.append(node)
+            stack_pos.append(offsets[node])
+            stack_end.append(offsets[node + 1])
+
+        return order, parents
+
+    def _subtree_sizes(self, start: int):
+        """Tamaño del subárbol de cada nodo en el DFS por inserción (0 si no se alcanza)."""
+        order, parents = self._dfs(start, self.neighbors)
+        sizes = np.zeros(len(self), dtype=np.int64)
+        sizes[order] = 1
+        size_of = memoryview(sizes)
+        parent_of = memoryview(parents)
+        for node in reversed(order):
+            parent = parent_of[node]
+            if parent >= 0:
+                size_of[parent] += size_of[node]
+        return sizes
+
+    def dfs_indices(self, start: int, order: Optional[str] = None) -> List[int]:
+        """
+        Índices en orden de visita DFS desde 'start'. Acepta las políticas con
+        nombre de NetworkGraph; las funciones de orden propias requieren el
+        grafo de diccionarios.
+        """
+        if order is None or order == ORDER_INSERTION:
+            visit, _ = self._dfs(start, self.neighbors)
+        elif order == ORDER_SHORTEST_EDGE:
+            visit, _ = self._dfs(start, self._sorted_rows(self.weights))
+        elif order == ORDER_LONGEST_SUBTREE_LAST:
+            sizes = self._subtree_sizes(start)
+            visit, _ = self._dfs(start, self._sorted_rows(sizes[self.neighbors]))
+        elif order == ORDER_STRAIGHTEST:
+            neighbors = self.neighbors.copy()
+            visit, _ = self._dfs(start, neighbors, self._straightest(neighbors))
+        else:
+            raise ValueError(f"Política de orden de ramas no soportada: {order}")
+        return visit
+
+    @traced("dfs_traversal")
+    def dfs_traversal(
+        self, start_node: Point2D, order: Optional[str] = None
+    ) -> List[Point2D]:
+        """Igual que NetworkGraph.dfs_traversal, sobre los arreglos CSR."""
+        start = self.node_index(start_node)
+        if start is None or self.offsets[start] == self.offsets[start + 1]:
+            logger.warning("El nodo de inicio no pertenece a la red.")
+            return []
+        visit = self.dfs_indices(start, order)
+        add_items(len(visit))
+        return self._points(visit)
+
+    def get_path_length(
+        self, start_node: Point2D, end_node: Point2D
+    ) -> Tuple[Optional[float], List[Point2D]]:
+        """
+        Dijkstra sobre el CSR.
+
+        Returns:
+            Tuple(DistanciaTotal, ListaDePuntos): (None, []) si no hay camino.
+        """
+        start = self.node_index(start_node)
+        end = self.node_index(end_node)
+        if start is None or end is None:
+            return None, []
+
+        offsets = memoryview(self.offsets)
+        nbrs = memoryview(self.neighbors)
+        wts = memoryview(self.weights)
+        best = np.full(len(self), math.inf)
+        dist_of = memoryview(best)
+        parents = np.full(len(self), -1, dtype=np.int64)
+        parent_of = memoryview(parents)
+
+        dist_of[start] = 0.0
+        queue = [(0.0, start)]
+        while queue:
+            current, node = heapq.heappop(queue)
+            if node == end:
+                path = [end]
+                while path[-1] != start:
+                    path.append(parent_of[path[-1]])
+                return current, self._points(path[::-1])
+            if current > dist_of[node]:
+                continue
+            for j in range(offsets[node], offsets[node + 1]):
+                neighbor = nbrs[j]
+                new_dist = current + wts[j]
+                if new_dist < dist_of[neighbor]:
+                    dist_of[neighbor] = new_dist
+                    parent_of[neighbor] = node
+                    heapq.heappush(queue, (new_dist, neighbor))
+
+        return None, []  # No hay camino (islas separadas)
+
+    def connected_components(self):
+        """
+        Etiqueta de componente conexa de cada nodo (0, 1, ... en orden de su
+        primer nodo). Devuelve (cantidad, etiquetas int32).
+        """
+        offsets = memoryview(self.offsets)
+        nbrs = memoryview(self.neighbors)
+        labels = np.full(len(self), -1, dtype=np.int32)
+        label_of = memoryview(labels)
+        count = 0
+        for seed in range(len(self)):
+            if label_of[seed] >= 0:
+                continue
+            label_of[seed] = count
+            stack = [seed]
+            while stack:
+                node = stack.pop()
+                for j in range(offsets[node], offsets[node + 1]):
+                    neighbor = nbrs[j]
+                    if label_of[neighbor] < 0:
+                        label_of[neighbor] = count
+                        stack.append(neighbor)
+            count += 1
+        return count, labels
+
+    def component_of(self, point: Point2D) -> List[Point2D]:
+        """Nodos de la componente conexa que contiene al punto."""
+        start = self.node_index(point)
+        if start is None:
+            return []
+        _, labels = self.connected_components()
+        return self._points(np.nonzero(labels == labels[start])[0])
@@ -0,0 +1,174 @@
+"""
+Bitácora de inserciones de una numeración (JSON Lines, una por dibujo y perfil).
+
+La primera línea guarda el plan completo (los postes en el orden en que se
+numeran y los parámetros de la corrida); cada inserción confirmada agrega una
+línea con su posición en el plan, el número asignado y el Handle del bloque
+insertado. El archivo queda abierto durante el lote: cada línea pasa al
+sistema operativo antes de seguir (sobrevive al cierre del proceso) y se fuerza
+a disco cada SYNC_EVERY líneas y al cerrar. Un corte de energía puede perder
+las últimas confirmaciones; al reanudar, esos bloques se reconocen en el dibujo
+por su posición (ver NumeracionWorker._adoptar_huerfanos). Así una corrida
+cancelada o interrumpida puede reanudarse sin volver a leer el dibujo ni
+duplicar bloques.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_DIR = os.path.join("cache", "journal")
+
+# Se incrementa si cambia el formato de las líneas
+JOURNAL_FORMAT = 1
+
+# Confirmaciones entre cada fsync (un fsync por bloque anula la inserción en lote)
+SYNC_EVERY = 200
+
+
+class InsertionJournal:
+    """
+    Uso:
+        journal = InsertionJournal.for_run(cad.doc.FullName, "EXISTENTES")
+        journal.start(plan, {"capa_destino": "NUMERACION"})
+        journal.record(indice, poste["Handle"], numero, bloque.Handle)
+        ...
+        journal.close()    # al cancelar o terminar el lote
+        journal.discard()  # al terminar sin errores
+
+    Para reanudar: journal.load() devuelve el plan y {indice: entrada}.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._unsynced = 0
+
+    @classmethod
+    def for_run(
+        cls, document_path: str, profile_id: str, folder: str = DEFAULT_JOURNAL_DIR
+    ) -> "InsertionJournal":
+        digest = hashlib.sha1(
+            f"{document_path}|{profile_id}".encode("utf-8")
+        ).hexdigest()[:16]
+        return cls(os.path.join(folder, f"numeracion_{digest}.jsonl"))
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _open(self):
+        f = open(self.path, "a+b")
+        # Tras un corte la última línea puede quedar sin salto: se cierra antes
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        return f
+
+    def _append(self, entry: dict, sync: bool = False) -> None:
+        if self._file is None:
+            self._file = self._open()
+        self._file.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._file.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= SYNC_EVERY:
+            self.sync()
+
+    def sync(self) -> None:
+        """Fuerza a disco las confirmaciones escritas desde el último fsync."""
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self) -> None:
+        """Fuerza a disco lo pendiente y cierra el archivo (al cancelar o terminar)."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def start(self, plan: List[dict], meta: Optional[dict] = None) -> None:
+        """Crea la bitácora (reemplaza una anterior) con el plan de la corrida."""
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.close()
+        if self.exists():
+            os.remove(self.path)
+        self._append(
+            {
+                "tipo": "plan",
+                "formato": JOURNAL_FORMAT,
+                "creado": time.time(),
+                "meta": meta or {},
+                "plan": plan,
+            },
+            sync=True,
+        )
+
+    def record(
+        self, index: int, pole_handle: Optional[str], number: int, block_handle: str
+    ) -> None:
+        """Registra una inserción confirmada (posición en el plan y número)."""
+        self._append(
+            {
+                "tipo": "insercion",
+                "indice": index,
+                "poste": pole_handle,
+                "numero": number,
+                "handle": block_handle,
+            }
+        )
+
+    def load(self) -> Optional[dict]:
+        """
+        Lee la bitácora. Devuelve None si no existe o no es legible; si no,
+        {"meta": dict, "plan": [...], "confirmadas": {indice: entrada}}.
+        Una última línea truncada (corte a mitad de escritura) se ignora.
+        """
+        if not self.exists():
+            return None
+        header, committed = None, {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Línea ilegible en la bitácora {self.path}.")
+                        continue
+                    if entry.get("tipo") == "plan":
+                        header = entry
+                    elif entry.get("tipo") == "insercion":
+                        committed[entry["indice"]] = entry
+        except OSError as e:
+            logger.warning(f"No se pudo leer la bitácora {self.path}: {e}")
+            return None
+
+        if header is None or header.get("formato") != JOURNAL_FORMAT:
+            return None
+        return {
+            "meta": header["meta"],
+            "plan": header["plan"],
+            "confirmadas": committed,
+        }
+
+    def pending(self) -> bool:
+        """True si hay una corrida con postes aún sin numerar."""
+        state = self.load()
+        return state is not None and len(state["confirmadas"]) < len(state["plan"])
+
+    def discard(self) -> None:
+        self.close()
+        if self.exists():
+            os.remove(self.path)
+
+
+def committed_numbers(state: dict) -> Dict[int, int]:
+    """{indice en el plan: número asignado} de una bitácora cargada."""
+    return {i: entry["numero"] for i, entry in state["confirmadas"].items()}
@@ -0,0 +1,306 @@
+"""
+Medición por etapas de cada trabajo (tiempo, elementos y llamadas COM).
+
+Un trabajo abre una corrida con start_run() en su hilo; dentro, las funciones
+de utilities/ y de los workers marcan sus etapas con span() o @traced. Sin
+corrida activa en el hilo, span() devuelve un objeto vacío y no mide nada, así
+que las funciones instrumentadas se pueden llamar desde pruebas o scripts sin
+costo.
+
+    profile = start_run("numeración")
+    with span("construir_grafo", items=len(segmentos)):
+        ...
+    finish_run()
+    profile.format_lines()  # desglose para la pestaña de logs
+
+Las llamadas COM se cuentan por hilo (en la práctica, el de la sesión CAD);
+cada etapa guarda la diferencia del contador entre su inicio y su fin. Quien
+escribe en el dibujo envuelve cad.msp / cad.doc con counted() y el conteo sale
+de cada lectura, asignación o invocación real, no de sumas a mano.
+Los resúmenes se agregan como una línea JSON a logs/runs_AAAA-MM.jsonl, junto
+al log mensual de la aplicación.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .logger import LOG_DIR
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def add_com_calls(n: int = 1) -> None:
+    """Suma 'n' llamadas COM al contador del hilo actual."""
+    _local.com_calls = getattr(_local, "com_calls", 0) + n
+
+
+def com_call_count() -> int:
+    return getattr(_local, "com_calls", 0)
+
+
+_PLAIN = (str, bytes, int, float, bool, type(None))
+
+
+def _wrap(value):
+    if isinstance(value, _PLAIN) or isinstance(value, _Counted):
+        return value
+    if isinstance(value, (tuple, list)):
+        return tuple(_wrap(v) for v in value)
+    return _Counted(value)
+
+
+def _unwrap(value):
+    return (
+        object.__getattribute__(value, "_obj") if isinstance(value, _Counted) else value
+    )
+
+
+class _Counted:
+    """
+    Envoltura de un objeto COM que suma una llamada por cada propiedad leída,
+    asignada o método invocado. Los objetos COM que devuelve salen envueltos, y
+    los que recibe como argumento se desenvuelven antes de pasarlos al backend.
+    """
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj):
+        object.__setattr__(self, "_obj", obj)
+
+    def __getattr__(self, name):
+        value = getattr(object.__getattribute__(self, "_obj"), name)
+        # Solo los métodos enlazados son invocaciones; un CDispatch o una
+        # colección con miembro por defecto también son "callable", pero se
+        # leen como propiedad y se devuelven envueltos
+        if inspect.ismethod(value) or inspect.isbuiltin(value):
+
+            def method(*args, **kwargs):
+                add_com_calls(1)
+                args = tuple(_unwrap(a) for a in args)
+                kwargs = {k: _unwrap(v) for k, v in kwargs.items()}
+                return _wrap(value(*args, **kwargs))
+
+            return method
+        add_com_calls(1)
+        return _wrap(value)
+
+    def __setattr__(self, name, value):
+        add_com_calls(1)
+        setattr(object.__getattribute__(self, "_obj"), name, _unwrap(value))
+
+
+def counted(obj):
+    """Envuelve 'obj' para contar sus llamadas COM en el hilo actual."""
+    return _wrap(obj)
+
+
+class _Span:
+    __slots__ = ("profile", "stage", "items", "_start", "_com_start")
+
+    def __init__(self, profile: "RunProfile", stage: str, items: Optional[int]):
+        self.profile = profile
+        self.stage = stage
+        self.items = items
+
+    def add_items(self, n: int) -> None:
+        self.items = (self.items or 0) + n
+
+    def __enter__(self) -> "_Span":
+        self.profile._stack.append(self)
+        self._com_start = com_call_count()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self._start
+        self.profile._stack.pop()
+        self.profile._record(
+            self.stage,
+            len(self.profile._stack),
+            elapsed,
+            self.items,
+            com_call_count() - self._com_start,
+        )
+
+
+class _NullSpan:
+    """Etapa sin corrida activa: no mide nada."""
+
+    __slots__ = ()
+
+    def add_items(self, n: int) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class RunProfile:
+    """
+    Etapas de una corrida en orden de primera aparición. Una etapa que se
+    repite (p. ej. un extractor llamado por capa) acumula tiempo y conteos.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._com_start = com_call_count()
+        self.elapsed: Optional[float] = None
+        self.com_calls = 0
+        self.extra: dict = {}
+        self.stages: Dict[str, dict] = {}
+        self._stack: List[_Span] = []
+        self._outer: Optional["RunProfile"] = None
+
+    def span(self, stage: str, items: Optional[int] = None) -> _Span:
+        return _Span(self, stage, items)
+
+    def _record(self, stage, level, elapsed, items, com) -> None:
+        entry = self.stages.get(stage)
+        if entry is None:
+            entry = self.stages[stage] = {
+                "etapa": stage,
+                "nivel": level,
+                "veces": 0,
+                "segundos": 0.0,
+                "elementos": None,
+                "com": 0,
+            }
+        entry["veces"] += 1
+        entry["segundos"] += elapsed
+        entry["com"] += com
+        if items is not None:
+            entry["elementos"] = (entry["elementos"] or 0) + items
+
+    def finish(self) -> "RunProfile":
+        self.elapsed = time.perf_counter() - self._start
+        self.com_calls = com_call_count() - self._com_start
+        return self
+
+    def summary(self) -> dict:
+        elapsed = (
+            self.elapsed
+            if self.elapsed is not None
+            else time.perf_counter() - self._start
+        )
+        return {
+            "trabajo": self.name,
+            "inicio": datetime.fromtimestamp(self.started_at).isoformat(
+                timespec="seconds"
+            ),
+            "segundos": round(elapsed, 4),
+            "com": self.com_calls,
+            **self.extra,
+            "etapas": [
+                {**entry, "segundos": round(entry["segundos"], 4)}
+                for entry in self.stages.values()
+            ],
+        }
+
+    def format_lines(self) -> List[str]:
+        """Desglose legible para la pestaña de logs."""
+        summary = self.summary()
+        lines = [
+            f"Tiempos de '{self.name}': {summary['segundos']:.2f} s en total, "
+            f"{summary['com']} llamadas COM."
+        ]
+        for entry in summary["etapas"]:
+            detail = [f"{entry['segundos']:.3f} s"]
+            if entry["veces"] > 1:
+                detail.append(f"{entry['veces']} veces")
+            if entry["elementos"] is not None:
+                detail.append(f"{entry['elementos']} elementos")
+            if entry["com"]:
+                detail.append(f"{entry['com']} COM")
+            indent = "  " * (entry["nivel"] + 1)
+            lines.append(f"{indent}{entry['etapa']}: {', '.join(detail)}")
+        return lines
+
+
+def start_run(name: str) -> RunProfile:
+    """
+    Abre una corrida en el hilo actual. Si ya había una (un trabajo ejecutado
+    en línea dentro de otro), queda en pausa hasta que esta se cierre.
+    """
+    profile = RunProfile(name)
+    profile._outer = getattr(_local, "profile", None)
+    _local.profile = profile
+    return profile
+
+
+def finish_run() -> Optional[RunProfile]:
+    """Cierra la corrida del hilo actual y la devuelve."""
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        return None
+    _local.profile = profile._outer
+    return profile.finish()
+
+
+def current_run() -> Optional[RunProfile]:
+    return getattr(_local, "profile", None)
+
+
+def span(stage: str, items: Optional[int] = None):
+    """Etapa medida de la corrida activa en este hilo (o un objeto vacío)."""
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        return _NULL_SPAN
+    return _Span(profile, stage, items)
+
+
+def add_items(n: int) -> None:
+    """Suma elementos a la etapa más interna en curso de este hilo."""
+    profile = getattr(_local, "profile", None)
+    if profile is not None and profile._stack:
+        profile._stack[-1].add_items(n)
+
+
+def traced(stage: str):
+    """Decorador: cada llamada a la función es una etapa 'stage'."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profile = getattr(_local, "profile", None)
+            if profile is None:
+                return fn(*args, **kwargs)
+            with _Span(profile, stage, None):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def write_run_summary(profile: RunProfile, folder: str = LOG_DIR) -> Optional[str]:
+    """
+    Agrega el resumen de la corrida a runs_AAAA-MM.jsonl en 'folder'.
+    Devuelve la ruta, o None si no se pudo escribir.
+    """
+    path = os.path.join(folder, f"runs_{datetime.now().strftime('%Y-%m')}.jsonl")
+    try:
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(profile.summary(), ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.warning(f"No se pudo guardar el resumen de la corrida: {e}")
+        return None
+    return path
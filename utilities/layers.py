@@ -1,5 +1,6 @@
 import logging
 from .cad_manager import cad
+from .snapshot import DrawingSnapshot, take_snapshot, KIND_LAYERS
 
 logger = logging.getLogger(__name__)
 
@@ -91,27 +92,28 @@ def delete_layer(layer_name: str) -> tuple:
         return False, error_msg
 
 
-def get_layers_status() -> list:
+def get_layers_status(snapshot: DrawingSnapshot = None) -> list:
     """
-    Realiza un escaneo completo y devuelve una lista de diccionarios con el estado de cada capa.
+    Devuelve una lista de diccionarios con el estado de cada capa.
+    Si se proporciona 'snapshot', usa su conteo de uso en lugar de recorrer el dibujo.
     Útil para poblar tablas en la interfaz gráfica.
     """
     if not cad.is_connected:
         return []
 
     all_layers = get_all_layers()
-    used_layers = set()
 
     try:
-        total_objects = cad.msp.Count
-        for i in range(total_objects):
-            obj = cad.msp.Item(i)
-            if hasattr(obj, "Layer"):
-                used_layers.add(obj.Layer.upper())
+        if snapshot is None:
+            snapshot = take_snapshot(kinds=(KIND_LAYERS,))
+        else:
+            snapshot.require(KIND_LAYERS)
+
+        used_layers = snapshot.layer_usage
 
         status_list = []
         for layer in all_layers:
-            en_uso = layer.upper() in used_layers
+            en_uso = used_layers.get(layer.upper(), 0) > 0
             status_list.append(
                 {"Nombre": layer, "Estado": "En Uso" if en_uso else "Vacía"}
             )
@@ -2,13 +2,16 @@ import logging
 import os
 from datetime import datetime
 
+# Carpeta del log mensual (y de los resúmenes de corridas, ver instrumentation)
+LOG_DIR = "logs"
+
 
 def setup_logger():
     """
     Configura el sistema de logging global de la aplicación.
     Debe llamarse una sola vez al inicio del programa (en main.py).
     """
-    log_dir = "logs"
+    log_dir = LOG_DIR
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
 
@@ -0,0 +1,355 @@
+"""
+Espejo en vivo del dibujo: una instantánea que se mantiene al día sola.
+
+Al arrancar recorre el ModelSpace una vez; después aplica los eventos
+ObjectAdded / ObjectModified / ObjectErased del documento (o, si el backend no
+ofrece eventos, sondea la semilla de handles) y actualiza de forma incremental
+la tabla de entidades, el conteo de uso por capa y los índices espaciales.
+
+Los extractores, el estado de capas y la numeración pueden leer del espejo
+(`live_mirror.snapshot()`) sin volver a recorrer el dibujo por COM. El espejo
+recuerda el documento sobre el que se inició; si el documento activo cambia,
+mirror_snapshot() lo detiene y los lectores vuelven a la caché o al dibujo.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .cad_manager import cad
+from .entity_reader import EntityReader
+from .snapshot import ALL_KINDS, DrawingSnapshot, _ingest
+from .spatial import DEFAULT_CELL_SIZE, GridIndex
+
+logger = logging.getLogger(__name__)
+
+MODE_EVENTS = "eventos"
+MODE_POLLING = "sondeo"
+
+# Colecciones de DrawingSnapshot que guardan registros por Handle
+_COLLECTIONS = ("blocks", "texts", "lines", "polylines")
+
+
+class LiveMirror:
+    """
+    Tabla de entidades sincronizada con el documento activo.
+
+    Por cada entidad del ModelSpace se recuerda su colección y su capa, así un
+    borrado o un cambio de capa se descuenta sin releer nada más; los borrados
+    llegan solo con el ObjectID, que se traduce a Handle con '_handle_of_id'.
+    El "Indice" de líneas y polilíneas es el orden de alta: conserva el orden
+    relativo del ModelSpace pero no se renumera tras un borrado.
+    Todas las operaciones toman un candado: los eventos se entregan en el hilo
+    de la sesión CAD (refresh() corre como trabajo de la sesión) y los trabajos
+    y la interfaz leen desde otros hilos.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.mode: Optional[str] = None
+        self.version = 0  # Se incrementa con cada cambio aplicado
+        self.document: Optional[str] = None  # Documento sobre el que se inició
+        self._lock = threading.RLock()
+        self._subscription = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._snapshot = DrawingSnapshot(ALL_KINDS)
+        self._entries: Dict[str, Tuple[Optional[str], str]] = {}
+        self._handle_of_id: Dict[int, str] = {}
+        self._next_index = 0
+        self._handle_seed = 0
+        self.block_index = GridIndex(self.cell_size)
+        self.text_index = GridIndex(self.cell_size)
+
+    @property
+    def running(self) -> bool:
+        return self.mode is not None
+
+    def follows_active_document(self) -> bool:
+        """True si el espejo está activo y se inició sobre el documento activo."""
+        return (
+            self.running
+            and self.document is not None
+            and _active_document() == self.document
+        )
+
+    # CICLO DE VIDA
+
+    def start(self) -> bool:
+        """Toma la instantánea inicial y se suscribe a eventos (o pasa a sondeo)."""
+        if not cad.is_connected:
+            logger.error("AutoCAD no está conectado.")
+            return False
+
+        self.stop()
+        with self._lock:
+            self._reset()
+            self.document = _active_document()
+            start = time.perf_counter()
+            reader = EntityReader()
+            total = cad.msp.Count
+            for i in range(total):
+                try:
+                    self._upsert(cad.msp.Item(i), reader)
+                except Exception:
+                    continue
+            self._handle_seed = self._read_handle_seed()
+
+        try:
+            self._subscription = cad.subscribe(self)
+            self.mode = MODE_EVENTS
+        except Exception as e:
+            logger.info(f"Eventos del documento no disponibles ({e}); se usa sondeo.")
+            self.mode = MODE_POLLING
+
+        logger.info(
+            f"Espejo en vivo iniciado ({self.mode}) en "
+            f"{time.perf_counter() - start:.2f}s: {self._snapshot.summary()}. "
+            f"{reader.summary()}."
+        )
+        return True
+
+    def stop(self) -> None:
+        if self._subscription is not None:
+            try:
+                self._subscription.close()
+            except Exception:
+                pass
+            self._subscription = None
+        self.mode = None
+        self.document = None
+
+    def refresh(self) -> None:
+        """Llamada periódica: entrega eventos pendientes o sondea cambios."""
+        if self.mode == MODE_EVENTS:
+            cad.pump_events()
+        elif self.mode == MODE_POLLING:
+            self.poll()
+
+    # LECTURA
+
+    def snapshot(self) -> DrawingSnapshot:
+        """
+        Copia consistente de la tabla actual. Los registros se comparten (los
+        extractores devuelven copias), solo se copian los diccionarios.
+        """
+        with self._lock:
+            copy = DrawingSnapshot(self._snapshot.kinds)
+            for name in _COLLECTIONS:
+                setattr(copy, name, dict(getattr(self._snapshot, name)))
+            copy.layer_usage = dict(self._snapshot.layer_usage)
+            copy.total_entities = self._snapshot.total_entities
+            return copy
+
+    # ACTUALIZACIÓN INCREMENTAL
+
+    def _upsert(self, obj, reader: EntityReader = None) -> None:
+        """
+        Lee (o relee) una entidad y reemplaza su registro. Una modificación
+        conserva la posición y el Indice que la entidad tenía en el ModelSpace.
+        """
+        reader = reader or EntityReader()
+        single = DrawingSnapshot(ALL_KINDS)
+        _ingest(single, reader, obj, self._next_index)
+
+        collection, record = None, None
+        for name in _COLLECTIONS:
+            records = getattr(single, name)
+            if records:
+                collection, record = name, next(iter(records.values()))
+                break
+        handle = record["Handle"] if record is not None else obj.Handle
+        (layer_key,) = single.layer_usage
+        object_id = obj.ObjectID
+
+        with self._lock:
+            snapshot = self._snapshot
+            previous = self._entries.get(handle)
+            if previous is None:
+                self._next_index += 1
+                snapshot.total_entities += 1
+            else:
+                old_collection, old_layer = previous
+                self._uncount_layer(old_layer)
+                if old_collection is not None:
+                    old = getattr(snapshot, old_collection)
+                    old_record = old.get(handle)
+                    if record is not None and "Indice" in record and old_record:
+                        record["Indice"] = old_record.get("Indice", record["Indice"])
+                    if old_collection != collection:
+                        old.pop(handle, None)
+
+            self._entries[handle] = (collection, layer_key)
+            self._handle_of_id[object_id] = handle
+            snapshot.layer_usage[layer_key] = snapshot.layer_usage.get(layer_key, 0) + 1
+
+            if collection is not None:
+                # Reasignar una clave existente conserva su orden en el diccionario
+                getattr(snapshot, collection)[handle] = record
+                index = self._index_of(collection)
+                if index is not None:
+                    index.insert(handle, (record["X"], record["Y"]))
+            self.version += 1
+
+    def _index_of(self, collection: Optional[str]) -> Optional[GridIndex]:
+        if collection == "blocks":
+            return self.block_index
+        if collection == "texts":
+            return self.text_index
+        return None
+
+    def _uncount_layer(self, layer_key: str) -> None:
+        usage = self._snapshot.layer_usage
+        usage[layer_key] = usage.get(layer_key, 0) - 1
+        if usage[layer_key] <= 0:
+            del usage[layer_key]
+
+    def _discard(self, handle: str) -> bool:
+        """Quita una entidad borrada. Devuelve False si no estaba en el espejo."""
+        entry = self._entries.pop(handle, None)
+        if entry is None:
+            return False
+        collection, layer_key = entry
+
+        self._snapshot.total_entities -= 1
+        self._uncount_layer(layer_key)
+        if collection is not None:
+            getattr(self._snapshot, collection).pop(handle, None)
+            index = self._index_of(collection)
+            if index is not None:
+                index.remove(handle)
+        self.version += 1
+        return True
+
+    def _is_model_space(self, obj) -> bool:
+        try:
+            return obj.OwnerID == cad.msp.ObjectID
+        except Exception:
+            return False
+
+    def _owning_entity(self, obj):
+        """
+        Entidad que hay que releer por un evento: editar un atributo dispara
+        ObjectModified sobre el AttributeReference, cuyo dueño es el bloque.
+        """
+        try:
+            if obj.EntityName == "AcDbAttribute":
+                return cad.late_bind(cad.doc.ObjectIdToObject(obj.OwnerID))
+        except Exception:
+            return None
+        return obj
+
+    # RECEPTOR DE EVENTOS (ver CADManager.subscribe)
+
+    def on_object_added(self, obj) -> None:
+        if self._is_model_space(obj):
+            try:
+                self._upsert(obj)
+            except Exception as e:
+                logger.debug(f"Espejo: no se pudo leer una entidad nueva: {e}")
+
+    def on_object_modified(self, obj) -> None:
+        # También llegan capas, diccionarios o entidades de otros espacios
+        obj = self._owning_entity(obj)
+        if obj is not None and self._is_model_space(obj):
+            try:
+                self._upsert(obj)
+            except Exception as e:
+                logger.debug(f"Espejo: no se pudo releer una entidad: {e}")
+
+    def on_object_erased(self, object_id) -> None:
+        with self._lock:
+            handle = self._handle_of_id.pop(object_id, None)
+            if handle is not None:
+                self._discard(handle)
+
+    # SONDEO (sin eventos)
+
+    def _read_handle_seed(self) -> int:
+        try:
+            return int(str(cad.doc.GetVariable("HANDSEED")), 16)
+        except Exception:
+            return 0
+
+    def poll(self) -> int:
+        """
+        Detecta altas por la diferencia de semilla de handles (cada handle nuevo
+        se resuelve con HandleToObject) y bajas por la diferencia de conteo.
+        Las modificaciones in situ solo se detectan con eventos.
+
+        Returns:
+            Cantidad de cambios aplicados.
+        """
+        if not cad.is_connected:
+            return 0
+
+        seed = self._read_handle_seed()
+        changes = 0
+        for value in range(self._handle_seed, seed):
+            handle = f"{value:X}"
+            if handle in self._entries:
+                continue
+            try:
+                obj = cad.late_bind(cad.doc.HandleToObject(handle))
+            except Exception:
+                continue  # Objeto borrado o que no es una entidad
+            if self._is_model_space(obj):
+                try:
+                    self._upsert(obj)
+                    changes += 1
+                except Exception:
+                    continue
+        self._handle_seed = max(self._handle_seed, seed)
+
+        # Si el conteo no coincide hubo borrados: se reconcilia por handles
+        if cad.msp.Count != len(self._entries):
+            vivos = set()
+            for i in range(cad.msp.Count):
+                try:
+                    vivos.add(cad.msp.Item(i).Handle)
+                except Exception:
+                    continue
+            with self._lock:
+                for handle in [h for h in self._entries if h not in vivos]:
+                    self._discard(handle)
+                    changes += 1
+                self._handle_of_id = {
+                    oid: h
+                    for oid, h in self._handle_of_id.items()
+                    if h in self._entries
+                }
+
+        return changes
+
+
+def _active_document() -> Optional[str]:
+    """Ruta (o nombre, si no se guardó) del documento conectado, o None."""
+    if not cad.is_connected:
+        return None
+    try:
+        return cad.doc.FullName or cad.doc.Name
+    except Exception:
+        return None
+
+
+# Instancia global lista para importar
+live_mirror = LiveMirror()
+
+
+def mirror_snapshot() -> Optional[DrawingSnapshot]:
+    """
+    Instantánea del espejo si está activo sobre el documento activo, o None.
+    Un espejo de otro documento (el usuario cambió de dibujo) se detiene.
+    """
+    if not live_mirror.running:
+        return None
+    if not live_mirror.follows_active_document():
+        logger.info(
+            f"El espejo en vivo es de '{live_mirror.document}', no del documento "
+            "activo: se detiene."
+        )
+        live_mirror.stop()
+        return None
+    return live_mirror.snapshot()
@@ -0,0 +1,67 @@
+import logging
+from typing import List, Optional, Tuple
+from .geometry import calculate_distance
+from .instrumentation import add_items, traced
+from .spatial import GridIndex
+
+logger = logging.getLogger(__name__)
+Point2D = Tuple[float, float]
+
+
+@traced("assign_poles_to_path")
+def assign_poles_to_path(
+    path: List[Point2D],
+    poles: List[dict],
+    radius: float = 1.5,
+    reference_point: Optional[Point2D] = None,
+) -> Tuple[List[dict], List[dict]]:
+    """
+    Convierte un recorrido de red (p. ej. el resultado del DFS) y un conjunto
+    de postes en el orden de numeración.
+
+    Etapa 1: por cada vértice del recorrido se toman todos los postes libres a
+    una distancia <= radius, del más cercano al más lejano.
+    Etapa 2: los postes que no quedaron cerca de ningún vértice (rezagados) se
+    ordenan por cercanía al último vértice del recorrido (o a reference_point
+    si el recorrido está vacío).
+
+    Los postes se indexan en una rejilla por su Handle, así cada vértice solo
+    revisa los postes vecinos y retirarlos cuesta O(1).
+
+    Returns:
+        Tuple(en_ruta, rezagados): Listas de los diccionarios originales (sin copiar).
+    """
+    add_items(len(poles))
+    indice = GridIndex(cell_size=max(radius, 1.0))
+    por_clave = {}
+    claves = []
+    for i, poste in enumerate(poles):
+        clave = poste.get("Handle", i)
+        if clave in por_clave:
+            clave = (clave, i)  # Handle repetido: se desambigua por posición
+        por_clave[clave] = poste
+        claves.append(clave)
+        indice.insert(clave, (poste["X"], poste["Y"]))
+
+    # ETAPA 1: RECORRIDO TOPOLÓGICO (NODOS MÚLTIPLES)
+    en_ruta = []
+    for pt_grafo in path:
+        # within() ya devuelve los postes por cercanía (desempate: orden original)
+        for _, clave, _ in indice.within(pt_grafo, radius):
+            en_ruta.append(por_clave[clave])
+            indice.remove(clave)
+
+    # ETAPA 2: BARRIDO DE POSTES REZAGADOS
+    rezagados = [por_clave[clave] for clave in claves if clave in indice]
+    if rezagados:
+        punto_ref = path[-1] if path else reference_point
+        if punto_ref is not None:
+            rezagados.sort(
+                key=lambda p: calculate_distance((p["X"], p["Y"]), punto_ref)
+            )
+
+    logger.info(
+        f"Asignación sobre el recorrido: {len(en_ruta)} postes en ruta, "
+        f"{len(rezagados)} rezagados."
+    )
+    return en_ruta, rezagados
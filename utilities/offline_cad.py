@@ -0,0 +1,797 @@
+"""
+Backend CAD offline: réplica en Python puro del modelo de objetos COM de AutoCAD.
+
+Permite ejecutar extractores, numeración y benchmarks sin una instancia de
+AutoCAD (Linux, CI, equipos de cálculo). El dibujo se carga desde un fixture
+JSON o DXF (ASCII) y todas las escrituras quedan registradas en memoria
+(`OfflineDocument.writes`).
+"""
+
+import json
+import math
+import logging
+from typing import Dict, List, Optional
+
+from .selection import compile_filter
+
+logger = logging.getLogger(__name__)
+
+
+class OfflineAttribute:
+    """Equivalente a AcDbAttribute: TagString/TextString y su bloque dueño."""
+
+    def __init__(self, owner: "OfflineEntity", tag: str, text: str = ""):
+        self._owner = owner
+        self.EntityName = "AcDbAttribute"
+        self.ObjectID = owner._document._next_object_id()
+        self.OwnerID = owner.ObjectID
+        self.TagString = tag
+        self._text = text
+
+    @property
+    def TextString(self) -> str:
+        return self._text
+
+    @TextString.setter
+    def TextString(self, value: str) -> None:
+        self._text = value
+        self._owner._record("SetAttribute", tag=self.TagString, value=value)
+        # Como en AutoCAD, ObjectModified llega con el atributo, no con el bloque
+        self._owner._document._emit("modified", self)
+
+    def Update(self) -> None:
+        self._owner._record("Update", tag=self.TagString)
+
+
+class OfflineEntity:
+    """
+    Entidad genérica del ModelSpace. Las asignaciones a propiedades públicas
+    (p. ej. `obj.Layer = ...`) se registran en el documento como escrituras.
+    """
+
+    def __init__(
+        self, document: "OfflineDocument", entity_name: str, layer: Optional[str]
+    ):
+        self._document = document
+        self._erased = False
+        self.EntityName = entity_name
+        self.ObjectID = document._next_object_id()
+        self.OwnerID = document.ModelSpace.ObjectID
+        self.Handle = document._next_handle()
+        # Como en AutoCAD, las entidades nuevas nacen en la capa activa
+        self.Layer = layer if layer is not None else document.ActiveLayer.Name
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith("_") and getattr(self, "_tracking", False):
+            self._record("SetProperty", prop=name, value=value)
+            self._document._emit("modified", self)
+
+    def _record(self, op: str, **data) -> None:
+        self._document._record(op, handle=self.Handle, **data)
+
+    def _track(self) -> "OfflineEntity":
+        """Activa el registro de escrituras una vez construida la entidad."""
+        self._tracking = True
+        return self
+
+    def Delete(self) -> None:
+        self._document.ModelSpace._remove(self)
+        self._record("Delete")
+        self._document._emit("erased", self.ObjectID)
+
+
+class OfflineLine(OfflineEntity):
+    def __init__(self, document, layer, start, end):
+        super().__init__(document, "AcDbLine", layer)
+        self.StartPoint = _point3(start)
+        self.EndPoint = _point3(end)
+
+
+class OfflinePolyline(OfflineEntity):
+    def __init__(self, document, layer, coordinates, entity_name="AcDbPolyline"):
+        super().__init__(document, entity_name, layer)
+        self.Coordinates = tuple(float(c) for c in coordinates)
+
+
+class OfflineText(OfflineEntity):
+    def __init__(self, document, layer, text, insertion, entity_name="AcDbText"):
+        super().__init__(document, entity_name, layer)
+        self.TextString = text
+        self.InsertionPoint = _point3(insertion)
+
+
+class OfflineBlockReference(OfflineEntity):
+    def __init__(
+        self, document, layer, name, insertion, scale=1.0, rotation=0.0, attributes=None
+    ):
+        super().__init__(document, "AcDbBlockReference", layer)
+        self.Name = name
+        self.EffectiveName = name
+        self.InsertionPoint = _point3(insertion)
+        self.XScaleFactor = self.YScaleFactor = self.ZScaleFactor = scale
+        self.Rotation = rotation
+        self._attributes = [
+            OfflineAttribute(self, tag, text)
+            for tag, text in (attributes or {}).items()
+        ]
+
+    @property
+    def HasAttributes(self) -> bool:
+        return bool(self._attributes)
+
+    def GetAttributes(self) -> tuple:
+        return tuple(self._attributes)
+
+
+class OfflineModelSpace:
+    """Colección ModelSpace: Count, Item(i), iteración y métodos Add*/InsertBlock."""
+
+    def __init__(self, document: "OfflineDocument"):
+        self._document = document
+        self._entities: List[OfflineEntity] = []
+        self.ObjectID = document._next_object_id()
+
+    @property
+    def Count(self) -> int:
+        return len(self._entities)
+
+    def Item(self, index: int) -> OfflineEntity:
+        return self._entities[index]
+
+    def __iter__(self):
+        return iter(list(self._entities))
+
+    def _append(self, entity: OfflineEntity) -> OfflineEntity:
+        self._entities.append(entity)
+        self._document._by_handle[entity.Handle] = entity
+        self._document._layer_for(entity.Layer)
+        entity._track()
+        self._document._emit("added", entity)
+        return entity
+
+    def _remove(self, entity: OfflineEntity) -> None:
+        self._entities.remove(entity)
+        self._document._by_handle.pop(entity.Handle, None)
+        entity._erased = True
+
+    def AddLine(self, start, end, layer: Optional[str] = None) -> OfflineLine:
+        return self._append(OfflineLine(self._document, layer, start, end))
+
+    def AddLightWeightPolyline(
+        self, coordinates, layer: Optional[str] = None
+    ) -> OfflinePolyline:
+        return self._append(OfflinePolyline(self._document, layer, coordinates))
+
+    def AddPolyline(self, coordinates, layer: Optional[str] = None) -> OfflinePolyline:
+        """Polilínea 2D 'pesada' (AcDb2dPolyline): coordenadas x, y, z por vértice."""
+        return self._append(
+            OfflinePolyline(self._document, layer, coordinates, "AcDb2dPolyline")
+        )
+
+    def Add3DPoly(self, coordinates, layer: Optional[str] = None) -> OfflinePolyline:
+        return self._append(
+            OfflinePolyline(self._document, layer, coordinates, "AcDb3dPolyline")
+        )
+
+    def AddText(
+        self, text: str, insertion, height: float = 1.0, layer: Optional[str] = None
+    ):
+        return self._append(OfflineText(self._document, layer, text, insertion))
+
+    def AddMText(self, insertion, width: float, text: str, layer: Optional[str] = None):
+        return self._append(
+            OfflineText(self._document, layer, text, insertion, "AcDbMText")
+        )
+
+    def InsertBlock(
+        self,
+        insertion,
+        name: str,
+        xscale: float = 1.0,
+        yscale: float = 1.0,
+        zscale: float = 1.0,
+        rotation: float = 0.0,
+        layer: Optional[str] = None,
+        attributes: Optional[dict] = None,
+    ) -> OfflineBlockReference:
+        """
+        Inserta una referencia de bloque. Como en AutoCAD, los atributos se
+        crean a partir de la definición del bloque (ATTDEF) si existe.
+        """
+        tags = self._document.block_definitions.get(name.upper(), [])
+        values = {tag: "" for tag in tags}
+        values.update(attributes or {})
+
+        block = OfflineBlockReference(
+            self._document, layer, name, insertion, xscale, rotation, values
+        )
+        self._document._record(
+            "InsertBlock",
+            handle=block.Handle,
+            block=name,
+            point=tuple(block.InsertionPoint),
+        )
+        return self._append(block)
+
+
+class OfflineLayer:
+    def __init__(
+        self, layers: "OfflineLayers", name: str, color: int = 7, lineweight: int = -3
+    ):
+        self._layers = layers
+        self.Name = name
+        self.Color = color
+        self.Lineweight = lineweight
+        self._tracking = True
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith("_") and getattr(self, "_tracking", False):
+            self._layers._document._record(
+                "SetLayerProperty", layer=self.Name, prop=name, value=value
+            )
+
+    def Delete(self) -> None:
+        self._layers._delete(self)
+
+
+class OfflineLayers:
+    """Colección Layers: Item(nombre) insensible a mayúsculas, Add, iteración."""
+
+    def __init__(self, document: "OfflineDocument"):
+        self._document = document
+        self._layers: Dict[str, OfflineLayer] = {}
+
+    @property
+    def Count(self) -> int:
+        return len(self._layers)
+
+    def __iter__(self):
+        return iter(list(self._layers.values()))
+
+    def Item(self, name: str) -> OfflineLayer:
+        try:
+            return self._layers[name.upper()]
+        except KeyError:
+            raise KeyError(f"La capa '{name}' no existe.") from None
+
+    def Add(self, name: str) -> OfflineLayer:
+        key = name.upper()
+        if key not in self._layers:
+            self._layers[key] = OfflineLayer(self, name)
+            self._document._record("AddLayer", layer=name)
+        return self._layers[key]
+
+    def _delete(self, layer: OfflineLayer) -> None:
+        self._layers.pop(layer.Name.upper(), None)
+        self._document._record("DeleteLayer", layer=layer.Name)
+
+
+class OfflineSelectionSet:
+    """SelectionSet: solo el modo 'todo el dibujo' (acSelectionSetAll) con filtro DXF."""
+
+    def __init__(self, sets: "OfflineSelectionSets", name: str):
+        self._sets = sets
+        self.Name = name
+        self._items: List[OfflineEntity] = []
+
+    @property
+    def Count(self) -> int:
+        return len(self._items)
+
+    def Item(self, index: int) -> OfflineEntity:
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def Select(
+        self, mode, point1=None, point2=None, filter_type=None, filter_data=None
+    ):
+        if mode != 5:
+            raise NotImplementedError("Offline solo soporta acSelectionSetAll (5).")
+        accepts = compile_filter(list(filter_type or []), list(filter_data or []))
+        self._items = [obj for obj in self._sets._document.ModelSpace if accepts(obj)]
+
+    def Clear(self) -> None:
+        self._items = []
+
+    def Delete(self) -> None:
+        self._sets._sets.pop(self.Name.upper(), None)
+
+
+class OfflineSelectionSets:
+    def __init__(self, document: "OfflineDocument"):
+        self._document = document
+        self._sets: Dict[str, OfflineSelectionSet] = {}
+
+    @property
+    def Count(self) -> int:
+        return len(self._sets)
+
+    def Item(self, name: str) -> OfflineSelectionSet:
+        try:
+            return self._sets[name.upper()]
+        except KeyError:
+            raise KeyError(f"El SelectionSet '{name}' no existe.") from None
+
+    def Add(self, name: str) -> OfflineSelectionSet:
+        # Igual que AutoCAD: no se puede repetir el nombre
+        if name.upper() in self._sets:
+            raise ValueError(f"El SelectionSet '{name}' ya existe.")
+        selection = OfflineSelectionSet(self, name)
+        self._sets[name.upper()] = selection
+        return selection
+
+
+class OfflineDocument:
+    """
+    Documento en memoria con ModelSpace, Layers y definiciones de bloque.
+    Cada escritura (InsertBlock, cambio de propiedad, atributos, capas) se
+    añade a `writes` como diccionario {"op": ..., ...}.
+    """
+
+    def __init__(self, name: str = "offline.dwg"):
+        self.Name = name
+        self.FullName = name
+        self.writes: List[dict] = []
+        self.block_definitions: Dict[str, List[str]] = {}
+        self._handle_seed = 0x100
+        self._object_id_seed = 1
+        self._by_handle: Dict[str, OfflineEntity] = {}
+        # Suscriptores de eventos (ObjectAdded/Modified/Erased), ver OfflineBackend.subscribe
+        self._event_sinks: list = []
+        self._modified = False
+        # Cambios de vista (zoom/encuadre): DBMOD bit 4, no tocan entidades
+        self._view_changed = False
+        self._saved_at = 0.0
+        self.Layers = OfflineLayers(self)
+        self.ModelSpace = OfflineModelSpace(self)
+        self.SelectionSets = OfflineSelectionSets(self)
+        self._active_layer = self.Layers.Add("0")
+        self._reset_history()
+
+    @property
+    def ActiveLayer(self) -> "OfflineLayer":
+        return self._active_layer
+
+    @ActiveLayer.setter
+    def ActiveLayer(self, layer: "OfflineLayer") -> None:
+        self._active_layer = layer
+        self._record("SetActiveLayer", layer=layer.Name)
+
+    def _next_handle(self) -> str:
+        handle = f"{self._handle_seed:X}"
+        self._handle_seed += 1
+        return handle
+
+    def _next_object_id(self) -> int:
+        self._object_id_seed += 1
+        return self._object_id_seed
+
+    def _record(self, op: str, **data) -> None:
+        self.writes.append({"op": op, **data})
+        self._modified = True
+
+    def _emit(self, event: str, arg) -> None:
+        """Eventos sintéticos equivalentes a ObjectAdded/ObjectModified/ObjectErased."""
+        for sink in list(self._event_sinks):
+            if event == "added":
+                sink.on_object_added(arg)
+            elif event == "modified":
+                sink.on_object_modified(arg)
+            else:
+                sink.on_object_erased(arg)
+
+    def _reset_history(self) -> None:
+        """La carga inicial no cuenta como escritura ni como cambio sin guardar."""
+        self.writes.clear()
+        self._modified = False
+
+    def _adopt_handle(self, entity: OfflineEntity, handle: str) -> None:
+        """Conserva el Handle original de un fixture sin chocar con los nuevos."""
+        self._by_handle.pop(entity.Handle, None)
+        entity.Handle = handle
+        self._by_handle[handle] = entity
+        try:
+            self._handle_seed = max(self._handle_seed, int(handle, 16) + 1)
+        except ValueError:
+            pass
+
+    def _layer_for(self, name: str) -> OfflineLayer:
+        try:
+            return self.Layers.Item(name)
+        except KeyError:
+            layer = OfflineLayer(self.Layers, name)
+            self.Layers._layers[name.upper()] = layer
+            return layer
+
+    def define_block(self, name: str, attribute_tags: List[str] = None) -> None:
+        """Registra una definición de bloque con sus etiquetas de atributo (ATTDEF)."""
+        self.block_definitions[name.upper()] = list(attribute_tags or [])
+
+    def Regen(self, which: int = 1) -> None:
+        self._record("Regen")
+
+    def HandleToObject(self, handle: str) -> OfflineEntity:
+        try:
+            return self._by_handle[handle.upper()]
+        except KeyError:
+            raise KeyError(f"No existe un objeto con el Handle '{handle}'.") from None
+
+    def ObjectIdToObject(self, object_id: int) -> OfflineEntity:
+        for entity in self._by_handle.values():
+            if entity.ObjectID == object_id:
+                return entity
+        raise KeyError(f"No existe un objeto con el ObjectID {object_id}.")
+
+    def Save(self) -> None:
+        self._modified = False
+        self._view_changed = False
+        self._saved_at += 1.0
+
+    def GetVariable(self, name: str):
+        """Subconjunto de variables de sistema usadas para la huella del dibujo."""
+        name = name.upper()
+        if name == "HANDSEED":
+            return f"{self._handle_seed:X}"
+        if name == "DBMOD":
+            return (1 if self._modified else 0) | (4 if self._view_changed else 0)
+        if name == "TDUPDATE":
+            return self._saved_at
+        raise KeyError(f"Variable de sistema no soportada offline: {name}")
+
+
+class OfflineApplication:
+    def __init__(self, document: OfflineDocument):
+        self.ActiveDocument = document
+        self.Visible = False
+
+    def ZoomExtents(self) -> None:
+        self.ActiveDocument._view_changed = True
+
+
+class OfflineSubscription:
+    def __init__(self, document: OfflineDocument, sink):
+        self._document = document
+        self._sink = sink
+
+    def close(self) -> None:
+        if self._sink in self._document._event_sinks:
+            self._document._event_sinks.remove(self._sink)
+
+
+class OfflineBackend:
+    """
+    Backend sin AutoCAD: expone un OfflineDocument con la misma interfaz COM
+    que usan los módulos de `utilities`.
+
+    Uso:
+        cad.set_backend(OfflineBackend.from_json("fixtures/plano.json"))
+        cad.connect()
+
+    Con events=False el backend se comporta como un AutoCAD sin eventos
+    disponibles (subscribe lanza NotImplementedError).
+    """
+
+    name = "offline"
+
+    def __init__(self, document: OfflineDocument = None, events: bool = True):
+        self.document = document or OfflineDocument()
+        self.app = OfflineApplication(self.document)
+        self.events = events
+
+    @classmethod
+    def from_json(cls, path: str) -> "OfflineBackend":
+        return cls(load_json(path))
+
+    @classmethod
+    def from_dxf(cls, path: str) -> "OfflineBackend":
+        return cls(load_dxf(path))
+
+    def connect(self):
+        return self.app, self.document
+
+    def variant_point(self, x: float, y: float, z: float = 0.0):
+        return (x, y, z)
+
+    def select_all(self, selection, codes: list, values: list) -> None:
+        selection.Select(5, None, None, codes, values)
+
+    def bind_entity(self, obj, entity_name: str):
+        return obj
+
+    def late_bind(self, obj):
+        return obj
+
+    def subscribe(self, document, sink) -> "OfflineSubscription":
+        if not self.events:
+            raise NotImplementedError("Eventos deshabilitados en este backend offline.")
+        document._event_sinks.append(sink)
+        return OfflineSubscription(document, sink)
+
+    def pump_events(self) -> None:
+        pass  # Los eventos sintéticos se entregan en el acto
+
+    def init_thread(self) -> None:
+        pass
+
+    def release_thread(self) -> None:
+        pass
+
+
+# CARGA Y GUARDADO DE FIXTURES
+
+
+def _point3(point) -> tuple:
+    coords = [float(c) for c in point]
+    while len(coords) < 3:
+        coords.append(0.0)
+    return tuple(coords[:3])
+
+
+def document_from_dict(data: dict) -> OfflineDocument:
+    """
+    Construye un documento a partir de un diccionario con el formato:
+        {
+            "name": "plano.dwg",
+            "layers": [{"name": "RED", "color": 3}],
+            "blocks": {"UBICACION POSTES UTM": ["000"]},
+            "entities": [
+                {"type": "AcDbLine", "layer": "RED", "start": [0, 0], "end": [10, 0]},
+                {"type": "AcDbPolyline", "layer": "RED", "coordinates": [0, 0, 5, 5]},
+                {"type": "AcDbText", "layer": "COD", "text": "P-1", "insertion": [1, 1]},
+                {"type": "AcDbBlockReference", "layer": "POSTES", "name": "POSTE_C_9",
+                 "insertion": [0, 0], "rotation": 0.0, "attributes": {"TAG": "VAL"}}
+            ]
+        }
+    """
+    doc = OfflineDocument(data.get("name", "offline.dwg"))
+
+    for layer_data in data.get("layers", []):
+        layer = doc.Layers.Add(layer_data["name"])
+        layer.Color = layer_data.get("color", 7)
+        layer.Lineweight = layer_data.get("lineweight", -3)
+
+    for block_name, tags in data.get("blocks", {}).items():
+        doc.define_block(block_name, tags)
+
+    msp = doc.ModelSpace
+    for ent in data.get("entities", []):
+        etype = ent.get("type")
+        layer = ent.get("layer", "0")
+
+        if etype == "AcDbLine":
+            obj = msp.AddLine(ent["start"], ent["end"], layer=layer)
+        elif etype == "AcDbPolyline":
+            obj = msp.AddLightWeightPolyline(ent["coordinates"], layer=layer)
+        elif etype == "AcDb2dPolyline":
+            obj = msp.AddPolyline(ent["coordinates"], layer=layer)
+        elif etype == "AcDb3dPolyline":
+            obj = msp.Add3DPoly(ent["coordinates"], layer=layer)
+        elif etype == "AcDbText":
+            obj = msp.AddText(ent.get("text", ""), ent["insertion"], layer=layer)
+        elif etype == "AcDbMText":
+            obj = msp.AddMText(ent["insertion"], 0.0, ent.get("text", ""), layer=layer)
+        elif etype == "AcDbBlockReference":
+            scale = ent.get("scale", 1.0)
+            obj = msp.InsertBlock(
+                ent["insertion"],
+                ent["name"],
+                scale,
+                scale,
+                scale,
+                ent.get("rotation", 0.0),
+                layer=layer,
+                attributes=ent.get("attributes"),
+            )
+        else:
+            logger.debug(f"Tipo de entidad no soportado en fixture: {etype}")
+            continue
+
+        if "handle" in ent:
+            doc._adopt_handle(obj, ent["handle"])
+
+    # La carga no cuenta como escritura del usuario
+    doc._reset_history()
+    return doc
+
+
+def document_to_dict(doc: OfflineDocument) -> dict:
+    """Serializa un documento al formato de `document_from_dict`."""
+    entities = []
+    for obj in doc.ModelSpace:
+        ent = {"type": obj.EntityName, "layer": obj.Layer, "handle": obj.Handle}
+        if isinstance(obj, OfflineLine):
+            ent["start"] = list(obj.StartPoint)
+            ent["end"] = list(obj.EndPoint)
+        elif isinstance(obj, OfflinePolyline):
+            ent["coordinates"] = list(obj.Coordinates)
+        elif isinstance(obj, OfflineText):
+            ent["text"] = obj.TextString
+            ent["insertion"] = list(obj.InsertionPoint)
+        elif isinstance(obj, OfflineBlockReference):
+            ent["name"] = obj.Name
+            ent["insertion"] = list(obj.InsertionPoint)
+            ent["rotation"] = obj.Rotation
+            ent["scale"] = obj.XScaleFactor
+            ent["attributes"] = {a.TagString: a.TextString for a in obj.GetAttributes()}
+        entities.append(ent)
+
+    return {
+        "name": doc.Name,
+        "layers": [
+            {"name": layer.Name, "color": layer.Color, "lineweight": layer.Lineweight}
+            for layer in doc.Layers
+        ],
+        "blocks": dict(doc.block_definitions),
+        "entities": entities,
+    }
+
+
+def load_json(path: str) -> OfflineDocument:
+    with open(path, "r", encoding="utf-8") as f:
+        doc = document_from_dict(json.load(f))
+    logger.info(f"Fixture JSON cargado: {path} ({doc.ModelSpace.Count} entidades)")
+    return doc
+
+
+def save_json(doc: OfflineDocument, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document_to_dict(doc), f, ensure_ascii=False)
+
+
+def _read_dxf_tags(path: str):
+    """Genera pares (código_de_grupo, valor) de un DXF ASCII."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        lines = f.read().splitlines()
+    for i in range(0, len(lines) - 1, 2):
+        yield int(lines[i].strip()), lines[i + 1].strip()
+
+
+def _group_dxf_records(tags) -> List[list]:
+    """Agrupa los tags en registros que empiezan con código 0."""
+    records = []
+    current = None
+    for code, value in tags:
+        if code == 0:
+            current = [(0, value)]
+            records.append(current)
+        elif current is not None:
+            current.append((code, value))
+    return records
+
+
+def _first(record: list, code: int, default=None):
+    for c, v in record:
+        if c == code:
+            return v
+    return default
+
+
+def _dxf_point(record: list, base: int = 10) -> tuple:
+    return (
+        float(_first(record, base, 0.0)),
+        float(_first(record, base + 10, 0.0)),
+        float(_first(record, base + 20, 0.0)),
+    )
+
+
+def load_dxf(path: str) -> OfflineDocument:
+    """
+    Carga un DXF ASCII con soporte para LINE, LWPOLYLINE, POLYLINE/VERTEX,
+    TEXT, MTEXT e INSERT/ATTRIB, además de la tabla LAYER y los ATTDEF de BLOCKS.
+    """
+    records = _group_dxf_records(_read_dxf_tags(path))
+    doc = OfflineDocument(path)
+    msp = doc.ModelSpace
+
+    section = None
+    current_block = None
+    pending = None  # Entidad compuesta en curso (POLYLINE o INSERT con atributos)
+
+    for record in records:
+        kind = record[0][1]
+
+        if kind == "SECTION":
+            section = _first(record, 2)
+            continue
+        if kind == "ENDSEC":
+            section = None
+            continue
+
+        if section == "TABLES" and kind == "LAYER":
+            name = _first(record, 2)
+            if name:
+                layer = doc.Layers.Add(name)
+                layer.Color = abs(int(_first(record, 62, 7)))
+                layer.Lineweight = int(_first(record, 370, -3))
+
+        elif section == "BLOCKS":
+            if kind == "BLOCK":
+                current_block = _first(record, 2, "")
+                doc.define_block(current_block, [])
+            elif kind == "ATTDEF" and current_block is not None:
+                doc.block_definitions[current_block.upper()].append(_first(record, 2))
+            elif kind == "ENDBLK":
+                current_block = None
+
+        elif section == "ENTITIES":
+            layer = _first(record, 8, "0")
+
+            if kind == "VERTEX" and pending and pending["kind"] == "POLYLINE":
+                pending["coords"].extend(_dxf_point(record))
+                continue
+            if kind == "ATTRIB" and pending and pending["kind"] == "INSERT":
+                pending["attributes"][_first(record, 2)] = _first(record, 1, "")
+                continue
+            if kind == "SEQEND" and pending:
+                _flush_dxf_pending(msp, pending)
+                pending = None
+                continue
+
+            if kind == "LINE":
+                msp.AddLine(_dxf_point(record, 10), _dxf_point(record, 11), layer=layer)
+            elif kind == "LWPOLYLINE":
+                xs = [float(v) for c, v in record if c == 10]
+                ys = [float(v) for c, v in record if c == 20]
+                coords = [c for xy in zip(xs, ys) for c in xy]
+                msp.AddLightWeightPolyline(coords, layer=layer)
+            elif kind == "POLYLINE":
+                is_3d = int(_first(record, 70, 0)) & 8
+                pending = {
+                    "kind": "POLYLINE",
+                    "layer": layer,
+                    "is_3d": is_3d,
+                    "coords": [],
+                }
+            elif kind == "TEXT":
+                msp.AddText(_first(record, 1, ""), _dxf_point(record), layer=layer)
+            elif kind == "MTEXT":
+                # Las MTEXT largas se parten en códigos 3 seguidos del 1 final
+                text = "".join(v for c, v in record if c == 3) + _first(record, 1, "")
+                msp.AddMText(_dxf_point(record), 0.0, text, layer=layer)
+            elif kind == "INSERT":
+                insert = {
+                    "kind": "INSERT",
+                    "layer": layer,
+                    "name": _first(record, 2, ""),
+                    "point": _dxf_point(record),
+                    "scale": float(_first(record, 41, 1.0)),
+                    "rotation": math.radians(float(_first(record, 50, 0.0))),
+                    "attributes": {},
+                }
+                if int(_first(record, 66, 0)):
+                    pending = insert
+                else:
+                    _flush_dxf_pending(msp, insert)
+
+    doc._reset_history()
+    logger.info(f"Fixture DXF cargado: {path} ({msp.Count} entidades)")
+    return doc
+
+
+def _flush_dxf_pending(msp: OfflineModelSpace, pending: dict) -> None:
+    if pending["kind"] == "POLYLINE":
+        if pending["is_3d"]:
+            msp.Add3DPoly(pending["coords"], layer=pending["layer"])
+        else:
+            msp.AddPolyline(pending["coords"], layer=pending["layer"])
+    else:
+        block = msp.InsertBlock(
+            pending["point"],
+            pending["name"],
+            pending["scale"],
+            pending["scale"],
+            pending["scale"],
+            pending["rotation"],
+            layer=pending["layer"],
+        )
+        # Los valores de ATTRIB prevalecen sobre los ATTDEF de la definición
+        existing = {a.TagString.upper(): a for a in block.GetAttributes()}
+        for tag, text in pending["attributes"].items():
+            if tag.upper() in existing:
+                existing[tag.upper()]._text = text
+            else:
+                block._attributes.append(OfflineAttribute(block, tag, text))
@@ -0,0 +1,233 @@
+"""
+Filtros de selección por códigos de grupo DXF (SelectionSet de AutoCAD).
+
+En lugar de recorrer todo el ModelSpace y descartar en Python, se le pide a
+AutoCAD que devuelva solo las entidades que cumplen el filtro:
+    0   -> tipo de entidad DXF (INSERT, TEXT, LINE, LWPOLYLINE...)
+    8   -> capa
+    2   -> nombre de bloque
+    410 -> espacio (siempre "Model")
+    -4  -> operadores lógicos (<OR ... OR>, <AND ... AND>, <NOT ... NOT>)
+
+`compile_filter` implementa el mismo lenguaje en Python para el backend offline.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .cad_manager import cad
+
+logger = logging.getLogger(__name__)
+
+# Nombre de clase ObjectARX (EntityName) -> nombre DXF usado en el código 0
+DXF_NAMES = {
+    "AcDbBlockReference": "INSERT",
+    "AcDbText": "TEXT",
+    "AcDbMText": "MTEXT",
+    "AcDbLine": "LINE",
+    "AcDbPolyline": "LWPOLYLINE",
+    "AcDb2dPolyline": "POLYLINE",
+    "AcDb3dPolyline": "POLYLINE",
+}
+
+SELECTION_SET_NAME = "PYCAD_FILTRO"
+
+# Caracteres con significado especial en los comodines de AutoCAD
+_WILDCARD_SPECIALS = set("#@.*?~[]-,`")
+
+
+def escape_wildcard(text: str) -> str:
+    """Escapa un nombre literal para usarlo dentro de un patrón con comodines."""
+    return "".join(f"`{c}" if c in _WILDCARD_SPECIALS else c for c in text)
+
+
+class EntityFilter:
+    """
+    Condición simple: tipo de entidad Y (opcionalmente) capa Y nombre de bloque.
+    Los tipos se indican con el EntityName de ObjectARX (p. ej. "AcDbLine").
+    """
+
+    def __init__(
+        self,
+        entity_types: Iterable[str],
+        layers: Optional[Iterable[str]] = None,
+        block_names: Optional[Iterable[str]] = None,
+    ):
+        self.entity_types = sorted(set(entity_types))
+        self.layers = sorted({layer.upper() for layer in layers}) if layers else None
+        self.block_names = (
+            sorted({name.upper() for name in block_names}) if block_names else None
+        )
+
+    def dxf_codes(self) -> List[Tuple[int, str]]:
+        dxf_types = sorted({DXF_NAMES[t] for t in self.entity_types})
+        codes = [(0, ",".join(dxf_types))]
+        if self.layers:
+            codes.append((8, ",".join(escape_wildcard(l) for l in self.layers)))
+        if self.block_names:
+            # Los bloques dinámicos modificados son anónimos (*U123): se incluyen y
+            # se descartan después comparando EffectiveName
+            names = [escape_wildcard(n) for n in self.block_names] + ["`*U*"]
+            codes.append((2, ",".join(names)))
+        return codes
+
+    def accepts(self, entity_name: str, layer: str, block_name: str = None) -> bool:
+        """Prueba exacta sobre una entidad ya leída (con su EffectiveName)."""
+        if entity_name not in self.entity_types:
+            return False
+        if self.layers and layer.upper() not in self.layers:
+            return False
+        if self.block_names and entity_name == "AcDbBlockReference":
+            return (block_name or "").upper() in self.block_names
+        return True
+
+    def signature(self) -> str:
+        return f"{self.entity_types}|{self.layers}|{self.block_names}"
+
+
+class SelectionQuery:
+    """Unión (OR) de varios EntityFilter, restringida al ModelSpace."""
+
+    def __init__(self, filters: Sequence[EntityFilter]):
+        self.filters = list(filters)
+
+    def dxf_codes(self) -> List[Tuple[int, str]]:
+        codes = [(410, "Model")]
+        if len(self.filters) == 1:
+            return codes + self.filters[0].dxf_codes()
+
+        codes.append((-4, "<OR"))
+        for f in self.filters:
+            codes.append((-4, "<AND"))
+            codes.extend(f.dxf_codes())
+            codes.append((-4, "AND>"))
+        codes.append((-4, "OR>"))
+        return codes
+
+    def accepts(self, entity_name: str, layer: str, block_name: str = None) -> bool:
+        return any(f.accepts(entity_name, layer, block_name) for f in self.filters)
+
+    def entity_types(self) -> set:
+        return {t for f in self.filters for t in f.entity_types}
+
+    def signature(self) -> str:
+        return " OR ".join(sorted(f.signature() for f in self.filters))
+
+
+def select(query: SelectionQuery) -> list:
+    """
+    Ejecuta la consulta como SelectionSet en el documento activo y devuelve
+    los objetos seleccionados. El SelectionSet se elimina al terminar.
+    """
+    codes = query.dxf_codes()
+    sets = cad.doc.SelectionSets
+
+    # Un SelectionSet con el mismo nombre (p. ej. de una ejecución abortada) impide crearlo
+    try:
+        sets.Item(SELECTION_SET_NAME).Delete()
+    except Exception:
+        pass
+
+    selection = sets.Add(SELECTION_SET_NAME)
+    try:
+        cad.select_all(
+            selection, [code for code, _ in codes], [value for _, value in codes]
+        )
+        return [selection.Item(i) for i in range(selection.Count)]
+    finally:
+        selection.Delete()
+
+
+# EVALUADOR OFFLINE
+
+
+@lru_cache(maxsize=256)
+def _wildcard_regex(pattern: str) -> "re.Pattern":
+    """Traduce un patrón de comodines de AutoCAD (lista separada por comas)."""
+    alternatives, negated = [], []
+    current, negate, escaped = "", False, False
+    for c in pattern + ",":
+        if escaped:
+            current += re.escape(c)
+            escaped = False
+        elif c == "`":
+            escaped = True
+        elif c == ",":
+            (negated if negate else alternatives).append(current)
+            current, negate = "", False
+        elif c == "~" and not current:
+            negate = True
+        elif c == "*":
+            current += ".*"
+        elif c == "?":
+            current += "."
+        elif c == "#":
+            current += "[0-9]"
+        elif c == "@":
+            current += "[A-Za-z]"
+        elif c == ".":
+            current += "[^A-Za-z0-9]"
+        else:
+            current += re.escape(c)
+
+    positive = "|".join(alternatives) if alternatives else ".*"
+    regex = f"(?:{positive})"
+    if negated:
+        regex = f"(?!(?:{'|'.join(negated)})$){regex}"
+    return re.compile(f"^{regex}$", re.IGNORECASE)
+
+
+def _entity_value(obj, code: int) -> Optional[str]:
+    if code == 0:
+        return DXF_NAMES.get(obj.EntityName, obj.EntityName)
+    if code == 8:
+        return obj.Layer
+    if code == 2:
+        return getattr(obj, "Name", None)
+    if code == 410:
+        return "Model"
+    return None
+
+
+def compile_filter(codes: Sequence[int], values: Sequence) -> Callable[[object], bool]:
+    """
+    Convierte un filtro (listas paralelas de códigos y valores) en una función
+    objeto -> bool. Se compila una vez y se aplica a todo el ModelSpace.
+    """
+    stack = [("AND", [])]
+    for code, value in zip(codes, values):
+        if code == -4:
+            op = str(value).upper()
+            if op.startswith("<"):
+                stack.append((op[1:], []))
+                continue
+            name, tests = stack.pop()
+            stack[-1][1].append(_combine(name, tests))
+            continue
+        stack[-1][1].append(_condition(code, str(value)))
+    return _combine("AND", stack[0][1])
+
+
+def _condition(code: int, pattern: str) -> Callable[[object], bool]:
+    regex = _wildcard_regex(pattern)
+
+    def test(obj) -> bool:
+        actual = _entity_value(obj, code)
+        return actual is not None and regex.match(actual) is not None
+
+    return test
+
+
+def _combine(name: str, tests: list) -> Callable[[object], bool]:
+    if name == "OR":
+        return lambda obj: any(t(obj) for t in tests)
+    if name == "NOT":
+        return lambda obj: not all(t(obj) for t in tests)
+    return lambda obj: all(t(obj) for t in tests)
+
+
+def evaluate(codes: Sequence[int], values: Sequence, obj) -> bool:
+    """Evalúa un filtro (listas paralelas de códigos y valores) sobre un objeto."""
+    return compile_filter(codes, values)(obj)
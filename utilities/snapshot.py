@@ -0,0 +1,386 @@
+import logging
+import time
+from typing import Dict, Iterable, Optional
+from .cad_manager import cad
+from .cancellation import CancelToken, OperationCancelled, check_cancelled
+from .entity_reader import (
+    BLOCK_DETAIL_PLAN,
+    BLOCK_KEY_PLAN,
+    LAYER_ONLY_PLAN,
+    BlockFilter,
+    EntityReader,
+)
+from .selection import SelectionQuery, select
+from .instrumentation import add_com_calls, add_items, traced
+
+logger = logging.getLogger(__name__)
+
+# Tipos de contenido que puede cubrir una instantánea
+KIND_BLOCKS = "blocks"
+KIND_TEXTS = "texts"
+KIND_LINES = "lines"
+KIND_POLYLINES = "polylines"
+KIND_LAYERS = "layers"  # Conteo de uso por capa (todas las entidades)
+ALL_KINDS = frozenset(
+    {KIND_BLOCKS, KIND_TEXTS, KIND_LINES, KIND_POLYLINES, KIND_LAYERS}
+)
+
+BLOCK_TYPES = ("AcDbBlockReference",)
+TEXT_TYPES = ("AcDbText", "AcDbMText")
+LINE_TYPES = ("AcDbLine",)
+POLYLINE_TYPES = ("AcDbPolyline", "AcDb2dPolyline", "AcDb3dPolyline")
+
+
+class DrawingSnapshot:
+    """
+    Tabla en memoria con las entidades del ModelSpace leídas en una sola pasada.
+
+    Cada colección está indexada por Handle y conserva el orden del ModelSpace:
+        blocks:    {"Handle", "Nombre", "Capa", "X", "Y", "Z", "Rotacion", "Attr_<TAG>"...}
+        texts:     {"Handle", "Texto", "Capa", "X", "Y", "Z", "Tipo"}
+        lines:     {"Handle", "Capa", "Tipo", "Indice", "Puntos": [(x1, y1), (x2, y2)]}
+        polylines: {"Handle", "Capa", "Tipo", "Indice", "Puntos": [(x, y), ...]}
+        layer_usage: {"CAPA_EN_MAYUSCULAS": cantidad_de_entidades}
+
+    Los extractores de `entities`, `layers` y `geometry` filtran sobre esta tabla
+    en lugar de volver a recorrer el dibujo por COM.
+    """
+
+    def __init__(self, kinds: Iterable[str] = ALL_KINDS):
+        self.kinds = frozenset(kinds)
+        self.blocks: Dict[str, dict] = {}
+        self.texts: Dict[str, dict] = {}
+        self.lines: Dict[str, dict] = {}
+        self.polylines: Dict[str, dict] = {}
+        self.layer_usage: Dict[str, int] = {}
+        self.total_entities = 0
+        # Entidades que no se pudieron leer y si la lectura se cortó a la mitad
+        self.skipped = 0
+        self.aborted = False
+        # None = todo el ModelSpace; si no, firma de la consulta/filtro que la generó
+        self.scope: Optional[str] = None
+
+    @property
+    def complete(self) -> bool:
+        """True si se leyeron todas las entidades (solo entonces se cachea)."""
+        return not self.skipped and not self.aborted
+
+    def covers(self, *kinds: str) -> bool:
+        """Indica si la instantánea fue construida con los tipos solicitados."""
+        return all(kind in self.kinds for kind in kinds)
+
+    def require(self, *kinds: str) -> None:
+        """Lanza ValueError si a la instantánea le faltan los tipos solicitados."""
+        missing = [kind for kind in kinds if kind not in self.kinds]
+        if missing:
+            raise ValueError(f"La instantánea no contiene: {', '.join(missing)}")
+
+    def summary(self) -> str:
+        text = (
+            f"{self.total_entities} entidades | {len(self.blocks)} bloques, "
+            f"{len(self.texts)} textos, {len(self.lines)} líneas, "
+            f"{len(self.polylines)} polilíneas"
+        )
+        if self.skipped:
+            text += f" | {self.skipped} sin leer"
+        return text
+
+
+def _read_block(
+    reader: EntityReader,
+    bound,
+    entity_name: str,
+    key: dict,
+    block_filter: Optional[BlockFilter] = None,
+) -> Optional[dict]:
+    """
+    Completa un bloque a partir de sus propiedades baratas ('key': Handle,
+    Layer, Name). Devuelve None si no pasa 'block_filter'; en ese caso no se
+    leen geometría, EffectiveName ni atributos.
+    """
+    if block_filter is not None and not block_filter.accepts_layer(key["Layer"]):
+        return None
+
+    # Manejo de Bloques Dinámicos: solo los anónimos (*U...) tienen un
+    # EffectiveName distinto de Name
+    name = key["Name"]
+    if name.startswith("*"):
+        _, extra = reader.read(bound, entity_name, ("EffectiveName",), bind=False)
+        name = extra.get("EffectiveName", name)
+
+    if block_filter is not None and not block_filter.accepts_name(name):
+        return None
+
+    wants_attributes = block_filter is None or block_filter.wants_attributes()
+    plan = BLOCK_DETAIL_PLAN + (("HasAttributes",) if wants_attributes else ())
+    _, props = reader.read(bound, entity_name, plan, bind=False)
+
+    insertion = props["InsertionPoint"]
+    data = {
+        "Handle": key["Handle"],
+        "Nombre": name,
+        "Capa": key["Layer"],
+        "X": round(insertion[0], 4),
+        "Y": round(insertion[1], 4),
+        "Z": round(insertion[2], 4),
+        "Rotacion": round(props["Rotation"], 4),
+    }
+
+    if wants_attributes and props["HasAttributes"]:
+        tags = block_filter.attribute_tags if block_filter is not None else None
+        for tag, text in reader.attributes(bound, entity_name, tags):
+            data[f"Attr_{tag}"] = text
+
+    return data
+
+
+def _read_text(reader: EntityReader, obj, entity_name: str) -> dict:
+    _, props = reader.read(obj, entity_name)
+    insertion = props["InsertionPoint"]
+    return {
+        "Handle": props["Handle"],
+        "Texto": props["TextString"],
+        "Capa": props["Layer"],
+        "X": round(insertion[0], 4),
+        "Y": round(insertion[1], 4),
+        "Z": round(insertion[2], 4),
+        "Tipo": entity_name,
+    }
+
+
+def _read_line(reader: EntityReader, obj, entity_name: str, index: int) -> dict:
+    _, props = reader.read(obj, entity_name)
+    start = props["StartPoint"]
+    end = props["EndPoint"]
+    return {
+        "Handle": props["Handle"],
+        "Capa": props["Layer"],
+        "Tipo": entity_name,
+        "Indice": index,
+        "Puntos": [
+            (round(start[0], 4), round(start[1], 4)),
+            (round(end[0], 4), round(end[1], 4)),
+        ],
+    }
+
+
+def _read_polyline(reader: EntityReader, obj, entity_name: str, index: int) -> dict:
+    _, props = reader.read(obj, entity_name)
+    coords = props["Coordinates"]
+    # LWPOLYLINE -> [x1, y1, x2, y2...]
+    # 2d/3dPolyline -> [x1, y1, z1, x2, y2, z2...]
+    step = 2 if entity_name == "AcDbPolyline" else 3
+    return {
+        "Handle": props["Handle"],
+        "Capa": props["Layer"],
+        "Tipo": entity_name,
+        "Indice": index,
+        "Puntos": [
+            (round(coords[j], 4), round(coords[j + 1], 4))
+            for j in range(0, len(coords) - 1, step)
+        ],
+    }
+
+
+def _count_layer(snapshot: DrawingSnapshot, layer: str) -> None:
+    layer_key = layer.upper()
+    snapshot.layer_usage[layer_key] = snapshot.layer_usage.get(layer_key, 0) + 1
+
+
+def _ingest(
+    snapshot: DrawingSnapshot,
+    reader: EntityReader,
+    obj,
+    index: int,
+    query=None,
+    block_filter: Optional[BlockFilter] = None,
+) -> None:
+    """Lee una entidad y la agrega a las colecciones que correspondan."""
+    entity_name = reader.entity_name(obj)
+    snapshot.total_entities += 1
+
+    kinds = snapshot.kinds
+    is_block = KIND_BLOCKS in kinds and entity_name in BLOCK_TYPES
+    is_text = KIND_TEXTS in kinds and entity_name in TEXT_TYPES
+    is_line = KIND_LINES in kinds and entity_name in LINE_TYPES
+    is_polyline = KIND_POLYLINES in kinds and entity_name in POLYLINE_TYPES
+    wants_layers = KIND_LAYERS in kinds
+
+    if is_block:
+        bound, key = reader.read(obj, entity_name, BLOCK_KEY_PLAN)
+        if wants_layers:
+            _count_layer(snapshot, key["Layer"])
+        data = _read_block(reader, bound, entity_name, key, block_filter)
+        # El filtro DXF por nombre deja pasar bloques dinámicos anónimos (*U...)
+        if data is not None and (
+            query is None or query.accepts(entity_name, data["Capa"], data["Nombre"])
+        ):
+            snapshot.blocks[data["Handle"]] = data
+        return
+
+    if not (is_text or is_line or is_polyline):
+        if wants_layers:
+            _, props = reader.read(obj, entity_name, LAYER_ONLY_PLAN)
+            _count_layer(snapshot, props["Layer"])
+        return
+
+    if is_text:
+        data = _read_text(reader, obj, entity_name)
+    elif is_line:
+        data = _read_line(reader, obj, entity_name, index)
+    else:
+        data = _read_polyline(reader, obj, entity_name, index)
+
+    if wants_layers:
+        _count_layer(snapshot, data["Capa"])
+
+    if query is not None and not query.accepts(entity_name, data["Capa"]):
+        return
+
+    if is_text:
+        snapshot.texts[data["Handle"]] = data
+    elif is_line:
+        snapshot.lines[data["Handle"]] = data
+    else:
+        snapshot.polylines[data["Handle"]] = data
+
+
+def scope_signature(
+    query: Optional[SelectionQuery] = None,
+    block_filter: Optional[BlockFilter] = None,
+) -> Optional[str]:
+    """Firma del subconjunto del dibujo que cubre una instantánea (None = todo)."""
+    parts = []
+    if query is not None:
+        parts.append(query.signature())
+    if block_filter is not None:
+        parts.append(f"bloques[{block_filter.signature()}]")
+    return " && ".join(parts) if parts else None
+
+
+@traced("take_snapshot")
+def take_snapshot(
+    kinds: Optional[Iterable[str]] = None,
+    progress_callback=None,
+    block_filter: Optional[BlockFilter] = None,
+    cancel_token: Optional[CancelToken] = None,
+) -> DrawingSnapshot:
+    """
+    Recorre el ModelSpace una única vez y construye la tabla de entidades.
+
+    Args:
+        kinds: Subconjunto de ALL_KINDS a leer. Por defecto se leen todos.
+               Limitarlo evita las llamadas COM de propiedades que no se usarán.
+        progress_callback: Función opcional que recibe el porcentaje (0-100).
+        block_filter: Si se indica, solo se completan los bloques que lo cumplen.
+        cancel_token: Se consulta en cada entidad; si se cancela se lanza
+                      OperationCancelled y no se devuelve una tabla a medias.
+    """
+    snapshot = DrawingSnapshot(kinds if kinds is not None else ALL_KINDS)
+    snapshot.scope = scope_signature(block_filter=block_filter)
+
+    if not cad.is_connected:
+        logger.error("AutoCAD no está conectado.")
+        snapshot.aborted = True
+        return snapshot
+
+    reader = EntityReader()
+    try:
+        start = time.perf_counter()
+        total_objects = cad.msp.Count
+        add_items(total_objects)
+        for i in range(total_objects):
+            check_cancelled(cancel_token)
+            if progress_callback and i % 100 == 0:
+                progress_callback(int((i / total_objects) * 100))
+
+            try:
+                _ingest(snapshot, reader, cad.msp.Item(i), i, block_filter=block_filter)
+            except Exception:
+                snapshot.skipped += 1
+                continue
+
+        if progress_callback:
+            progress_callback(100)
+
+        logger.info(
+            f"Instantánea del dibujo (recorrido completo de {total_objects} objetos) "
+            f"en {time.perf_counter() - start:.2f}s: {snapshot.summary()}. "
+            f"{reader.summary()}."
+        )
+
+    except OperationCancelled:
+        raise
+    except Exception as e:
+        snapshot.aborted = True
+        logger.error(f"Error crítico leyendo el ModelSpace: {e}")
+    finally:
+        add_com_calls(reader.calls)
+
+    return snapshot
+
+
+@traced("take_filtered_snapshot")
+def take_filtered_snapshot(
+    query: SelectionQuery,
+    kinds: Optional[Iterable[str]] = None,
+    progress_callback=None,
+    block_filter: Optional[BlockFilter] = None,
+    cancel_token: Optional[CancelToken] = None,
+) -> DrawingSnapshot:
+    """
+    Igual que take_snapshot, pero solo lee las entidades que devuelve un
+    SelectionSet filtrado por códigos DXF (tipo, capa, nombre de bloque).
+    Con pocas entidades relevantes evita la mayoría de las llamadas COM.
+
+    El campo "Indice" de líneas y polilíneas es el orden dentro de la selección.
+    Si el SelectionSet falla se recurre al recorrido completo.
+    """
+    kinds = frozenset(kinds if kinds is not None else ALL_KINDS)
+    if KIND_LAYERS in kinds:
+        raise ValueError("El conteo de uso por capa requiere el recorrido completo.")
+
+    if not cad.is_connected:
+        logger.error("AutoCAD no está conectado.")
+        snapshot = DrawingSnapshot(kinds)
+        snapshot.aborted = True
+        return snapshot
+
+    start = time.perf_counter()
+    try:
+        objects = select(query)
+    except Exception as e:
+        logger.warning(f"SelectionSet no disponible ({e}); se recorre todo el dibujo.")
+        return take_snapshot(
+            kinds=kinds,
+            progress_callback=progress_callback,
+            block_filter=block_filter,
+            cancel_token=cancel_token,
+        )
+
+    snapshot = DrawingSnapshot(kinds)
+    snapshot.scope = scope_signature(query, block_filter)
+    reader = EntityReader()
+    add_items(len(objects))
+    try:
+        for i, obj in enumerate(objects):
+            check_cancelled(cancel_token)
+            if progress_callback and i % 100 == 0:
+                progress_callback(int((i / len(objects)) * 100))
+            try:
+                _ingest(snapshot, reader, obj, i, query, block_filter)
+            except Exception:
+                snapshot.skipped += 1
+                continue
+    finally:
+        add_com_calls(reader.calls)
+
+    if progress_callback:
+        progress_callback(100)
+
+    logger.info(
+        f"Instantánea filtrada (SelectionSet, {len(objects)} objetos) "
+        f"en {time.perf_counter() - start:.2f}s: {snapshot.summary()}. "
+        f"{reader.summary()}."
+    )
+    return snapshot
@@ -0,0 +1,267 @@
+"""
+Caché persistente (SQLite) de instantáneas del dibujo.
+
+Cada documento se identifica por su ruta completa y una huella barata de leer
+por COM (cantidad de entidades, semilla de handles y fecha del último guardado).
+Si la huella coincide con la guardada, la instantánea se carga del disco y no
+se recorre el ModelSpace.
+
+Solo se usa la caché cuando la base de datos del dibujo no tiene cambios sin
+guardar (bit 1 de DBMOD): mover o editar una entidad no altera el conteo ni la
+semilla de handles, así que con cambios pendientes la huella no es confiable.
+Los demás bits (vista, ventanas, variables de sistema) se activan con un simple
+zoom o encuadre y no afectan a las entidades.
+"""
+
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+from typing import Iterable, Optional, Tuple
+
+from .cad_manager import cad
+from .cancellation import CancelToken
+from .entity_reader import BlockFilter
+from .mirror import mirror_snapshot
+from .selection import SelectionQuery
+from .snapshot import (
+    ALL_KINDS,
+    DrawingSnapshot,
+    scope_signature,
+    take_filtered_snapshot,
+    take_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join("cache", "snapshots.sqlite")
+
+# Se incrementa si cambia el formato de DrawingSnapshot
+CACHE_FORMAT = 2
+
+# Ámbito de una instantánea del ModelSpace completo
+FULL_SCOPE = ""
+
+# Bit de DBMOD que indica cambios en la base de datos (entidades)
+DBMOD_DATABASE = 1
+
+
+def drawing_fingerprint() -> Optional[dict]:
+    """
+    Huella del documento activo, o None si no se puede cachear
+    (sin conexión, dibujo sin ruta o con entidades modificadas sin guardar).
+    """
+    if not cad.is_connected:
+        return None
+    try:
+        path = cad.doc.FullName
+        if not path or int(cad.doc.GetVariable("DBMOD")) & DBMOD_DATABASE:
+            return None
+        return {
+            "path": path,
+            "count": cad.msp.Count,
+            "handseed": str(cad.doc.GetVariable("HANDSEED")),
+            "saved": float(cad.doc.GetVariable("TDUPDATE")),
+        }
+    except Exception as e:
+        logger.debug(f"No se pudo calcular la huella del dibujo: {e}")
+        return None
+
+
+def _serialize(snapshot: DrawingSnapshot) -> bytes:
+    payload = {
+        "kinds": sorted(snapshot.kinds),
+        "blocks": snapshot.blocks,
+        "texts": snapshot.texts,
+        "lines": snapshot.lines,
+        "polylines": snapshot.polylines,
+        "layer_usage": snapshot.layer_usage,
+        "total_entities": snapshot.total_entities,
+        "scope": snapshot.scope,
+    }
+    return zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _deserialize(blob: bytes) -> DrawingSnapshot:
+    payload = pickle.loads(zlib.decompress(blob))
+    snapshot = DrawingSnapshot(payload["kinds"])
+    snapshot.blocks = payload["blocks"]
+    snapshot.texts = payload["texts"]
+    snapshot.lines = payload["lines"]
+    snapshot.polylines = payload["polylines"]
+    snapshot.layer_usage = payload["layer_usage"]
+    snapshot.total_entities = payload["total_entities"]
+    snapshot.scope = payload["scope"]
+    return snapshot
+
+
+class SnapshotCache:
+    """
+    Almacén de instantáneas en un archivo SQLite: una fila por documento y
+    ámbito (dibujo completo o una SelectionQuery concreta), siempre de la
+    última huella leída. Cada operación abre su propia conexión, así puede
+    usarse desde cualquier hilo de trabajo.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS snapshots_v{CACHE_FORMAT} ("
+            " path TEXT NOT NULL,"
+            " scope TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " kinds TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " PRIMARY KEY (path, scope))"
+        )
+        return conn
+
+    @staticmethod
+    def _fingerprint_key(fingerprint: dict) -> str:
+        return json.dumps({**fingerprint, "format": CACHE_FORMAT}, sort_keys=True)
+
+    def lookup(
+        self, fingerprint: dict, scope: str = FULL_SCOPE
+    ) -> Optional[DrawingSnapshot]:
+        """Devuelve la instantánea guardada si la huella coincide exactamente."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    f"SELECT fingerprint, payload FROM snapshots_v{CACHE_FORMAT} "
+                    "WHERE path = ? AND scope = ?",
+                    (fingerprint["path"], scope),
+                ).fetchone()
+        except Exception as e:
+            logger.warning(f"No se pudo leer la caché de instantáneas: {e}")
+            return None
+
+        if row is None or row[0] != self._fingerprint_key(fingerprint):
+            return None
+        try:
+            return _deserialize(row[1])
+        except Exception as e:
+            logger.warning(f"Entrada de caché corrupta para {fingerprint['path']}: {e}")
+            return None
+
+    def store(self, fingerprint: dict, snapshot: DrawingSnapshot) -> None:
+        """Guarda (o reemplaza) la instantánea y descarta las de huellas anteriores."""
+        key = self._fingerprint_key(fingerprint)
+        table = f"snapshots_v{CACHE_FORMAT}"
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f"DELETE FROM {table} WHERE path = ? AND fingerprint != ?",
+                    (fingerprint["path"], key),
+                )
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        fingerprint["path"],
+                        snapshot.scope or FULL_SCOPE,
+                        key,
+                        ",".join(sorted(snapshot.kinds)),
+                        time.time(),
+                        _serialize(snapshot),
+                    ),
+                )
+        except Exception as e:
+            logger.warning(f"No se pudo escribir la caché de instantáneas: {e}")
+
+    def clear(self) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(f"DELETE FROM snapshots_v{CACHE_FORMAT}")
+        except Exception as e:
+            logger.warning(f"No se pudo vaciar la caché de instantáneas: {e}")
+
+
+# Instancia global lista para importar
+snapshot_cache = SnapshotCache()
+
+
+def cached_snapshot(
+    kinds: Optional[Iterable[str]] = None,
+    progress_callback=None,
+    cache: SnapshotCache = None,
+    query: SelectionQuery = None,
+    block_filter: BlockFilter = None,
+    cancel_token: CancelToken = None,
+) -> Tuple[DrawingSnapshot, bool]:
+    """
+    Igual que snapshot.take_snapshot (o take_filtered_snapshot si se pasa
+    'query'), pero reutiliza la caché en disco.
+
+    Una instantánea del dibujo completo que cubra los tipos pedidos sirve para
+    cualquier consulta o filtro de bloques (los extractores vuelven a filtrar). Si la entrada completa guardada no cubre todos los
+    tipos, se vuelve a leer la unión de ambos para que la caché crezca.
+
+    Si el espejo en vivo está activo sobre el documento activo, su tabla ya
+    está al día y se usa antes que el disco (también con cambios sin guardar).
+
+    Returns:
+        (instantánea, True si vino de la caché)
+    """
+    cache = cache or snapshot_cache
+    kinds = frozenset(kinds if kinds is not None else ALL_KINDS)
+
+    mirrored = mirror_snapshot()
+    if mirrored is not None and mirrored.covers(*kinds):
+        logger.info(f"Instantánea tomada del espejo en vivo: {mirrored.summary()}.")
+        if progress_callback:
+            progress_callback(100)
+        return mirrored, True
+
+    def read(kinds_to_read):
+        if query is None:
+            return take_snapshot(
+                kinds=kinds_to_read,
+                progress_callback=progress_callback,
+                block_filter=block_filter,
+                cancel_token=cancel_token,
+            )
+        return take_filtered_snapshot(
+            query,
+            kinds=kinds_to_read,
+            progress_callback=progress_callback,
+            block_filter=block_filter,
+            cancel_token=cancel_token,
+        )
+
+    fingerprint = drawing_fingerprint()
+    if fingerprint is None:
+        return read(kinds), False
+
+    scope = scope_signature(query, block_filter)
+    full = cache.lookup(fingerprint)
+    candidates = [full]
+    if scope is not None:
+        candidates.append(cache.lookup(fingerprint, scope))
+
+    for cached in candidates:
+        if cached is not None and cached.covers(*kinds):
+            logger.info(f"Instantánea recuperada de la caché: {cached.summary()}.")
+            if progress_callback:
+                progress_callback(100)
+            return cached, True
+
+    if scope is None and full is not None:
+        kinds = kinds | full.kinds
+
+    snapshot = read(kinds)
+    # Solo se guarda una lectura completa de un dibujo que no cambió mientras
+    # tanto; una tabla con entidades saltadas se serviría hasta el próximo guardado
+    if not snapshot.complete:
+        logger.warning("Lectura incompleta del dibujo: no se guarda en la caché.")
+    elif drawing_fingerprint() == fingerprint:
+        cache.store(fingerprint, snapshot)
+    return snapshot, False
@@ -0,0 +1,215 @@
+import math
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+Point2D = Tuple[float, float]
+Cell = Tuple[int, int]
+
+DEFAULT_CELL_SIZE = 5.0
+
+
+class GridIndex:
+    """
+    Índice espacial de rejilla uniforme (spatial hash) para puntos 2D.
+
+    Cada clave se guarda en la celda (floor(x / cell_size), floor(y / cell_size)).
+    Las consultas solo revisan las celdas vecinas al punto, por lo que insertar,
+    eliminar y buscar cuestan O(1) amortizado en lugar de O(N).
+
+    Los empates en distancia se resuelven por orden de primera inserción, igual
+    que un recorrido lineal sobre un diccionario.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        if cell_size <= 0:
+            raise ValueError("El tamaño de celda debe ser positivo.")
+        self.cell_size = cell_size
+        # celda -> {clave: (x, y, orden_de_inserción)}
+        self._cells: Dict[Cell, Dict[Hashable, Tuple[float, float, int]]] = {}
+        self._where: Dict[Hashable, Cell] = {}
+        self._seq = 0
+        self._bounds: Optional[List[int]] = None  # [min_ix, min_iy, max_ix, max_iy]
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def _cell_of(self, x: float, y: float) -> Cell:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, key: Hashable, point: Point2D) -> None:
+        """Agrega o reubica una clave. Si ya existía conserva su orden original."""
+        x, y = float(point[0]), float(point[1])
+        cell = self._cell_of(x, y)
+
+        old_cell = self._where.get(key)
+        if old_cell is not None:
+            seq = self._cells[old_cell][key][2]
+            if old_cell != cell:
+                self._discard(key, old_cell)
+        else:
+            seq = self._seq
+            self._seq += 1
+
+        self._cells.setdefault(cell, {})[key] = (x, y, seq)
+        self._where[key] = cell
+
+        if self._bounds is None:
+            self._bounds = [cell[0], cell[1], cell[0], cell[1]]
+        else:
+            b = self._bounds
+            b[0], b[1] = min(b[0], cell[0]), min(b[1], cell[1])
+            b[2], b[3] = max(b[2], cell[0]), max(b[3], cell[1])
+
+    def remove(self, key: Hashable) -> bool:
+        """Elimina una clave. Devuelve False si no estaba indexada."""
+        cell = self._where.pop(key, None)
+        if cell is None:
+            return False
+        self._discard(key, cell)
+        return True
+
+    def _discard(self, key: Hashable, cell: Cell) -> None:
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]
+
+    def point_of(self, key: Hashable) -> Point2D:
+        x, y, _ = self._cells[self._where[key]][key]
+        return (x, y)
+
+    def _ring(self, cx: int, cy: int, r: int) -> Iterator[Cell]:
+        """Celdas en el anillo de Chebyshev de radio r alrededor de (cx, cy)."""
+        if r == 0:
+            yield (cx, cy)
+            return
+        for ix in range(cx - r, cx + r + 1):
+            yield (ix, cy - r)
+            yield (ix, cy + r)
+        for iy in range(cy - r + 1, cy + r):
+            yield (cx - r, iy)
+            yield (cx + r, iy)
+
+    def _max_ring(self, cx: int, cy: int) -> int:
+        if self._bounds is None:
+            return -1
+        b = self._bounds
+        return max(abs(cx - b[0]), abs(cx - b[2]), abs(cy - b[1]), abs(cy - b[3]))
+
+    def _iter_ring_entries(self, cx: int, cy: int, r: int):
+        # Si el anillo tiene más celdas que las ocupadas, es más barato filtrar estas
+        ring_cells = 1 if r == 0 else 8 * r
+        if ring_cells > len(self._cells):
+            for (ix, iy), bucket in self._cells.items():
+                if max(abs(ix - cx), abs(iy - cy)) == r:
+                    yield from bucket.items()
+        else:
+            for cell in self._ring(cx, cy, r):
+                bucket = self._cells.get(cell)
+                if bucket:
+                    yield from bucket.items()
+
+    def within(
+        self, point: Point2D, radius: float
+    ) -> List[Tuple[float, Hashable, Point2D]]:
+        """
+        Devuelve [(distancia, clave, (x, y)), ...] de todas las claves a una
+        distancia <= radius, ordenadas de la más cercana a la más lejana.
+        """
+        px, py = point[0], point[1]
+        min_ix, min_iy = self._cell_of(px - radius, py - radius)
+        max_ix, max_iy = self._cell_of(px + radius, py + radius)
+
+        found = []
+        for ix in range(min_ix, max_ix + 1):
+            for iy in range(min_iy, max_iy + 1):
+                bucket = self._cells.get((ix, iy))
+                if not bucket:
+                    continue
+                for key, (x, y, seq) in bucket.items():
+                    d = math.hypot(px - x, py - y)
+                    if d <= radius:
+                        found.append((d, seq, key, (x, y)))
+
+        found.sort(key=lambda item: (item[0], item[1]))
+        return [(d, key, pt) for d, _, key, pt in found]
+
+    def nearest(
+        self, point: Point2D, max_radius: Optional[float] = None
+    ) -> Optional[Tuple[float, Hashable, Point2D]]:
+        """
+        Devuelve (distancia, clave, (x, y)) de la clave más cercana, o None si
+        no hay ninguna dentro de max_radius (sin límite si es None).
+        """
+        result = self.k_nearest(point, 1, max_radius)
+        return result[0] if result else None
+
+    def k_nearest(
+        self, point: Point2D, k: int, max_radius: Optional[float] = None
+    ) -> List[Tuple[float, Hashable, Point2D]]:
+        """
+        Devuelve las k claves más cercanas como [(distancia, clave, (x, y)), ...],
+        ordenadas por distancia. Se expande anillo a anillo desde la celda del
+        punto y se detiene cuando ningún anillo restante puede mejorar el resultado.
+        """
+        if k <= 0 or not self._where:
+            return []
+
+        px, py = point[0], point[1]
+        cx, cy = self._cell_of(px, py)
+        cs = self.cell_size
+
+        last_ring = self._max_ring(cx, cy)
+        if max_radius is not None:
+            last_ring = min(last_ring, math.ceil(max_radius / cs))
+
+        candidates = []
+        for r in range(last_ring + 1):
+            # Cualquier punto del anillo r está al menos a (r - 1) * cs del punto
+            if len(candidates) >= k and (r - 1) * cs > candidates[k - 1][0]:
+                break
+            for key, (x, y, seq) in self._iter_ring_entries(cx, cy, r):
+                d = math.hypot(px - x, py - y)
+                if max_radius is None or d <= max_radius:
+                    candidates.append((d, seq, key, (x, y)))
+            candidates.sort(key=lambda item: (item[0], item[1]))
+            del candidates[k:]
+
+        return [(d, key, pt) for d, _, key, pt in candidates]
+
+    def near_segment(self, a: Point2D, b: Point2D, radius: float) -> List[Hashable]:
+        """
+        Devuelve las claves candidatas a estar a una distancia <= radius del
+        segmento ab, en orden de inserción. Es un superconjunto: el llamador
+        debe aplicar la prueba exacta de distancia.
+
+        Se muestrea el segmento a pasos de como máximo una celda y se recogen
+        las celdas vecinas de cada muestra, así el costo depende de la longitud
+        del segmento y no del área de su caja delimitadora.
+        """
+        if not self._cells:
+            return []
+
+        cs = self.cell_size
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        steps = max(1, math.ceil(math.hypot(dx, dy) / cs))
+        # Todo punto del segmento queda a <= cs / 2 de alguna muestra
+        reach = math.ceil((radius + cs / 2) / cs)
+
+        cells = set()
+        for s in range(steps + 1):
+            t = s / steps
+            cx, cy = self._cell_of(a[0] + t * dx, a[1] + t * dy)
+            for ix in range(cx - reach, cx + reach + 1):
+                for iy in range(cy - reach, cy + reach + 1):
+                    if (ix, iy) in self._cells:
+                        cells.add((ix, iy))
+
+        found = []
+        for cell in cells:
+            for key, (_, _, seq) in self._cells[cell].items():
+                found.append((seq, key))
+        found.sort(key=lambda item: item[0])
+        return [key for _, key in found]
@@ -0,0 +1,130 @@
+"""
+Resultados tabulares en columnas (extractor, reportes).
+
+Las extracciones devuelven una lista de diccionarios con claves variables
+(cada bloque aporta sus Attr_<TAG>). Aquí se pasan a una columna por clave:
+el esquema se descubre en una sola pasada, cada celda ocupa un puesto en una
+lista en lugar de una entrada de diccionario, y el orden y el filtro se
+resuelven como permutaciones de índices sin copiar filas. El modelo Qt de la
+pestaña del extractor lee directamente de aquí.
+"""
+
+from numbers import Number
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Marca de celda vacía (la fila no trae esa clave)
+MISSING = None
+
+
+def discover_columns(rows: Iterable[dict]) -> List[str]:
+    """
+    Claves de todas las filas en orden de primera aparición, en una pasada.
+    Las filas con el mismo conjunto de claves que la anterior se saltan enteras.
+    """
+    columns: Dict[str, None] = {}
+    previous = None
+    for row in rows:
+        keys = row.keys()
+        if keys == previous:
+            continue
+        for key in keys:
+            if key not in columns:
+                columns[key] = None
+        previous = keys
+    return list(columns)
+
+
+def display_value(value) -> str:
+    """Texto de una celda tal como se muestra y se exporta."""
+    return "" if value is MISSING else str(value)
+
+
+def _sort_key(value):
+    # Números antes que textos y vacíos al final, sin comparar tipos mezclados
+    if value is MISSING:
+        return (2, 0, "")
+    if isinstance(value, Number) and not isinstance(value, bool):
+        return (0, value, "")
+    return (1, 0, str(value).lower())
+
+
+class ColumnarTable:
+    """
+    Tabla inmutable de filas heterogéneas guardada por columnas.
+
+    Uso:
+        tabla = ColumnarTable.from_rows(datos)
+        tabla.value(fila, columna)
+        orden = tabla.sort_order(tabla.columns.index("X"))
+        visibles = tabla.filter_rows("poste", orden)
+    """
+
+    def __init__(self, columns: List[str], data: List[list], row_count: int):
+        self.columns = columns
+        self._data = data  # una lista por columna, todas de largo row_count
+        self.row_count = row_count
+        self._sort_cache: Dict[int, List[int]] = {}
+        self._search_text: Optional[List[str]] = None
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[dict]) -> "ColumnarTable":
+        columns = discover_columns(rows)
+        data = [[row.get(key, MISSING) for row in rows] for key in columns]
+        return cls(columns, data, len(rows))
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    @property
+    def column_count(self) -> int:
+        return len(self.columns)
+
+    def value(self, row: int, column: int):
+        return self._data[column][row]
+
+    def column(self, name: str) -> list:
+        return self._data[self.columns.index(name)]
+
+    def row(self, row: int) -> dict:
+        """La fila como diccionario, sin las claves que no traía."""
+        return {
+            key: values[row]
+            for key, values in zip(self.columns, self._data)
+            if values[row] is not MISSING
+        }
+
+    def iter_rows(self, order: Optional[Iterable[int]] = None) -> Iterator[list]:
+        """Filas como listas alineadas con 'columns' (MISSING donde falta)."""
+        for i in range(self.row_count) if order is None else order:
+            yield [values[i] for values in self._data]
+
+    def sort_order(self, column: int, descending: bool = False) -> List[int]:
+        """
+        Permutación de filas ordenada por 'column'. El orden ascendente se
+        calcula una vez por columna; el descendente es su reverso, así que
+        los empates no conservan el orden original en ese sentido.
+        """
+        order = self._sort_cache.get(column)
+        if order is None:
+            keys = [_sort_key(v) for v in self._data[column]]
+            order = sorted(range(self.row_count), key=keys.__getitem__)
+            self._sort_cache[column] = order
+        return order[::-1] if descending else order
+
+    def filter_rows(
+        self, text: str, order: Optional[Iterable[int]] = None
+    ) -> List[int]:
+        """
+        Filas (en el orden de 'order') que contienen 'text' en alguna celda,
+        sin distinguir mayúsculas. El texto de búsqueda de cada fila se arma
+        la primera vez que se filtra.
+        """
+        if self._search_text is None:
+            self._search_text = [
+                "\x1f".join(display_value(v) for v in cells).lower()
+                for cells in self.iter_rows()
+            ]
+        needle = text.lower()
+        search = self._search_text
+        rows = range(self.row_count) if order is None else order
+        return [i for i in rows if needle in search[i]]
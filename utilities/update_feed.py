@@ -0,0 +1,61 @@
+"""
+Agregador de actualizaciones hacia la interfaz (logs y progreso).
+
+Los trabajos publican desde el hilo de la sesión CAD sin encolar un evento Qt
+por mensaje: las líneas se acumulan en un búfer circular acotado y del
+progreso solo se guarda el último valor por destino. La interfaz vacía el
+agregador a una frecuencia fija (un "cuadro") y aplica todo de una vez: un
+único append con las líneas del cuadro y una sola actualización por barra.
+"""
+
+import threading
+from collections import deque
+from typing import Callable, Dict, Hashable, List, Tuple
+
+# Frecuencia de refresco de la interfaz (milisegundos por cuadro)
+FRAME_MS = 100
+
+# Líneas pendientes como máximo entre dos cuadros; las más viejas se descartan
+MAX_PENDING_LINES = 2000
+
+
+class UpdateFeed:
+    """
+    Buzón seguro entre hilos. publish_* puede llamarse desde cualquier hilo;
+    drain() lo llama el temporizador de la interfaz.
+    """
+
+    def __init__(self, max_pending_lines: int = MAX_PENDING_LINES):
+        self._lock = threading.Lock()
+        self._lines: deque = deque(maxlen=max_pending_lines)
+        self._dropped = 0
+        self._progress: Dict[Hashable, Tuple[Callable, int]] = {}
+
+    def publish_log(self, message: str) -> None:
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped += 1
+            self._lines.append(message)
+
+    def publish_progress(self, sink: Callable[[int], None], value: int) -> None:
+        """Guarda el último valor para 'sink'; los intermedios se descartan."""
+        with self._lock:
+            self._progress[id(sink)] = (sink, value)
+
+    def progress_to(self, sink: Callable[[int], None]) -> Callable[[int], None]:
+        """Función value -> None que publica el progreso de 'sink'."""
+        return lambda value: self.publish_progress(sink, value)
+
+    def drain(self) -> Tuple[List[str], int, List[Tuple[Callable, int]]]:
+        """
+        Devuelve (líneas, descartadas, [(sink, valor)]) acumulados desde el
+        último cuadro y vacía el búfer.
+        """
+        with self._lock:
+            lines = list(self._lines)
+            dropped = self._dropped
+            progress = list(self._progress.values())
+            self._lines.clear()
+            self._dropped = 0
+            self._progress.clear()
+        return lines, dropped, progress
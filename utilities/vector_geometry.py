@@ -0,0 +1,268 @@
+"""
+Núcleo de geometría columnar sobre arreglos NumPy N×2 (float64).
+
+Versiones vectorizadas de las operaciones de `geometry` para cuando las
+entradas son grandes. Usa las mismas fórmulas y el mismo orden de operaciones
+que las funciones escalares, así los resultados coinciden con ellas a la
+precisión de trabajo del proyecto (round(..., 4)).
+
+NumPy es opcional: si no está instalado `available()` devuelve False y
+`geometry` sigue usando sus implementaciones escalares.
+"""
+
+from typing import Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+# A partir de este número de pares (N x M) conviene delegar en NumPy
+VECTORIZE_MIN_PAIRS = 200_000
+
+# Cantidad de puntos de 'a' que se cruzan a la vez en las búsquedas por radio
+_CHUNK = 65_536
+
+# Máximo de celdas por eje en la rejilla de pairs_within_radius
+_MAX_CELLS_PER_AXIS = 2**20
+
+# Máximo de celdas de una matriz de distancias temporal
+_MAX_MATRIX = 4_000_000
+
+
+def available() -> bool:
+    return np is not None
+
+
+def should_vectorize(n: int, m: int = 1) -> bool:
+    """Indica si conviene usar el núcleo NumPy para n x m evaluaciones."""
+    return np is not None and n * m >= VECTORIZE_MIN_PAIRS
+
+
+def as_points(points: Sequence) -> "np.ndarray":
+    """Convierte una secuencia de (x, y) en un arreglo N×2 float64."""
+    arr = np.asarray(points, dtype=np.float64)
+    if arr.size == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    return arr.reshape(-1, arr.shape[-1])[:, :2]
+
+
+def blocks_to_points(blocks: Sequence[dict]) -> "np.ndarray":
+    """Extrae las columnas X, Y de una lista de diccionarios de entidades."""
+    arr = np.empty((len(blocks), 2), dtype=np.float64)
+    for i, block in enumerate(blocks):
+        arr[i, 0] = block["X"]
+        arr[i, 1] = block["Y"]
+    return arr
+
+
+def distances(points: "np.ndarray", point: Tuple[float, float]) -> "np.ndarray":
+    """Distancia euclidiana de cada fila de 'points' a un punto."""
+    return np.hypot(points[:, 0] - point[0], points[:, 1] - point[1])
+
+
+def pairs_within_radius(
+    a: "np.ndarray", b: "np.ndarray", radius: float
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Todos los pares (i, j) con distancia(a[i], b[j]) <= radius.
+
+    Es la misma rejilla de `spatial.GridIndex` (celdas de lado 'radius') pero
+    resuelta en bloque: los puntos de 'b' se ordenan por clave de celda y, para
+    cada una de las 9 celdas vecinas, los rangos de candidatos de todos los
+    puntos de 'a' se obtienen con búsqueda binaria y se expanden con np.repeat.
+
+    Returns:
+        (ia, jb, dist): arreglos alineados, sin un orden particular.
+    """
+    a = as_points(a)
+    b = as_points(b)
+    empty = (
+        np.empty(0, dtype=np.int64),
+        np.empty(0, dtype=np.int64),
+        np.empty(0, dtype=np.float64),
+    )
+    if len(a) == 0 or len(b) == 0 or radius < 0:
+        return empty
+
+    x0 = min(a[:, 0].min(), b[:, 0].min())
+    y0 = min(a[:, 1].min(), b[:, 1].min())
+    span_x = max(a[:, 0].max(), b[:, 0].max()) - x0
+    span_y = max(a[:, 1].max(), b[:, 1].max()) - y0
+    # Celdas de al menos 'radius' por eje; se limita su número en cada eje para
+    # que la clave quepa en int64 (en UTM, X e Y están en rangos muy distintos)
+    cs = (
+        max(radius, span_x / _MAX_CELLS_PER_AXIS, 1e-9),
+        max(radius, span_y / _MAX_CELLS_PER_AXIS, 1e-9),
+    )
+    # Desplazamos una celda para que los vecinos nunca tengan índice negativo
+    cell_a = np.floor((a - (x0, y0)) / cs).astype(np.int64) + 1
+    cell_b = np.floor((b - (x0, y0)) / cs).astype(np.int64) + 1
+    rows = max(cell_a[:, 1].max(), cell_b[:, 1].max()) + 2
+
+    key_b = cell_b[:, 0] * rows + cell_b[:, 1]
+    order_b = np.argsort(key_b, kind="stable")
+    key_b = key_b[order_b]
+
+    out_i, out_j, out_d = [], [], []
+    for start in range(0, len(a), _CHUNK):
+        ca = cell_a[start : start + _CHUNK]
+        pa = a[start : start + _CHUNK]
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                key = (ca[:, 0] + dx) * rows + (ca[:, 1] + dy)
+                lo = np.searchsorted(key_b, key, "left")
+                hi = np.searchsorted(key_b, key, "right")
+                counts = hi - lo
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                ia = np.repeat(np.arange(len(pa)), counts)
+                offset = np.arange(total) - np.repeat(
+                    np.cumsum(counts) - counts, counts
+                )
+                jb = order_b[np.repeat(lo, counts) + offset]
+                d = np.hypot(pa[ia, 0] - b[jb, 0], pa[ia, 1] - b[jb, 1])
+                keep = d <= radius
+                out_i.append(ia[keep] + start)
+                out_j.append(jb[keep])
+                out_d.append(d[keep])
+
+    if not out_i:
+        return empty
+    return np.concatenate(out_i), np.concatenate(out_j), np.concatenate(out_d)
+
+
+def project_points_to_segments(
+    p: "np.ndarray", a: "np.ndarray", b: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Versión por lotes de geometry.point_to_segment_projection.
+    Los arreglos (..., 2) se difunden entre sí (broadcasting), de modo que se
+    puede proyectar N puntos sobre un segmento, un punto sobre N segmentos o
+    N pares punto/segmento.
+
+    Returns:
+        (proyecciones (..., 2), distancias_perpendiculares (...))
+    """
+    p = np.asarray(p, dtype=np.float64)
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+
+    abx = b[..., 0] - a[..., 0]
+    aby = b[..., 1] - a[..., 1]
+    apx = p[..., 0] - a[..., 0]
+    apy = p[..., 1] - a[..., 1]
+
+    ab_len_sq = abx * abx + aby * aby
+    degenerate = ab_len_sq == 0
+    safe_len = np.where(degenerate, 1.0, ab_len_sq)
+
+    # t representa el punto en el vector (0 es A, 1 es B)
+    t = (apx * abx + apy * aby) / safe_len
+    t = np.where(degenerate, 0.0, np.clip(t, 0.0, 1.0))
+
+    proj_x = a[..., 0] + t * abx
+    proj_y = a[..., 1] + t * aby
+    # Segmento de longitud 0: la proyección es el propio punto A
+    proj_x = np.where(degenerate, a[..., 0], proj_x)
+    proj_y = np.where(degenerate, a[..., 1], proj_y)
+
+    dist = np.hypot(p[..., 0] - proj_x, p[..., 1] - proj_y)
+    return np.stack([proj_x, proj_y], axis=-1), dist
+
+
+def segment_candidates(
+    a: "np.ndarray", b: "np.ndarray", points: "np.ndarray", radius: float
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Pares (segmento, punto) candidatos a estar a una distancia <= radius del
+    segmento a[i]-b[i]. Versión en bloque de GridIndex.near_segment: cada
+    segmento se muestrea a pasos de como máximo 'radius' y las muestras se
+    cruzan con pairs_within_radius. Es un superconjunto; el llamador aplica la
+    prueba exacta (p. ej. con project_points_to_segments).
+
+    Returns:
+        (i_segmento, j_punto) sin repetidos, ordenados por segmento y luego
+        por índice de punto (el orden de entrada, para desempates estables).
+    """
+    a = as_points(a)
+    b = as_points(b)
+    points = as_points(points)
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+    if len(a) == 0 or len(points) == 0 or radius < 0:
+        return empty
+
+    step = max(radius, 1e-9)
+    lengths = np.hypot(b[:, 0] - a[:, 0], b[:, 1] - a[:, 1])
+    n_steps = np.maximum(np.ceil(lengths / step), 1).astype(np.int64)
+    # Muestras j / n_steps, j = 0..n_steps, de cada segmento
+    seg = np.repeat(np.arange(len(a)), n_steps + 1)
+    first = np.cumsum(n_steps + 1) - (n_steps + 1)
+    t = (np.arange(len(seg)) - first[seg]) / n_steps[seg]
+    samples = a[seg] + t[:, None] * (b[seg] - a[seg])
+
+    # Todo punto del segmento queda a <= step / 2 de alguna muestra
+    iv, jp, _ = pairs_within_radius(samples, points, radius + step / 2)
+    if len(iv) == 0:
+        return empty
+    pair = np.unique(seg[iv] * len(points) + jp)
+    return pair // len(points), pair % len(points)
+
+
+def nearest_vertex(
+    vertices: "np.ndarray", points: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Para cada punto, el índice del vértice más cercano y su distancia.
+    Ante empates gana el vértice de menor índice (igual que min() sobre una lista).
+    """
+    vertices = as_points(vertices)
+    points = as_points(points)
+    n = len(points)
+    idx = np.full(n, -1, dtype=np.int64)
+    dist = np.full(n, np.inf, dtype=np.float64)
+    if n == 0 or len(vertices) == 0:
+        return idx, dist
+
+    step = max(1, _MAX_MATRIX // len(vertices))
+    for start in range(0, n, step):
+        chunk = points[start : start + step]
+        d = np.hypot(
+            chunk[:, None, 0] - vertices[None, :, 0],
+            chunk[:, None, 1] - vertices[None, :, 1],
+        )
+        best = np.argmin(d, axis=1)
+        idx[start : start + step] = best
+        dist[start : start + step] = d[np.arange(len(chunk)), best]
+    return idx, dist
+
+
+def first_capture(
+    path: "np.ndarray", points: "np.ndarray", radius: float
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Para cada punto, el primer vértice de 'path' (en orden de recorrido) que
+    lo captura dentro de 'radius', y la distancia a ese vértice.
+
+    Equivale al barrido "por cada vértice, tomar los puntos libres cercanos"
+    de sort_blocks_by_path: un punto queda asignado al primer vértice que lo
+    alcanza. Los puntos no capturados reciben índice -1.
+    """
+    points = as_points(points)
+    n = len(points)
+    vertex = np.full(n, -1, dtype=np.int64)
+    dist = np.full(n, np.inf, dtype=np.float64)
+
+    iv, jp, d = pairs_within_radius(path, points, radius)
+    if len(iv) == 0:
+        return vertex, dist
+
+    # Por punto, el par con menor índice de vértice
+    order = np.lexsort((iv, jp))
+    jp, iv, d = jp[order], iv[order], d[order]
+    first = np.ones(len(jp), dtype=bool)
+    first[1:] = jp[1:] != jp[:-1]
+    vertex[jp[first]] = iv[first]
+    dist[jp[first]] = d[first]
+    return vertex, dist